@@ -0,0 +1,427 @@
+from array import array
+from collections import Counter
+from itertools import compress
+from types import MappingProxyType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+from app.HssSqlTypeRegistry.HssSqlTypeRegistry import HssSqlRegistryView
+
+
+class HssSqlCatalog:
+    """
+    A columnar catalog of the columns found in one or more SQL databases.
+
+    Every column of every table becomes one row of the catalog. The rows are stored
+    column-wise in typed arrays, with data types dictionary-encoded as small integer
+    codes and constraints packed into a bit mask, so that catalog queries are scans
+    over flat arrays instead of walks over the object graph.
+
+    When NumPy is installed, the scans run on zero-copy NumPy views of the arrays
+    (a few milliseconds per filter for a million rows). Without it they fall back
+    to the standard library, which still visits every row in the interpreter at
+    roughly 0.1-0.3 microseconds per row and filter.
+
+    Attributes:
+        database_names (list): Names of the databases, indexed by database code.
+        table_names (list): Names of the tables, indexed by table code.
+        table_database (array): Database code of every table.
+        column_names (list): Names of the columns, one per catalog row.
+        column_table (array): Table code of every catalog row.
+        column_type (array): Data type code of every catalog row.
+        column_length (array): Leading numeric parameter of every row (-1 if none).
+        column_constraints (array): Constraint bit mask of every catalog row.
+        column_size (array): Maximum storage size in bytes of every catalog row, from the type registry.
+        data_types (list): Data type names, indexed by data type code.
+
+    Class Attributes:
+        CONSTRAINT_BITS (mapping): Read-only bit assigned to each constraint keyword of the type
+            registry, derived on access so constraints registered later are included.
+
+    Methods:
+        add_database(database) -> None: Append all columns of a database to the catalog.
+        from_databases(databases: list) -> 'HssSqlCatalog': Build a catalog from databases.
+        mask(...) -> bytearray: Compute a 0/1 selection mask over the catalog rows.
+        select(...) -> list: Return the row indices matching the filters.
+        count_by_table(...) -> array: Count matching columns per table.
+        size_by_table(...) -> array: Sum the maximum storage size of matching columns per table.
+        tables_having(min_count: int, ...) -> list: List tables with at least min_count matching columns.
+        length_distribution(data_type: str) -> Counter: Histogram of parameter lengths for a type.
+        type_distribution() -> Counter: Number of columns per data type.
+        to_columns() -> dict: Export the catalog as a dictionary of flat columns.
+
+    """
+
+    CONSTRAINT_BITS = HssSqlRegistryView(lambda cls: MappingProxyType(cls._constraint_bits()))
+
+    _bits = {}
+
+    def __init__(self):
+        """
+        Initialize an empty HssSqlCatalog.
+
+        """
+        self.database_names = []
+        self.table_names = []
+        self.table_database = array("I")
+        self.column_names = []
+        self.column_table = array("I")
+        self.column_type = array("H")
+        self.column_length = array("q")
+        self.column_constraints = array("I")
+        self.column_size = array("q")
+        self.data_types = HssSqlColumn.TYPE_REGISTRY.names()
+        self._type_codes = {data_type: code for code, data_type in enumerate(self.data_types)}
+
+    def __len__(self) -> int:
+        """
+        Return the number of columns in the catalog.
+
+        Returns:
+            int: The number of catalog rows.
+
+        """
+        return len(self.column_names)
+
+    def _type_code(self, data_type: str) -> int:
+        """
+        Return the code of a data type, registering unknown types on first use.
+
+        Args:
+            data_type (str): The upper-cased base data type.
+
+        Returns:
+            int: The data type code.
+
+        """
+        code = self._type_codes.get(data_type)
+        if code is None:
+            code = len(self.data_types)
+            self.data_types.append(data_type)
+            self._type_codes[data_type] = code
+        return code
+
+    @classmethod
+    def _constraint_bits(cls) -> dict:
+        """
+        Return the bit of every constraint keyword of the type registry.
+
+        Keywords are only ever appended to the registry, so the bits of known keywords
+        never change and the table is only rebuilt when new keywords were registered.
+
+        Returns:
+            dict: Mapping of constraint keyword to bit.
+
+        """
+        constraints = HssSqlColumn.TYPE_REGISTRY.constraints
+        if len(cls._bits) != len(constraints):
+            cls._bits = {constraint: 1 << bit for bit, constraint in enumerate(constraints)}
+        return cls._bits
+
+    @classmethod
+    def _constraint_mask(cls, constraints) -> int:
+        """
+        Pack a list of column constraints into a bit mask.
+
+        Args:
+            constraints (list): The column constraints, e.g. ``["NOT NULL", "DEFAULT 0"]``.
+
+        Returns:
+            int: The constraint bit mask.
+
+        """
+        mask = 0
+        for constraint in constraints:
+            mask |= cls._constraint_bits().get(HssSqlColumn.TYPE_REGISTRY.constraint_keyword(constraint), 0)
+        return mask
+
+    @staticmethod
+    def _leading_number(parameter) -> int:
+        """
+        Extract the leading integer of a data type parameter.
+
+        Args:
+            parameter (str): The parameter, e.g. ``"255"`` or ``"10,2"``.
+
+        Returns:
+            int: The leading integer, or -1 if the parameter does not start with one.
+
+        """
+        if not parameter:
+            return -1
+        head = parameter.split(",", 1)[0].strip()
+        return int(head) if head.isdigit() else -1
+
+    def add_database(self, database) -> None:
+        """
+        Append all columns of a database to the catalog.
+
+        Args:
+            database (HssSqlDatabase): The database to add.
+
+        Returns:
+            None
+
+        """
+        database_code = len(self.database_names)
+        self.database_names.append(database.database_name)
+        for table in database.tables:
+            if isinstance(table, dict):
+                table = HssSqlTable.from_dict(table)
+            table_code = len(self.table_names)
+            self.table_names.append(getattr(table, "name", table))
+            self.table_database.append(database_code)
+            for column in getattr(table, "columns", []):
+                base_type, parameter = HssSqlColumn.split_data_type(column.data_type)
+                self.column_names.append(column.name)
+                self.column_table.append(table_code)
+                self.column_type.append(self._type_code(base_type))
+                self.column_length.append(self._leading_number(parameter))
+                self.column_constraints.append(self._constraint_mask(column.constraints))
+                self.column_size.append(column.storage_size())
+
+    @classmethod
+    def from_databases(cls, databases) -> 'HssSqlCatalog':
+        """
+        Build a catalog from a list of databases.
+
+        Args:
+            databases (list): The HssSqlDatabase objects to export.
+
+        Returns:
+            HssSqlCatalog: The catalog.
+
+        """
+        instance = cls()
+        for database in databases:
+            instance.add_database(database)
+        return instance
+
+    @staticmethod
+    def _view(values: array):
+        """
+        Return a zero-copy NumPy view of a typed array.
+
+        Args:
+            values (array): The typed array.
+
+        Returns:
+            numpy.ndarray: The view, sharing the memory of the array.
+
+        """
+        if not values:
+            return numpy.zeros(0, dtype=values.typecode)
+        return numpy.frombuffer(values, dtype=values.typecode)
+
+    def _mask(self, data_type: str = None, constraint: str = None,
+              min_length: int = None, max_length: int = None):
+        """
+        Compute a selection mask in the fastest available representation.
+
+        Args:
+            data_type (str, optional): Base data type the column must have.
+            constraint (str, optional): Constraint keyword the column must carry.
+            min_length (int, optional): Minimum leading parameter value.
+            max_length (int, optional): Maximum leading parameter value.
+
+        Returns:
+            A NumPy boolean array if NumPy is installed, otherwise a 0/1 bytearray.
+
+        Raises:
+            ValueError: If the constraint is not a known constraint keyword.
+        """
+        bit = None
+        if constraint is not None:
+            bit = self._constraint_bits().get(" ".join(constraint.upper().split()))
+            if bit is None:
+                raise ValueError(f"Invalid constraint: {constraint}")
+        code = None
+        if data_type is not None:
+            code = self._type_codes.get(data_type.upper(), -1)
+        if numpy is not None:
+            selected = numpy.ones(len(self), dtype=bool)
+            if code is not None:
+                selected &= self._view(self.column_type) == code
+            if bit is not None:
+                selected &= (self._view(self.column_constraints) & bit) != 0
+            if min_length is not None:
+                selected &= self._view(self.column_length) >= min_length
+            if max_length is not None:
+                lengths = self._view(self.column_length)
+                selected &= (lengths <= max_length) & (lengths > -1)
+            return selected
+        selected = bytearray(b"\x01") * len(self)
+        if code is not None:
+            if code < 0:
+                return bytearray(len(self))
+            selected = bytearray(map(int.__and__, selected, map(code.__eq__, self.column_type)))
+        if bit is not None:
+            selected = bytearray(map(int.__and__, selected, map(bool, map(bit.__and__, self.column_constraints))))
+        if min_length is not None:
+            selected = bytearray(map(int.__and__, selected, map(min_length.__le__, self.column_length)))
+        if max_length is not None:
+            selected = bytearray(map(int.__and__, selected, map(max_length.__ge__, self.column_length)))
+            selected = bytearray(map(int.__and__, selected, map((-1).__lt__, self.column_length)))
+        return selected
+
+    def mask(self, data_type: str = None, constraint: str = None,
+             min_length: int = None, max_length: int = None) -> bytearray:
+        """
+        Compute a selection mask over the catalog rows.
+
+        All given filters are combined with AND; omitted filters match every row.
+        Runs on NumPy when it is installed; the standard library fallback costs
+        a Python-level operation per row and filter.
+
+        Args:
+            data_type (str, optional): Base data type the column must have.
+            constraint (str, optional): Constraint keyword the column must carry.
+            min_length (int, optional): Minimum leading parameter value.
+            max_length (int, optional): Maximum leading parameter value.
+
+        Returns:
+            bytearray: One byte per row, 1 where the row matches.
+
+        Raises:
+            ValueError: If the constraint is not a known constraint keyword.
+        """
+        selected = self._mask(data_type, constraint, min_length, max_length)
+        if numpy is not None:
+            return bytearray(selected.view(numpy.uint8))
+        return selected
+
+    def select(self, **filters) -> list:
+        """
+        Return the indices of the rows matching the filters.
+
+        Args:
+            **filters: Keyword filters accepted by mask().
+
+        Returns:
+            list: The matching row indices.
+
+        """
+        selected = self._mask(**filters)
+        if numpy is not None:
+            return numpy.flatnonzero(selected).tolist()
+        return list(compress(range(len(self)), selected))
+
+    def count_by_table(self, **filters) -> array:
+        """
+        Count the matching columns of every table.
+
+        Args:
+            **filters: Keyword filters accepted by mask().
+
+        Returns:
+            array: One count per table code.
+
+        """
+        selected = self._mask(**filters)
+        if numpy is not None:
+            counts = numpy.bincount(self._view(self.column_table)[selected], minlength=len(self.table_names))
+            return array("I", counts.astype(numpy.uint32).tobytes())
+        counts = array("I", bytes(4 * len(self.table_names)))
+        for table_code in compress(self.column_table, selected):
+            counts[table_code] += 1
+        return counts
+
+    def size_by_table(self, **filters) -> array:
+        """
+        Sum the maximum storage size of the matching columns of every table.
+
+        Args:
+            **filters: Keyword filters accepted by mask().
+
+        Returns:
+            array: One size in bytes per table code.
+
+        """
+        selected = self._mask(**filters)
+        if numpy is not None:
+            sizes = numpy.zeros(len(self.table_names), dtype=numpy.int64)
+            numpy.add.at(sizes, self._view(self.column_table)[selected], self._view(self.column_size)[selected])
+            return array("q", sizes.tobytes())
+        sizes = array("q", bytes(8 * len(self.table_names)))
+        for table_code, size in compress(zip(self.column_table, self.column_size), selected):
+            sizes[table_code] += size
+        return sizes
+
+    def tables_having(self, min_count: int, **filters) -> list:
+        """
+        List the tables with at least min_count matching columns.
+
+        Args:
+            min_count (int): The minimum number of matching columns.
+            **filters: Keyword filters accepted by mask().
+
+        Returns:
+            list: (database name, table name, count) tuples.
+
+        """
+        counts = self.count_by_table(**filters)
+        if numpy is not None:
+            table_codes = numpy.flatnonzero(self._view(counts) >= min_count).tolist()
+        else:
+            table_codes = [table_code for table_code, count in enumerate(counts) if count >= min_count]
+        return [
+            (self.database_names[self.table_database[table_code]], self.table_names[table_code], counts[table_code])
+            for table_code in table_codes
+        ]
+
+    def length_distribution(self, data_type: str) -> Counter:
+        """
+        Build a histogram of parameter lengths for a data type.
+
+        Args:
+            data_type (str): The base data type, e.g. ``VARCHAR``.
+
+        Returns:
+            Counter: Mapping of length to number of columns.
+
+        """
+        selected = self._mask(data_type=data_type)
+        if numpy is not None:
+            lengths, counts = numpy.unique(self._view(self.column_length)[selected], return_counts=True)
+            return Counter(dict(zip(lengths.tolist(), counts.tolist())))
+        return Counter(compress(self.column_length, selected))
+
+    def type_distribution(self) -> Counter:
+        """
+        Count the columns of every data type.
+
+        Returns:
+            Counter: Mapping of data type name to number of columns.
+
+        """
+        return Counter({self.data_types[code]: count for code, count in Counter(self.column_type).items()})
+
+    def to_columns(self) -> dict:
+        """
+        Export the catalog as a dictionary of flat, equally long columns.
+
+        Data types and constraints stay encoded; the dictionaries needed to decode
+        them are returned alongside.
+
+        Returns:
+            dict: The columnar representation of the catalog.
+
+        """
+        return {
+            "database": array("I", (self.table_database[t] for t in self.column_table)),
+            "table": self.column_table,
+            "column_name": self.column_names,
+            "data_type": self.column_type,
+            "length": self.column_length,
+            "constraints": self.column_constraints,
+            "size": self.column_size,
+            "database_names": self.database_names,
+            "table_names": self.table_names,
+            "data_types": self.data_types,
+            "constraint_bits": dict(self._constraint_bits()),
+        }
@@ -0,0 +1,226 @@
+import os
+import sys
+
+import click
+
+from app.HssSqlDdlCache.HssSqlDdlCache import HssSqlDdlCache
+from app.HssSqlDialect.HssSqlDialect import HssSqlDialect
+from app.HssSqlGenerator.HssSqlGenerator import HssSqlGenerator
+from app.HssSqlLoader.HssSqlLoader import HssSqlLoader
+from app.HssSqlWatcher.HssSqlWatcher import HssSqlWatcher
+
+
+class HssSqlCli:
+    """
+    A headless, non-interactive front end to the hsssql generators.
+
+    One process loads any number of schema specifications and streams their DDL,
+    avoiding interpreter start-up and import cost per schema.
+
+    Attributes:
+        output_dir (str): Directory receiving one .sql file per model, or None for stdout.
+        fmt (str): Forced input format, or None to detect it per input.
+        cache (HssSqlDdlCache): Cache of rendered DDL, or None.
+        dialect (HssSqlDialect): Target SQL dialect, or None for the models' own MySQL rendering.
+        stream: The stream DDL is written to when output_dir is None.
+        outputs (dict): File name to source of every file written by the current run.
+
+    Methods:
+        render(model) -> str: Render the DDL of a database or table.
+        emit(model, source: str = None) -> None: Render a model to stdout or to its file.
+        output_name(model) -> str: Return the file name used for a model.
+        process_text(text: str, source: str = None) -> int: Render every model of a specification.
+        process_file(path: str) -> int: Render every model of a specification file.
+        run(inputs: list) -> int: Process files or stdin ("-").
+
+    """
+
+    def __init__(self, output_dir=None, fmt=None, cache=None, stream=None, dialect=None):
+        """
+        Initialize the HssSqlCli object.
+
+        Args:
+            output_dir (str, optional): Directory for per-model .sql files. Defaults to stdout.
+            fmt (str, optional): Input format; detected per input when omitted.
+            cache (HssSqlDdlCache, optional): Cache of rendered DDL.
+            stream (optional): Output stream. Defaults to sys.stdout.
+            dialect (HssSqlDialect, optional): Target SQL dialect.
+
+        Raises:
+            OSError: If an error occurs while creating the output directory.
+        """
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.cache = cache
+        self.stream = stream if stream is not None else sys.stdout
+        self.dialect = dialect
+        self.outputs = {}
+        if output_dir is not None:
+            try:
+                os.makedirs(output_dir, exist_ok=True)
+            except OSError as e:
+                raise OSError(f"Error creating directory: {e}")
+
+    def render(self, model) -> str:
+        """
+        Render the DDL of a database or table.
+
+        Args:
+            model: An HssSqlDatabase or HssSqlTable.
+
+        Returns:
+            str: The DDL.
+
+        """
+        if self.dialect is not None:
+            if hasattr(model, "database_name"):
+                render = self.dialect.render_database
+            else:
+                def render(table):
+                    return self.dialect.render_table(table) + "\n"
+            if self.cache is not None:
+                return self.cache.get_or_render(model, render, self.dialect.NAME)
+            return render(model)
+        if self.cache is not None:
+            return self.cache.get_or_render(model)
+        if hasattr(model, "generate_schema_script"):
+            return model.generate_schema_script()
+        return model.generate_create_table() + "\n"
+
+    @staticmethod
+    def output_name(model) -> str:
+        """
+        Return the file name used for a model.
+
+        Args:
+            model: An HssSqlDatabase or HssSqlTable.
+
+        Returns:
+            str: The .sql file name.
+
+        """
+        return f"{getattr(model, 'database_name', None) or model.name}.sql"
+
+    def emit(self, model, source: str = None) -> None:
+        """
+        Render a model and write it to stdout or to its file in output_dir.
+
+        Args:
+            model: An HssSqlDatabase or HssSqlTable.
+            source (str, optional): The input the model came from, named in errors.
+
+        Raises:
+            ValueError: If another model of the run was already written to the same file.
+        """
+        source = source or "<stdin>"
+        name = None
+        if self.output_dir is not None:
+            name = self.output_name(model)
+            if name in self.outputs:
+                raise ValueError(f"{self.outputs[name]} and {source} both define {name[:-len('.sql')]}; "
+                                 f"refusing to overwrite {name}")
+        ddl = self.render(model)
+        if name is None:
+            self.stream.write(ddl)
+            self.stream.write("\n")
+            self.stream.flush()
+        else:
+            with open(os.path.join(self.output_dir, name), "w", encoding="utf-8") as sql_file:
+                sql_file.write(ddl)
+            self.outputs[name] = source
+
+    def process_text(self, text: str, source: str = None) -> int:
+        """
+        Render every model of a specification.
+
+        Args:
+            text (str): The specification text.
+            source (str, optional): The file the text came from, used for format detection.
+
+        Returns:
+            int: The number of models rendered.
+
+        """
+        models = HssSqlLoader.load_text(text, self.fmt or HssSqlLoader.detect_format(text, source))
+        for model in models:
+            self.emit(model, source)
+        return len(models)
+
+    def process_file(self, path: str) -> int:
+        """
+        Render every model of a specification file.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            int: The number of models rendered.
+
+        """
+        with open(path, "r", encoding="utf-8") as spec_file:
+            return self.process_text(spec_file.read(), path)
+
+    def run(self, inputs) -> int:
+        """
+        Process specification files, reading stdin for "-" or when no input is given.
+
+        Args:
+            inputs (list): File paths, or "-" for stdin.
+
+        Returns:
+            int: The number of models rendered.
+
+        Raises:
+            ValueError: If two models would be written to the same file.
+        """
+        self.outputs = {}
+        total = 0
+        for path in inputs or ["-"]:
+            if path == "-":
+                total += self.process_text(sys.stdin.read())
+            else:
+                total += self.process_file(path)
+        return total
+
+
+@click.command(name="hsssql")
+@click.argument("inputs", nargs=-1, type=click.Path(allow_dash=True))
+@click.option("--format", "fmt", type=click.Choice(HssSqlLoader.FORMATS), default=None,
+              help="Input format; detected from the file extension or content when omitted.")
+@click.option("--write", is_flag=True, help="Write one .sql file per model under the output directory.")
+@click.option("--output-dir", type=click.Path(file_okay=False), default=None,
+              help="Output directory for --write. Defaults to the session path.")
+@click.option("--cache/--no-cache", default=False, help="Serve unchanged schemas from the DDL cache.")
+@click.option("--dialect", type=click.Choice(sorted(HssSqlDialect.DIALECTS)), default=None,
+              help="Render for this SQL dialect instead of the default MySQL output.")
+@click.option("--watch", is_flag=True,
+              help="Watch a directory (default: the session path) and regenerate changed tables.")
+@click.option("--interval", type=float, default=0.5, show_default=True, help="Seconds between two --watch scans.")
+@click.option("--debounce", type=float, default=0.3, show_default=True,
+              help="Quiet period before --watch rebuilds a burst of saves.")
+def main(inputs, fmt, write, output_dir, cache, dialect, watch, interval, debounce):
+    """Generate DDL for schema specifications (JSON, YAML or DDL) from files or stdin."""
+    if watch:
+        directory = inputs[0] if inputs else HssSqlGenerator.DEFAULT_PATH
+        try:
+            watcher = HssSqlWatcher(directory, output_dir, interval, debounce, fmt)
+        except (OSError, ValueError) as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Watching {directory} (Ctrl+C to stop)", err=True)
+        watcher.watch(lambda rebuilt: click.echo(f"Regenerated: {', '.join(sorted(rebuilt))}", err=True),
+                      on_skip=lambda path, error: click.echo(f"Skipping {path}: {error}", err=True))
+        return
+    if output_dir is not None:
+        write = True
+    cli = HssSqlCli(
+        output_dir=(output_dir or HssSqlGenerator.DEFAULT_PATH) if write else None,
+        fmt=fmt,
+        cache=HssSqlDdlCache() if cache else None,
+        dialect=HssSqlDialect.get(dialect) if dialect else None,
+    )
+    try:
+        count = cli.run(inputs)
+    except (OSError, ValueError, ImportError) as e:
+        raise click.ClickException(str(e))
+    if write:
+        click.echo(f"Wrote {count} script(s) to {cli.output_dir}", err=True)
@@ -1,4 +1,11 @@
-class HssSqlColumn:
+import re
+
+from app.HssSqlUtilities.HssSqlCopyOnWrite import HssSqlCopyOnWrite
+from app.HssSqlTypeRegistry.HssSqlTypeRegistry import HssSqlRegistryView, HssSqlTypeRegistry
+from app.HssSqlUtilities.HssSqlFingerprint import fingerprint
+
+
+class HssSqlColumn(HssSqlCopyOnWrite):
     """
     A class representing a SQL column.
 
@@ -6,45 +13,67 @@ class HssSqlColumn:
         name (str): The name of the column.
         data_type (str): The data type of the column.
         constraints (list): List of constraints on the column.
+        generated_expression (str): Expression of a generated column, or None.
+        generated_storage (str): VIRTUAL or STORED for a generated column, or None.
 
     Class Attributes:
-        VALID_DATA_TYPES (list): List of commonly used data types.
-        DATA_TYPES_WITH_PARAMETERS (list): List of data types that can accept parameters.
-        VALID_CONSTRAINTS (list): List of valid column constraints.
+        TYPE_REGISTRY (HssSqlTypeRegistry): The registry validating data types and constraints.
+        VALID_DATA_TYPES (tuple): Read-only alias of the registered type names.
+        DATA_TYPES_WITH_PARAMETERS (tuple): Read-only alias of the registered types accepting a parameter.
+        VALID_CONSTRAINTS (tuple): Read-only alias of the registered constraint keywords.
+        VALID_GENERATED_STORAGE (list): Storage kinds of generated columns.
+        GENERATED_FORBIDDEN_CONSTRAINTS (list): Constraints a generated column cannot carry.
 
     Methods:
         set_column_name(name: str) -> None: Set the name of the column.
         set_data_type(data_type: str, parameter: str = None) -> None: Set the data type of the column.
         add_constraint(constraint: str) -> None: Add a constraint to the column.
         remove_constraint(constraint: str) -> None: Remove a constraint from the column.
+        set_generated(expression: str, storage: str = "VIRTUAL") -> None: Make the column a generated column.
+        clear_generated() -> None: Make the column a regular column again.
+        is_generated() -> bool: Check if the column is a generated column.
+        storage_size() -> int: Return the maximum storage size of a value of the column in bytes.
         to_dict() -> dict: Convert the column object to a dictionary.
         from_dict(data: dict) -> 'HssSqlColumn': Create a column object from a dictionary.
+        fingerprint() -> str: Compute the structural hash of the column.
+        snapshot() -> 'HssSqlColumn': Return an O(1) copy-on-write clone of the column.
+        restore(snapshot: 'HssSqlColumn') -> None: Roll the column back to a snapshot.
+        is_shared() -> bool: Check if the column is shared with a snapshot through its parent.
         __repr__() -> str: Return a string representation of the object.
         __str__() -> str: Return a human-readable string representation of the object.
-        is_valid_data_type(data_type: str) -> bool: Check if a data type is valid.
+        is_valid_data_type(data_type: str, parameter: str = None) -> bool: Check if a data type is valid.
+        is_valid_constraint(constraint: str) -> bool: Check if a column constraint is valid.
+        split_data_type(data_type: str) -> tuple: Split a data type into base type and parameter.
+        parse_members(parameter: str) -> list: Parse the member list of an ENUM or SET parameter.
+        is_valid_expression(expression: str) -> bool: Check if a generated column expression is well-formed.
 
     """
 
-    VALID_DATA_TYPES = [
-        "BIT", "TINYINT", "BOOL", "BOOLEAN", "SMALLINT", "MEDIUMINT",
-        "INT", "INTEGER", "BIGINT", "FLOAT", "DOUBLE", "DECIMAL",
-        "CHAR", "VARCHAR", "BINARY", "VARBINARY",
-        "TINYBLOB", "TINYTEXT", "BLOB", "TEXT", "MEDIUMBLOB",
-        "MEDIUMTEXT", "LONGBLOB", "LONGTEXT", "ENUM", "SET",
-        "DATE", "DATETIME", "TIMESTAMP", "TIME", "YEAR"
-    ]
+    TYPE_REGISTRY = HssSqlTypeRegistry.default()
+
+    VALID_DATA_TYPES = HssSqlRegistryView(lambda cls: tuple(cls.TYPE_REGISTRY.names()))
+
+    DATA_TYPES_WITH_PARAMETERS = HssSqlRegistryView(
+        lambda cls: tuple(name for name in cls.TYPE_REGISTRY.names() if cls.TYPE_REGISTRY.get(name).grammar))
 
-    DATA_TYPES_WITH_PARAMETERS = ["CHAR", "VARCHAR", "BINARY", "VARBINARY", "ENUM", "SET", "FLOAT", "DOUBLE", "DECIMAL"]
+    VALID_CONSTRAINTS = HssSqlRegistryView(lambda cls: tuple(cls.TYPE_REGISTRY.constraints))
 
-    VALID_CONSTRAINTS = ["PRIMARY KEY", "UNIQUE", "NOT NULL", "CHECK", "DEFAULT"]
+    VALID_GENERATED_STORAGE = ["VIRTUAL", "STORED"]
 
-    def __init__(self, name=None, data_type=None,constraints=None):
+    GENERATED_FORBIDDEN_CONSTRAINTS = ["DEFAULT", "AUTO_INCREMENT"]
+
+    COW_ATTRIBUTES = ("constraints",)
+
+    def __init__(self, name=None, data_type=None,constraints=None, generated_expression=None, generated_storage=None):
         """
         Initialize a new instance of HssSqlColumn.
 
         Args:
             name (str): The name of the column.
             data_type (str): The data type of the column.
+            constraints (list, optional): List of constraints on the column.
+            generated_expression (str, optional): Expression of a generated column.
+            generated_storage (str, optional): VIRTUAL (default) or STORED for a generated column.
 
         """
         if name is not None:
@@ -60,7 +89,12 @@ class HssSqlColumn:
             self.constraints = constraints
         else:
             self.constraints = []
-
+        self.generated_expression = None
+        self.generated_storage = None
+        if generated_expression is not None:
+            self._check_generated(generated_expression, generated_storage or "VIRTUAL", self.constraints)
+            self.generated_expression = generated_expression.strip()
+            self.generated_storage = (generated_storage or "VIRTUAL").upper()
 
     def set_column_name(self, name: str) -> None:
         """
@@ -72,7 +106,10 @@ class HssSqlColumn:
         Returns:
             None
 
+        Raises:
+            TypeError: If the column is shared with a snapshot.
         """
+        self._cow_check()
         self.name = name
 
     def set_data_type(self, data_type: str, parameter: str = None) -> None:
@@ -80,16 +117,22 @@ class HssSqlColumn:
         Set the data type of the column.
 
         Args:
-            data_type (str): The new data type for the column.
+            data_type (str): The new data type for the column, optionally followed by
+                type modifiers, e.g. ``INT UNSIGNED``.
             parameter (str, optional): Optional parameter for data types that accept it.
+                It is placed before the type modifiers.
 
         Returns:
             None
 
+        Raises:
+            TypeError: If the column is shared with a snapshot.
         """
-
+        self._cow_check()
         if parameter is not None:
-            data_type_with_param = f"{data_type}({parameter})"
+            modifiers = HssSqlTypeRegistry.modifiers(data_type)
+            base_type = HssSqlTypeRegistry.split(data_type)[0] if modifiers else data_type
+            data_type_with_param = f"{base_type}({parameter})" + "".join(f" {modifier}" for modifier in modifiers)
             if not self.is_valid_data_type(data_type,parameter):
                 raise ValueError(f"Invalid data type with parameter: {data_type_with_param}")
             self.data_type = data_type_with_param
@@ -108,10 +151,14 @@ class HssSqlColumn:
         Returns:
             None
 
+        Raises:
+            TypeError: If the column is shared with a snapshot.
         """
         if not self.is_valid_constraint(constraint):
             raise ValueError(f"Invalid constraint: {constraint}")
-        self.constraints.append(constraint)
+        if self.generated_expression is not None:
+            self._check_generated(self.generated_expression, self.generated_storage, self.constraints + [constraint])
+        self._cow_mutable("constraints").append(constraint)
 
     def remove_constraint(self, constraint: str) -> None:
         """
@@ -123,8 +170,93 @@ class HssSqlColumn:
         Returns:
             None
 
+        Raises:
+            TypeError: If the column is shared with a snapshot.
+        """
+        self._cow_assign("constraints", [c for c in self.constraints if c != constraint])
+
+    def set_generated(self, expression: str, storage: str = "VIRTUAL") -> None:
+        """
+        Make the column a generated column, rendered as ``GENERATED ALWAYS AS (expression) storage``.
+
+        Args:
+            expression (str): The SQL expression computing the column, without the outer parentheses.
+            storage (str, optional): VIRTUAL (computed on read) or STORED (computed on write).
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the expression or storage is invalid, or the column carries a
+                constraint a generated column cannot have.
+            TypeError: If the column is shared with a snapshot.
+        """
+        self._cow_check()
+        self._check_generated(expression, storage, self.constraints)
+        self.generated_expression = expression.strip()
+        self.generated_storage = storage.upper()
+
+    def clear_generated(self) -> None:
+        """
+        Make the column a regular column again.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the column is shared with a snapshot.
+        """
+        self._cow_check()
+        self.generated_expression = None
+        self.generated_storage = None
+
+    def is_generated(self) -> bool:
+        """
+        Check if the column is a generated column.
+
+        Returns:
+            bool: True if the column has a generation expression.
+
+        """
+        return self.generated_expression is not None
+
+    def storage_size(self) -> int:
+        """
+        Return the maximum storage size of a value of the column in bytes.
+
+        VIRTUAL generated columns are computed on read and take no row storage.
+
+        Returns:
+            int: The size from the type registry, 0 for an unknown type.
+
+        """
+        if self.generated_storage == "VIRTUAL":
+            return 0
+        return HssSqlColumn.TYPE_REGISTRY.storage_size(self.data_type)
+
+    @staticmethod
+    def _check_generated(expression: str, storage: str, constraints) -> None:
+        """
+        Validate the definition of a generated column.
+
+        Args:
+            expression (str): The generation expression.
+            storage (str): VIRTUAL or STORED.
+            constraints (list): The constraints of the column.
+
+        Raises:
+            ValueError: If the definition is invalid.
         """
-        self.constraints = [c for c in self.constraints if c != constraint]
+        if not HssSqlColumn.is_valid_expression(expression):
+            raise ValueError(f"Invalid generated column expression: {expression}")
+        if not isinstance(storage, str) or storage.upper() not in HssSqlColumn.VALID_GENERATED_STORAGE:
+            raise ValueError(f"Invalid generated column storage: {storage}")
+        for constraint in constraints:
+            upper = constraint.upper()
+            if upper.startswith(tuple(HssSqlColumn.GENERATED_FORBIDDEN_CONSTRAINTS)):
+                raise ValueError(f"Invalid constraint for a generated column: {constraint}")
+            if upper.startswith("PRIMARY KEY") and storage.upper() == "VIRTUAL":
+                raise ValueError("A VIRTUAL generated column cannot be a PRIMARY KEY; use STORED")
 
     @property
     def generate_column_definition(self) -> str:
@@ -136,8 +268,8 @@ class HssSqlColumn:
 
         """
         definition = f"\t\t{self.name} {self.data_type}"
-        if self.data_type in HssSqlColumn.DATA_TYPES_WITH_PARAMETERS:
-            definition += f"({self.parameter})"
+        if self.generated_expression is not None:
+            definition += f" GENERATED ALWAYS AS ({self.generated_expression}) {self.generated_storage}"
         for constraint in self.constraints:
             definition += f" {constraint}"
         return definition
@@ -148,25 +280,87 @@ class HssSqlColumn:
         Check if a data type is valid.
 
         Args:
-            data_type (str): The data type to check.
+            data_type (str): The data type to check, e.g. ``DECIMAL``, ``DECIMAL(10,2)`` or ``INT UNSIGNED``.
             parameter (str, optional): Optional parameter for data types that accept it.
 
         Returns:
-            bool: True if the data type is valid, False otherwise.
+            bool: True if the data type is registered and accepts the parameter, False otherwise.
 
         """
-        if parameter and data_type.upper() not in HssSqlColumn.DATA_TYPES_WITH_PARAMETERS:
-            return False  # Parameter provided for a data type that does not accept it
+        return HssSqlColumn.TYPE_REGISTRY.is_valid(data_type, parameter)
+
+    @staticmethod
+    def split_data_type(data_type: str) -> tuple:
+        """
+        Split a data type string into its base type and parameter, ignoring type modifiers.
+
+        Args:
+            data_type (str): The data type, e.g. ``VARCHAR(255)``, ``INT`` or ``INT UNSIGNED``.
 
-        if parameter and not parameter.isdigit():
-            return False  # Parameter must be a valid integer
+        Returns:
+            tuple: The upper-cased base type and the parameter string (or None).
 
-        return data_type.upper() in HssSqlColumn.VALID_DATA_TYPES
+        """
+        return HssSqlTypeRegistry.split(data_type)
+
+    @staticmethod
+    def parse_members(parameter: str) -> list:
+        """
+        Parse the member list of an ENUM or SET parameter.
+
+        Args:
+            parameter (str): The parameter, e.g. ``'a','b','c'``.
+
+        Returns:
+            list: The member strings.
+
+        """
+        if not parameter:
+            return []
+        quoted = re.findall(r"'((?:[^']|'')*)'", parameter)
+        if quoted:
+            return [member.replace("''", "'") for member in quoted]
+        return [member.strip().strip('"') for member in parameter.split(",")]
+
+    @staticmethod
+    def is_valid_expression(expression: str) -> bool:
+        """
+        Check if a generated column or functional index expression is well-formed.
+
+        The expression must be non-empty, have balanced parentheses and quotes, and
+        hold a single expression (no statement separator outside of quotes).
+
+        Args:
+            expression (str): The expression to check.
+
+        Returns:
+            bool: True if the expression is well-formed, False otherwise.
+
+        """
+        if not isinstance(expression, str) or not expression.strip():
+            return False
+        depth = 0
+        quote = None
+        for char in expression:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in "'\"`":
+                quote = char
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth < 0:
+                    return False
+            elif char == ";":
+                return False
+        return depth == 0 and quote is None
 
     @staticmethod
     def is_valid_constraint(constraint: str) -> bool:
         """
-        Check if a column constraint is valid.
+        Check if a column constraint starts with a registered keyword, e.g. ``DEFAULT 0``.
 
         Args:
             constraint (str): The constraint to check.
@@ -175,7 +369,7 @@ class HssSqlColumn:
             bool: True if the constraint is valid, False otherwise.
 
         """
-        return constraint.upper() in HssSqlColumn.VALID_CONSTRAINTS
+        return HssSqlColumn.TYPE_REGISTRY.is_valid_constraint(constraint)
 
     def to_dict(self) -> dict:
         """
@@ -185,11 +379,15 @@ class HssSqlColumn:
             dict: The dictionary representation of the column.
 
         """
-        return {
+        data = {
             "name": self.name,
             "data_type": self.data_type,
             "constraints": self.constraints
         }
+        if self.generated_expression is not None:
+            data["generated_expression"] = self.generated_expression
+            data["generated_storage"] = self.generated_storage
+        return data
 
     @classmethod
     def from_dict(cls, data: dict) -> 'HssSqlColumn':
@@ -205,8 +403,22 @@ class HssSqlColumn:
         """
         instance = cls(data["name"], data["data_type"])
         instance.constraints = data.get("constraints", [])
+        if data.get("generated_expression") is not None:
+            instance.set_generated(data["generated_expression"], data.get("generated_storage") or "VIRTUAL")
         return instance
 
+    def fingerprint(self) -> str:
+        """
+        Compute the structural hash of the column.
+
+        Two columns with the same name, data type, constraints and generation share a fingerprint.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the canonical to_dict content.
+
+        """
+        return fingerprint(self.to_dict())
+
 
 
     def __repr__(self) -> str:
@@ -228,7 +440,8 @@ class HssSqlColumn:
 
         """
         constraints_str = ', '.join(self.constraints) if self.constraints else 'None'
-        return f"Column: {self.name}, Data Type: {self.data_type}, Constraints: {constraints_str}"
+        generated_str = f", Generated: {self.generated_expression} {self.generated_storage}" if self.generated_expression else ''
+        return f"Column: {self.name}, Data Type: {self.data_type}, Constraints: {constraints_str}{generated_str}"
 
 
 
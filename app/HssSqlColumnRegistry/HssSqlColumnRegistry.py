@@ -0,0 +1,243 @@
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlUtilities.HssSqlFingerprint import canonical_json
+
+
+class HssSqlSharedColumn(HssSqlColumn):
+    """
+    An immutable column specification shared between tables.
+
+    Shared columns are handed out by HssSqlColumnRegistry. Every mutating method
+    raises TypeError; a table that needs to customize a shared column detaches a
+    private copy with HssSqlTable.edit_column (copy-on-write).
+
+    Methods:
+        thaw() -> HssSqlColumn: Return a mutable copy of the column.
+        snapshot() -> 'HssSqlSharedColumn': Return the column itself, as it never changes.
+
+    """
+
+    def __init__(self, name=None, data_type=None, constraints=None, generated_expression=None, generated_storage=None):
+        """
+        Initialize a new, frozen instance of HssSqlSharedColumn.
+
+        Args:
+            name (str): The name of the column.
+            data_type (str): The data type of the column.
+            constraints (list): List of constraints on the column.
+            generated_expression (str, optional): Expression of a generated column.
+            generated_storage (str, optional): VIRTUAL or STORED for a generated column.
+
+        """
+        super().__init__(name, data_type, tuple(constraints or ()), generated_expression, generated_storage)
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        """
+        Reject attribute assignment once the column is frozen.
+
+        Raises:
+            TypeError: Always, after initialization.
+        """
+        if getattr(self, "_frozen", False):
+            self._reject()
+        object.__setattr__(self, name, value)
+
+    def _reject(self):
+        """
+        Raise the error reported for any mutation of a shared column.
+
+        Raises:
+            TypeError: Always.
+        """
+        raise TypeError(f"Shared column '{self.name}' is immutable; use HssSqlTable.edit_column to customize it")
+
+    def set_column_name(self, name: str) -> None:
+        """Reject renaming a shared column."""
+        self._reject()
+
+    def set_data_type(self, data_type: str, parameter: str = None) -> None:
+        """Reject changing the data type of a shared column."""
+        self._reject()
+
+    def add_constraint(self, constraint: str) -> None:
+        """Reject adding a constraint to a shared column."""
+        self._reject()
+
+    def remove_constraint(self, constraint: str) -> None:
+        """Reject removing a constraint from a shared column."""
+        self._reject()
+
+    def set_generated(self, expression: str, storage: str = "VIRTUAL") -> None:
+        """Reject making a shared column generated."""
+        self._reject()
+
+    def clear_generated(self) -> None:
+        """Reject making a shared column regular."""
+        self._reject()
+
+    def to_dict(self) -> dict:
+        """
+        Convert the column object to a dictionary.
+
+        Returns:
+            dict: The dictionary representation of the column.
+
+        """
+        data = super().to_dict()
+        data["constraints"] = list(self.constraints)
+        return data
+
+    def snapshot(self) -> 'HssSqlSharedColumn':
+        """
+        Return the column itself; an immutable column is its own snapshot.
+
+        Returns:
+            HssSqlSharedColumn: This column.
+
+        """
+        return self
+
+    def restore(self, snapshot) -> None:
+        """Reject rolling back a shared column."""
+        self._reject()
+
+    def thaw(self) -> HssSqlColumn:
+        """
+        Return a mutable copy of the column.
+
+        Returns:
+            HssSqlColumn: A private column with the same definition.
+
+        """
+        return HssSqlColumn.from_dict(self.to_dict())
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+
+        Returns:
+            str: The string representation.
+
+        """
+        return f"HssSqlSharedColumn(name='{self.name}', data_type='{self.data_type}', constraints={list(self.constraints)})"
+
+
+class HssSqlColumnRegistry:
+    """
+    A flyweight registry of shared, immutable column specifications.
+
+    Identical column definitions are interned to a single HssSqlSharedColumn, so
+    thousands of tables repeating ``id BIGINT PRIMARY KEY`` hold references to one
+    object instead of one object and one constraint list each.
+
+    Attributes:
+        templates (dict): Named templates, mapping alias to shared column.
+
+    Methods:
+        intern(column) -> HssSqlSharedColumn: Return the shared instance of a column or column dict.
+        register(alias: str, column) -> HssSqlSharedColumn: Register a named column template.
+        template(alias: str) -> HssSqlSharedColumn: Return a named column template.
+        default() -> 'HssSqlColumnRegistry': Return the process-wide registry.
+
+    """
+
+    _default = None
+
+    def __init__(self):
+        """
+        Initialize an empty HssSqlColumnRegistry.
+
+        """
+        self.templates = {}
+        self._specs = {}
+
+    def __len__(self) -> int:
+        """
+        Return the number of distinct column specifications.
+
+        Returns:
+            int: The number of interned columns.
+
+        """
+        return len(self._specs)
+
+    def intern(self, column) -> HssSqlSharedColumn:
+        """
+        Return the shared instance of a column definition.
+
+        Args:
+            column (HssSqlColumn | dict): The column or its dictionary representation.
+
+        Returns:
+            HssSqlSharedColumn: The shared column with the same definition.
+
+        """
+        data = column if isinstance(column, dict) else column.to_dict()
+        key = self._key(data)
+        shared = self._specs.get(key)
+        if shared is None:
+            shared = HssSqlSharedColumn(data["name"], data["data_type"], data.get("constraints", []),
+                                        data.get("generated_expression"), data.get("generated_storage"))
+            self._specs[key] = shared
+        return shared
+
+    @staticmethod
+    def _key(data: dict) -> str:
+        """
+        Compute the interning key of a column dictionary.
+
+        Args:
+            data (dict): The dictionary representation of a column.
+
+        Returns:
+            str: The canonical JSON form of the column.
+
+        """
+        return canonical_json(data)
+
+    def register(self, alias: str, column) -> HssSqlSharedColumn:
+        """
+        Register a named column template.
+
+        Args:
+            alias (str): The template name, e.g. ``"id"``.
+            column (HssSqlColumn | dict): The column definition.
+
+        Returns:
+            HssSqlSharedColumn: The shared column registered under the alias.
+
+        """
+        shared = self.intern(column)
+        self.templates[alias] = shared
+        return shared
+
+    def template(self, alias: str) -> HssSqlSharedColumn:
+        """
+        Return a named column template.
+
+        Args:
+            alias (str): The template name.
+
+        Returns:
+            HssSqlSharedColumn: The shared column.
+
+        Raises:
+            KeyError: If no template is registered under the alias.
+        """
+        try:
+            return self.templates[alias]
+        except KeyError:
+            raise KeyError(f"Unknown column template: {alias}")
+
+    @classmethod
+    def default(cls) -> 'HssSqlColumnRegistry':
+        """
+        Return the process-wide registry.
+
+        Returns:
+            HssSqlColumnRegistry: The shared default registry.
+
+        """
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
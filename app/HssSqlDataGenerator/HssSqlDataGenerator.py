@@ -0,0 +1,591 @@
+import csv
+import datetime
+import math
+import random
+import re
+import string
+import struct
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+
+
+class HssSqlDataGenerator:
+    """
+    A generator of synthetic rows that fit the columns of an HssSqlTable.
+
+    Rows are produced in column-wise batches: every column has a generator that
+    fills a whole list of values at once from precomputed value pools, which keeps
+    per-row Python work to a minimum. Values respect the data type of the column,
+    VARCHAR/CHAR lengths, DECIMAL precision and scale, ENUM/SET members, UNSIGNED
+    and NOT NULL; types are classified by their family in the type registry, and
+    GEOMETRY/POINT columns receive points
+    in MySQL's internal SRID + WKB format. PRIMARY KEY and UNIQUE columns draw
+    from a bijective permutation of a running counter, so values are
+    unique by construction and no set of already emitted values is kept.
+    Generated columns are computed by the database and are left out of the rows.
+
+    Attributes:
+        table: The HssSqlTable the rows are generated for.
+        null_fraction (float): Share of NULL values in nullable columns.
+        columns (list): Names of the generated columns, in table order.
+        unique_columns (set): Names of the columns generated as unique.
+        rows_generated (int): Number of rows produced so far.
+
+    Class Attributes:
+        INTEGER_RANGES (dict): Value range of the signed integer data types.
+        POOL_SIZE (int): Number of precomputed values per pooled column.
+        TEXT_LENGTH (int): Maximum length of generated TEXT values.
+
+    Methods:
+        batch(size: int) -> list: Generate the next batch as one value list per column.
+        batches(count: int, batch_size: int) -> generator: Yield column-wise batches.
+        rows(count: int, batch_size: int) -> generator: Yield row tuples.
+        write_csv(stream, count: int, batch_size: int, header: bool) -> int: Write rows as CSV.
+        write_inserts(stream, count: int, rows_per_statement: int) -> int: Write rows as INSERT statements.
+
+    """
+
+    INTEGER_RANGES = {
+        "TINYINT": (-2 ** 7, 2 ** 7), "SMALLINT": (-2 ** 15, 2 ** 15), "MEDIUMINT": (-2 ** 23, 2 ** 23),
+        "INT": (-2 ** 31, 2 ** 31), "INTEGER": (-2 ** 31, 2 ** 31), "BIGINT": (-2 ** 63, 2 ** 63),
+        "YEAR": (1901, 2156),
+    }
+
+    POOL_SIZE = 4096
+    TEXT_LENGTH = 200
+
+    _PERMUTATION_MULTIPLIER = 0x9E3779B97F4A7C15
+    _EPOCH = datetime.datetime(2000, 1, 1)
+    _LAST_MOMENTS = {
+        "DATE": datetime.date(9999, 12, 31),
+        "DATETIME": datetime.datetime(9999, 12, 31, 23, 59, 59),
+        "TIMESTAMP": datetime.datetime(2038, 1, 19, 3, 14, 7),
+    }
+
+    def __init__(self, table, seed=None, null_fraction: float = 0.1):
+        """
+        Initialize the generator for a table.
+
+        Args:
+            table (HssSqlTable): The table to generate rows for.
+            seed (int, optional): Seed of the random generator, for reproducible data.
+            null_fraction (float, optional): Share of NULL values in nullable columns.
+
+        Raises:
+            ValueError: If null_fraction is not between 0 and 1.
+        """
+        if not 0 <= null_fraction <= 1:
+            raise ValueError(f"Invalid null fraction: {null_fraction}")
+        self.table = table
+        self.null_fraction = null_fraction
+        self.rows_generated = 0
+        self._random = random.Random(seed)
+        source_columns = [column for column in table.columns if getattr(column, "generated_expression", None) is None]
+        self.columns = [column.name for column in source_columns]
+        self.unique_columns = self._unique_columns(table)
+        self._generators = [self._column_generator(column) for column in source_columns]
+
+    @staticmethod
+    def _has_constraint(column, keyword: str) -> bool:
+        """
+        Check whether a column carries a constraint keyword.
+
+        Args:
+            column (HssSqlColumn): The column.
+            keyword (str): The constraint keyword, e.g. ``NOT NULL``.
+
+        Returns:
+            bool: True if a constraint starts with the keyword.
+
+        """
+        return any(constraint.upper().startswith(keyword) for constraint in column.constraints)
+
+    def _unique_columns(self, table) -> set:
+        """
+        Collect the columns that must hold unique values.
+
+        Composite table-level keys are satisfied by making their first column unique.
+
+        Args:
+            table (HssSqlTable): The table.
+
+        Returns:
+            set: The names of the unique columns.
+
+        """
+        unique = {
+            column.name for column in table.columns
+            if self._has_constraint(column, "PRIMARY KEY") or self._has_constraint(column, "UNIQUE")
+        }
+        for constraint in table.constraints:
+            match = re.match(r"^(?:CONSTRAINT\s+\w+\s+)?(?:PRIMARY\s+KEY|UNIQUE(?:\s+(?:KEY|INDEX))?)\s*\w*\s*\(([^)]*)\)",
+                             constraint, re.IGNORECASE)
+            if match:
+                unique.add(match.group(1).split(",")[0].strip().strip("`\""))
+        return unique
+
+    def _column_generator(self, column):
+        """
+        Build the batch generator of a column.
+
+        Args:
+            column (HssSqlColumn): The column.
+
+        Returns:
+            callable: A function taking (start, size) and returning a list of values.
+
+        """
+        base_type, parameter = HssSqlColumn.split_data_type(column.data_type)
+        unsigned = HssSqlColumn.TYPE_REGISTRY.is_unsigned(column.data_type)
+        unique = column.name in self.unique_columns
+        values = self._unique_generator(column.name, base_type, parameter, unsigned) if unique \
+            else self._random_generator(base_type, parameter, unsigned)
+        nullable = not unique and not self._has_constraint(column, "NOT NULL")
+        if not nullable or not self.null_fraction:
+            return values
+
+        def with_nulls(start, size):
+            batch = values(start, size)
+            for index in self._random.sample(range(size), int(size * self.null_fraction)):
+                batch[index] = None
+            return batch
+        return with_nulls
+
+    @staticmethod
+    def _family(base_type: str) -> str:
+        """
+        Return the type registry family of a base data type.
+
+        Args:
+            base_type (str): The upper-cased base data type.
+
+        Returns:
+            str: The family, e.g. ``char`` or ``blob``, or None for an unknown type.
+
+        """
+        entry = HssSqlColumn.TYPE_REGISTRY.get(base_type)
+        return entry.family if entry is not None else None
+
+    @staticmethod
+    def _length(parameter, default: int) -> int:
+        """
+        Return the leading integer of a data type parameter.
+
+        Args:
+            parameter (str): The parameter, or None.
+            default (int): The value used when the parameter has no leading integer.
+
+        Returns:
+            int: The length.
+
+        """
+        head = (parameter or "").split(",", 1)[0].strip()
+        return int(head) if head.isdigit() else default
+
+    @classmethod
+    def _integer_range(cls, base_type: str, unsigned: bool) -> tuple:
+        """
+        Return the value range of an integer data type.
+
+        Args:
+            base_type (str): The upper-cased base data type, a key of INTEGER_RANGES.
+            unsigned (bool): Whether the column is UNSIGNED.
+
+        Returns:
+            tuple: The inclusive lower and exclusive upper bound.
+
+        """
+        low, high = cls.INTEGER_RANGES[base_type]
+        if unsigned and base_type != "YEAR":
+            return 0, high - low
+        return low, high
+
+    @staticmethod
+    def _precision(parameter, default: tuple) -> tuple:
+        """
+        Return the precision and scale of a ``M,D`` data type parameter.
+
+        Args:
+            parameter (str): The parameter, or None.
+            default (tuple): The (precision, scale) used when the parameter has no precision.
+
+        Returns:
+            tuple: The precision and scale, or default.
+
+        """
+        precision, _, scale = (parameter or "").partition(",")
+        if not precision.strip().isdigit():
+            return default
+        return int(precision), int(scale) if scale.strip().isdigit() else 0
+
+    @staticmethod
+    def _fixed_point(units: int, scale: int) -> str:
+        """
+        Format a number of 10^-scale units as a fixed-point literal.
+
+        Args:
+            units (int): The value, in units of the last decimal place.
+            scale (int): The number of decimal places.
+
+        Returns:
+            str: The literal, e.g. ``12.5`` for 125 units at scale 1.
+
+        """
+        if not scale:
+            return str(units)
+        sign = "-" if units < 0 else ""
+        whole, fraction = divmod(abs(units), 10 ** scale)
+        return f"{sign}{whole}.{fraction:0{scale}d}"
+
+    def _multiplier(self, capacity: int) -> int:
+        """
+        Return a multiplier coprime to capacity.
+
+        Multiplying a counter by it modulo capacity is a bijection, so distinct
+        counters map to distinct, scrambled values.
+
+        Args:
+            capacity (int): The size of the value domain.
+
+        Returns:
+            int: The multiplier.
+
+        """
+        multiplier = self._PERMUTATION_MULTIPLIER
+        while math.gcd(multiplier, capacity) != 1:
+            multiplier += 2
+        return multiplier
+
+    def _unique_generator(self, name: str, base_type: str, parameter, unsigned: bool = False):
+        """
+        Build the generator of a PRIMARY KEY or UNIQUE column.
+
+        Numeric values count up from 1 (one unit of the last decimal place for scaled
+        types), so the capacity of a DECIMAL(M,D) or FLOAT(M,D) column is 10^M - 1 values;
+        FLOAT and DOUBLE without a precision stop at their largest exact integer.
+
+        Args:
+            name (str): The column name.
+            base_type (str): The upper-cased base data type.
+            parameter (str): The data type parameter, or None.
+            unsigned (bool, optional): Whether the column is UNSIGNED.
+
+        Returns:
+            callable: A function taking (start, size) and returning a list of values.
+
+        Raises:
+            ValueError: If the data type cannot hold unique values, or a batch would
+                exceed the number of unique values the column can hold.
+        """
+        def check(start, size, capacity):
+            if start + size > capacity:
+                raise ValueError(f"Column {name} ({base_type}) cannot hold more than {capacity} unique values")
+
+        if base_type in self.INTEGER_RANGES:
+            low, high = self._integer_range(base_type, unsigned)
+            first = max(low, 1)
+
+            def integers(start, size):
+                check(start, size, high - first)
+                return list(range(first + start, first + start + size))
+            return integers
+
+        family = self._family(base_type)
+        if family in ("char", "binary", "text", "blob"):
+            width = min(self._length(parameter, 16), 16)
+            capacity = 16 ** width
+            binary = family in ("binary", "blob")
+            multiplier = self._multiplier(capacity)
+
+            def keys(start, size):
+                check(start, size, capacity)
+                batch = ["%0*x" % (width, (counter + 1) * multiplier % capacity) for counter in range(start, start + size)]
+                return [key.encode("ascii") for key in batch] if binary else batch
+            return keys
+
+        if base_type in ("DATE", "DATETIME", "TIMESTAMP"):
+            step = datetime.timedelta(days=1) if base_type == "DATE" else datetime.timedelta(seconds=1)
+            origin = self._EPOCH.date() if base_type == "DATE" else self._EPOCH
+            text = str if base_type == "DATE" else self._format_datetime
+            capacity = (self._LAST_MOMENTS[base_type] - origin) // step + 1
+
+            def moments(start, size):
+                check(start, size, capacity)
+                return [text(origin + step * counter) for counter in range(start, start + size)]
+            return moments
+
+        if base_type in ("DECIMAL", "FLOAT", "DOUBLE"):
+            if base_type == "DECIMAL":
+                precision, scale = self._precision(parameter, (10, 0))
+                capacity = 10 ** precision - 1
+            elif parameter and "," in parameter:
+                precision, scale = self._precision(parameter, (0, 0))
+                capacity = 10 ** precision - 1
+            else:
+                scale = 0
+                capacity = 2 ** 24 if base_type == "FLOAT" and self._length(parameter, 0) <= 24 else 2 ** 53
+
+            def numbers(start, size):
+                check(start, size, capacity)
+                if not scale:
+                    return list(range(start + 1, start + size + 1))
+                return [self._fixed_point(units, scale) for units in range(start + 1, start + size + 1)]
+            return numbers
+
+        if base_type in ("ENUM", "SET"):
+            members = HssSqlColumn.parse_members(parameter)
+
+            def choices(start, size):
+                check(start, size, len(members))
+                return members[start:start + size]
+            return choices
+
+        raise ValueError(f"Column {name} ({base_type}) cannot hold unique values")
+
+    @staticmethod
+    def _format_datetime(value: datetime.datetime) -> str:
+        """
+        Format a datetime as a SQL DATETIME literal.
+
+        Args:
+            value (datetime.datetime): The datetime.
+
+        Returns:
+            str: The ``YYYY-MM-DD HH:MM:SS`` text.
+
+        """
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _random_word(self, max_length: int) -> str:
+        """
+        Generate a random lowercase word.
+
+        Args:
+            max_length (int): The maximum length of the word.
+
+        Returns:
+            str: The word.
+
+        """
+        length = self._random.randint(1, max(1, max_length))
+        return "".join(self._random.choices(string.ascii_lowercase, k=length))
+
+    def _pooled(self, pool: list):
+        """
+        Build a generator drawing values from a precomputed pool.
+
+        Args:
+            pool (list): The candidate values.
+
+        Returns:
+            callable: A function taking (start, size) and returning a list of values.
+
+        """
+        choices = self._random.choices
+
+        def draw(start, size):
+            return choices(pool, k=size)
+        return draw
+
+    def _random_generator(self, base_type: str, parameter, unsigned: bool = False):
+        """
+        Build the generator of a column without uniqueness requirement.
+
+        Args:
+            base_type (str): The upper-cased base data type.
+            parameter (str): The data type parameter, or None.
+            unsigned (bool, optional): Whether the column is UNSIGNED.
+
+        Returns:
+            callable: A function taking (start, size) and returning a list of values.
+
+        """
+        rng = self._random
+        pool_size = self.POOL_SIZE
+        family = self._family(base_type)
+
+        if base_type in self.INTEGER_RANGES:
+            low, high = self._integer_range(base_type, unsigned)
+            if base_type != "YEAR":
+                low, high = max(low, -10 ** 6), min(high, 10 ** 6)
+            return self._pooled(list(range(low, high)) if high - low <= pool_size
+                                else [rng.randrange(low, high) for _ in range(pool_size)])
+        if base_type in ("BOOL", "BOOLEAN"):
+            return self._pooled([0, 1])
+        if base_type == "BIT":
+            return self._pooled(list(range(2 ** min(self._length(parameter, 1), 12))))
+        if base_type in ("FLOAT", "DOUBLE"):
+            if parameter and "," in parameter:
+                precision, scale = self._precision(parameter, (0, 0))
+                bound = min(10 ** precision - 1, 10 ** (scale + 3))
+                return self._pooled([self._fixed_point(rng.randint(0 if unsigned else -bound, bound), scale)
+                                     for _ in range(pool_size)])
+            return self._pooled([round(rng.uniform(0 if unsigned else -1000, 1000), 4) for _ in range(pool_size)])
+        if base_type == "DECIMAL":
+            precision, scale = self._precision(parameter, (10, 0))
+            bound = 10 ** min(precision - scale, 12)
+            return self._pooled([f"{rng.randrange(bound)}.{rng.randrange(10 ** scale):0{scale}d}" if scale
+                                 else str(rng.randrange(bound)) for _ in range(pool_size)])
+        if base_type in ("CHAR", "VARCHAR"):
+            length = self._length(parameter, 1 if base_type == "CHAR" else 255)
+            if base_type == "CHAR":
+                return self._pooled(["".join(rng.choices(string.ascii_lowercase, k=length))
+                                     for _ in range(pool_size)])
+            return self._pooled([self._random_word(min(length, 64)) for _ in range(pool_size)])
+        if family in ("binary", "blob"):
+            length = self._length(parameter, 32)
+            fixed = base_type == "BINARY"
+            return self._pooled([rng.randbytes(length if fixed else rng.randint(1, min(length, 64)))
+                                 for _ in range(pool_size)])
+        if family == "text":
+            return self._pooled([" ".join(self._random_word(10) for _ in range(rng.randint(1, self.TEXT_LENGTH // 11)))
+                                 for _ in range(pool_size)])
+        if family == "json":
+            return self._pooled([f'{{"id": {rng.randrange(10 ** 6)}, "tag": "{self._random_word(8)}"}}'
+                                 for _ in range(pool_size)])
+        if base_type in ("GEOMETRY", "POINT"):
+            return self._pooled([struct.pack("<IBIdd", 0, 1, 1, rng.uniform(-180, 180), rng.uniform(-90, 90))
+                                 for _ in range(pool_size)])
+        if family == "spatial":
+            raise ValueError(f"Cannot generate values for {base_type} columns")
+        if base_type == "ENUM":
+            return self._pooled(HssSqlColumn.parse_members(parameter))
+        if base_type == "SET":
+            members = HssSqlColumn.parse_members(parameter)
+            return self._pooled([",".join(m for m in members if rng.random() < 0.5) for _ in range(pool_size)])
+        if base_type == "DATE":
+            return self._pooled([str(self._EPOCH.date() + datetime.timedelta(days=rng.randrange(9000)))
+                                 for _ in range(pool_size)])
+        if base_type in ("DATETIME", "TIMESTAMP"):
+            return self._pooled([self._format_datetime(self._EPOCH + datetime.timedelta(seconds=rng.randrange(9000 * 86400)))
+                                 for _ in range(pool_size)])
+        if base_type == "TIME":
+            return self._pooled([f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}"
+                                 for s in (rng.randrange(86400) for _ in range(pool_size))])
+        return self._pooled([self._random_word(16) for _ in range(pool_size)])
+
+    def batch(self, size: int) -> list:
+        """
+        Generate the next batch of rows as one value list per column.
+
+        Args:
+            size (int): The number of rows.
+
+        Returns:
+            list: One list of values per column, in table order.
+
+        """
+        start = self.rows_generated
+        batch = [generate(start, size) for generate in self._generators]
+        self.rows_generated += size
+        return batch
+
+    def batches(self, count: int, batch_size: int = 10000):
+        """
+        Yield column-wise batches until count rows have been generated.
+
+        Args:
+            count (int): The total number of rows.
+            batch_size (int, optional): The number of rows per batch.
+
+        Yields:
+            list: One list of values per column.
+        """
+        remaining = count
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            yield self.batch(size)
+            remaining -= size
+
+    def rows(self, count: int, batch_size: int = 10000):
+        """
+        Yield row tuples.
+
+        Args:
+            count (int): The total number of rows.
+            batch_size (int, optional): The number of rows generated per batch.
+
+        Yields:
+            tuple: The values of one row, in table order.
+        """
+        for batch in self.batches(count, batch_size):
+            yield from zip(*batch)
+
+    def write_csv(self, stream, count: int, batch_size: int = 10000, header: bool = True) -> int:
+        """
+        Write rows as CSV, with NULL written as an empty field and bytes as hexadecimal
+        digits (load them with ``UNHEX()`` in MySQL).
+
+        Args:
+            stream: A text stream opened with ``newline=""``.
+            count (int): The number of rows.
+            batch_size (int, optional): The number of rows generated per batch.
+            header (bool, optional): Write the column names as the first line.
+
+        Returns:
+            int: The number of rows written.
+
+        """
+        writer = csv.writer(stream)
+        if header:
+            writer.writerow(self.columns)
+        for batch in self.batches(count, batch_size):
+            writer.writerows(zip(*map(self._hex_bytes, batch)))
+        return count
+
+    @staticmethod
+    def _hex_bytes(values: list) -> list:
+        """
+        Hex-encode the values of a column holding bytes.
+
+        Args:
+            values (list): The values of one column.
+
+        Returns:
+            list: The values, with bytes replaced by their hexadecimal digits.
+
+        """
+        sample = next((value for value in values if value is not None), None)
+        if not isinstance(sample, (bytes, bytearray)):
+            return values
+        return [value.hex() if value is not None else None for value in values]
+
+    @staticmethod
+    def sql_literal(value) -> str:
+        """
+        Render a value as a SQL literal.
+
+        Args:
+            value: The value.
+
+        Returns:
+            str: The literal.
+
+        """
+        if value is None:
+            return "NULL"
+        if isinstance(value, (bool, int, float)):
+            return str(int(value) if isinstance(value, bool) else value)
+        if isinstance(value, (bytes, bytearray)):
+            return "X'" + bytes(value).hex() + "'"
+        return "'" + str(value).replace("\\", "\\\\").replace("'", "''") + "'"
+
+    def write_inserts(self, stream, count: int, rows_per_statement: int = 1000) -> int:
+        """
+        Write rows as multi-row INSERT statements.
+
+        Args:
+            stream: A text stream.
+            count (int): The number of rows.
+            rows_per_statement (int, optional): The number of rows per INSERT statement.
+
+        Returns:
+            int: The number of rows written.
+
+        """
+        literal = self.sql_literal
+        prefix = f"INSERT INTO {self.table.name} ({', '.join(self.columns)}) VALUES\n"
+        for batch in self.batches(count, rows_per_statement):
+            values = ",\n".join("(" + ", ".join(map(literal, row)) + ")" for row in zip(*batch))
+            stream.write(prefix + values + ";\n")
+        return count
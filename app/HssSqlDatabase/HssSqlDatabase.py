@@ -1,4 +1,9 @@
-class HssSqlDatabase:
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+from app.HssSqlUtilities.HssSqlCopyOnWrite import HssSqlCopyOnWrite
+from app.HssSqlUtilities.HssSqlFingerprint import fingerprint
+
+
+class HssSqlDatabase(HssSqlCopyOnWrite):
     """
     A class representing a SQL database and providing methods for database operations.
 
@@ -18,16 +23,24 @@ class HssSqlDatabase:
         set_collation(collation: str) -> None: Set the collation for the database.
         add_table(table) -> None: Add a table to the database.
         remove_table(table_name: str) -> None: Remove a table from the database.
+        edit_table(table_name: str) -> HssSqlTable: Return a table of the database that is safe to modify.
         generate_create_database() -> str: Generate SQL command for creating the database.
         generate_alter_database() -> str: Generate SQL command for altering the database.
         generate_drop_database() -> str: Generate SQL command for dropping the database.
         generate_show_tables() -> str: Generate SQL command for showing tables in the database.
         generate_show_database_info() -> str: Generate SQL command for showing database information.
+        generate_schema_script() -> str: Generate the full DDL script for the database and its tables.
         to_dict() -> dict: Convert the database object to a dictionary.
-        from_dict(data: dict) -> 'HssSqlDatabase': Create a database object from a dictionary.
+        from_dict(data: dict, registry=None) -> 'HssSqlDatabase': Create a database object from a dictionary.
+        fingerprint() -> str: Compute the structural hash of the database.
+        snapshot() -> 'HssSqlDatabase': Return an O(1) copy-on-write clone of the database.
+        restore(snapshot: 'HssSqlDatabase') -> None: Roll the database back to a snapshot.
+        is_shared() -> bool: Check if the database is shared with a snapshot through its parent.
 
     """
 
+    COW_ATTRIBUTES = ("tables",)
+
     def __init__(self, database_name):
         """
         Initialize a new instance of HssSqlDatabase.
@@ -54,7 +67,10 @@ class HssSqlDatabase:
         Returns:
             None
 
+        Raises:
+            TypeError: If the database is shared with a snapshot.
         """
+        self._cow_check()
         self.database_name = name
 
     def set_schema(self, schema: str) -> None:
@@ -67,7 +83,10 @@ class HssSqlDatabase:
         Returns:
             None
 
+        Raises:
+            TypeError: If the database is shared with a snapshot.
         """
+        self._cow_check()
         self.schema = schema
 
     def set_charset(self, charset: str) -> None:
@@ -80,7 +99,10 @@ class HssSqlDatabase:
         Returns:
             None
 
+        Raises:
+            TypeError: If the database is shared with a snapshot.
         """
+        self._cow_check()
         self.charset = charset
 
     def set_collation(self, collation: str) -> None:
@@ -93,7 +115,10 @@ class HssSqlDatabase:
         Returns:
             None
 
+        Raises:
+            TypeError: If the database is shared with a snapshot.
         """
+        self._cow_check()
         self.collation = collation
 
     def add_table(self, table) -> None:
@@ -106,8 +131,10 @@ class HssSqlDatabase:
         Returns:
             None
 
+        Raises:
+            TypeError: If the database is shared with a snapshot.
         """
-        self.tables.append(table)
+        self._cow_adopt("tables", table)
 
     def remove_table(self, table_name: str) -> None:
         """
@@ -119,8 +146,32 @@ class HssSqlDatabase:
         Returns:
             None
 
+        Raises:
+            TypeError: If the database is shared with a snapshot.
+        """
+        self._cow_assign("tables", [table for table in self.tables if table.name != table_name])
+
+    def edit_table(self, table_name: str) -> HssSqlTable:
+        """
+        Return a table of the database that is safe to modify.
+
+        A table shared with a snapshot is replaced in this database by an O(1)
+        copy-on-write clone on the first edit, so the snapshot keeps its version.
+
+        Args:
+            table_name (str): The name of the table to edit.
+
+        Returns:
+            HssSqlTable: The table owned by this database.
+
+        Raises:
+            KeyError: If the database has no table with that name.
+            TypeError: If the database is shared with a snapshot.
         """
-        self.tables = [table for table in self.tables if table.name != table_name]
+        for index, table in enumerate(self.tables):
+            if getattr(table, "name", None) == table_name:
+                return self._cow_child("tables", index)
+        raise KeyError(f"Table not found: {table_name}")
 
     def generate_create_database(self) -> str:
         """
@@ -186,6 +237,23 @@ class HssSqlDatabase:
         self.script += show_info_command
         return show_info_command
 
+    def generate_schema_script(self) -> str:
+        """
+        Generate the full DDL script for the database and its tables.
+
+        Returns:
+            str: The CREATE DATABASE command followed by a CREATE TABLE command per table.
+
+        """
+        commands = [
+            f"CREATE DATABASE {self.database_name} CHARACTER SET {self.charset} COLLATE {self.collation};",
+            f"USE {self.database_name};",
+        ]
+        commands += [table.generate_create_table() for table in self.tables if hasattr(table, "generate_create_table")]
+        schema_script = "\n\n".join(commands) + "\n"
+        self.script += schema_script
+        return schema_script
+
     def to_dict(self) -> dict:
         """
         Convert the database object to a dictionary.
@@ -196,7 +264,7 @@ class HssSqlDatabase:
         """
         return {
             "database_name": self.database_name,
-            "tables": self.tables,
+            "tables": [table.to_dict() if hasattr(table, "to_dict") else table for table in self.tables],
             "schema": self.schema,
             "charset": self.charset,
             "collation": self.collation,
@@ -204,12 +272,14 @@ class HssSqlDatabase:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> 'HssSqlDatabase':
+    def from_dict(cls, data: dict, registry=None) -> 'HssSqlDatabase':
         """
         Create a database object from a dictionary.
 
         Args:
             data (dict): The dictionary containing database information.
+            registry (HssSqlColumnRegistry, optional): Column registry used to share
+                identical column definitions across the tables.
 
         Returns:
             HssSqlDatabase: The database object.
@@ -217,10 +287,23 @@ class HssSqlDatabase:
         """
 
         instance = cls(data["database_name"])
-        instance.tables = data.get("tables", [])
+        for table in data.get("tables", []):
+            if isinstance(table, dict):
+                table = HssSqlTable.from_dict(table, registry)
+            instance._cow_adopt("tables", table)
         instance.schema = data.get("schema", "public")
         instance.charset = data.get("charset", "utf8")
         instance.collation = data.get("collation", "utf8_general_ci")
         instance.options = data.get("options", {})
 
         return instance
+
+    def fingerprint(self) -> str:
+        """
+        Compute the structural hash of the database.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the canonical to_dict content.
+
+        """
+        return fingerprint(self.to_dict())
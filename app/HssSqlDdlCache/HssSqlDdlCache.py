@@ -0,0 +1,284 @@
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+from collections import OrderedDict
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlDialect.HssSqlDialect import HssSqlDialect
+from app.HssSqlGenerator.HssSqlGenerator import HssSqlGenerator
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+from app.HssSqlTypeRegistry.HssSqlTypeRegistry import HssSqlTypeRegistry
+
+
+def _renderer_version(*classes) -> str:
+    """
+    Compute a version tag of the code that renders DDL.
+
+    Args:
+        *classes: The classes whose source files take part in rendering.
+
+    Returns:
+        str: A short digest of the source files; it changes whenever one of them does.
+
+    """
+    digest = hashlib.sha256()
+    for cls in classes:
+        with open(inspect.getsourcefile(cls), "rb") as source_file:
+            digest.update(source_file.read())
+    return digest.hexdigest()[:12]
+
+
+class HssSqlDdlCache:
+    """
+    An on-disk, content-addressed cache of rendered DDL.
+
+    Entries are keyed by the structural fingerprint of a column, table or database,
+    so a schema that has not changed is served from disk instead of being rendered
+    again. Keys also carry the render kind and a renderer version tag, so entries
+    rendered by an older generator or dialect are never served. The cache is
+    bounded by size and evicts the least recently used entries.
+
+    Attributes:
+        directory (str): The directory holding the cache entries.
+        max_bytes (int): The maximum total size of the cache entries.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that required rendering.
+
+    Class Attributes:
+        DEFAULT_DIRECTORY (str): The cache directory under HssSqlGenerator.DEFAULT_PATH.
+        DEFAULT_MAX_BYTES (int): The default size limit of the cache.
+        SUFFIX (str): The file name suffix of cache entries.
+        RENDERER_VERSION (str): Digest of the column, table, database, dialect and type registry sources.
+
+    Methods:
+        key(model, kind: str, version: str = None) -> str: Compute the cache key of a model.
+        get(key: str) -> str: Return a cached entry, or None.
+        put(key: str, ddl: str) -> None: Store an entry and evict if over the size limit.
+        get_or_render(model, render=None, kind: str = None, version: str = None) -> str: Return cached DDL, rendering on a miss.
+        evict() -> None: Remove least recently used entries until under the size limit.
+        clear() -> None: Remove all entries.
+        size() -> int: Return the total size of the cached entries.
+
+    """
+
+    DEFAULT_DIRECTORY = os.path.join(HssSqlGenerator.DEFAULT_PATH, ".ddl_cache")
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    SUFFIX = ".sql"
+    RENDERER_VERSION = _renderer_version(HssSqlColumn, HssSqlTable, HssSqlDatabase, HssSqlDialect, HssSqlTypeRegistry)
+
+    _KIND = re.compile(r"[A-Za-z0-9_.]+")
+
+    def __init__(self, directory=None, max_bytes=None):
+        """
+        Initialize the cache and index the entries already on disk.
+
+        Args:
+            directory (str, optional): The cache directory. Defaults to DEFAULT_DIRECTORY.
+            max_bytes (int, optional): The size limit. Defaults to DEFAULT_MAX_BYTES.
+
+        Raises:
+            OSError: If an error occurs while creating the cache directory.
+        """
+        self.directory = directory if directory is not None else self.DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes if max_bytes is not None else self.DEFAULT_MAX_BYTES
+        self.hits = 0
+        self.misses = 0
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            raise OSError(f"Error creating cache directory: {e}")
+
+        self._entries = OrderedDict()
+        self._total = 0
+        existing = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                existing.append((stat.st_mtime, entry.name[:-len(self.SUFFIX)], stat.st_size))
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total += size
+
+    @classmethod
+    def key(cls, model, kind: str, version: str = None) -> str:
+        """
+        Compute the cache key of a model.
+
+        Args:
+            model: A column, table or database providing fingerprint().
+            kind (str): The kind of rendering, e.g. ``create_table``; letters, digits, ``_`` and ``.`` only.
+            version (str, optional): Version tag of the renderer. Defaults to RENDERER_VERSION.
+
+        Returns:
+            str: The cache key.
+
+        Raises:
+            ValueError: If the kind or version contains other characters.
+        """
+        version = cls.RENDERER_VERSION if version is None else version
+        for part in (kind, version):
+            if not isinstance(part, str) or not cls._KIND.fullmatch(part):
+                raise ValueError(f"Invalid cache key part: {part!r}")
+        return f"{model.fingerprint()}-{kind}-{version}"
+
+    def _path(self, key: str) -> str:
+        """
+        Return the file path of a cache entry.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The path of the entry file.
+
+        """
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key: str):
+        """
+        Return a cached entry and mark it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            str: The cached DDL, or None if the key is not cached.
+
+        """
+        if key not in self._entries:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as cache_file:
+                ddl = cache_file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self._total -= self._entries.pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return ddl
+
+    def put(self, key: str, ddl: str) -> None:
+        """
+        Store an entry and evict old entries if the cache is over its size limit.
+
+        Args:
+            key (str): The cache key.
+            ddl (str): The rendered DDL.
+
+        Returns:
+            None
+
+        """
+        data = ddl.encode("utf-8")
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, self._path(key))
+
+        self._total -= self._entries.pop(key, 0)
+        self._entries[key] = len(data)
+        self._total += len(data)
+        self.evict()
+
+    def get_or_render(self, model, render=None, kind: str = None, version: str = None) -> str:
+        """
+        Return the cached DDL of a model, rendering and storing it on a miss.
+
+        Args:
+            model: A column, table or database providing fingerprint().
+            render (callable, optional): Function rendering the model to DDL. Defaults to
+                generate_schema_script, generate_create_table or generate_column_definition.
+            kind (str, optional): The kind of rendering used in the key. Required for a custom
+                render function; defaults to the name of the default render function.
+            version (str, optional): Version tag of a custom render function. Defaults to RENDERER_VERSION.
+
+        Returns:
+            str: The rendered DDL.
+
+        Raises:
+            ValueError: If a custom render function is given without a kind, or the kind is invalid.
+        """
+        if render is None:
+            render = self._default_render(model)
+            kind = render.__name__ if kind is None else kind
+        elif kind is None:
+            raise ValueError("A kind is required to cache a custom render function")
+        key = self.key(model, kind, version)
+        ddl = self.get(key)
+        if ddl is not None:
+            self.hits += 1
+            return ddl
+        self.misses += 1
+        ddl = render(model)
+        self.put(key, ddl)
+        return ddl
+
+    @staticmethod
+    def _default_render(model):
+        """
+        Return the default render function for a model.
+
+        Args:
+            model: A column, table or database.
+
+        Returns:
+            callable: A function taking the model and returning its DDL.
+
+        Raises:
+            TypeError: If the model cannot be rendered.
+        """
+        if hasattr(model, "generate_schema_script"):
+            def generate_schema_script(database):
+                return database.generate_schema_script()
+            return generate_schema_script
+        if hasattr(model, "generate_create_table"):
+            def generate_create_table(table):
+                return table.generate_create_table()
+            return generate_create_table
+        if hasattr(model, "generate_column_definition"):
+            def generate_column_definition(column):
+                return column.generate_column_definition
+            return generate_column_definition
+        raise TypeError(f"Cannot render object of type {type(model).__name__}")
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache is under its size limit.
+
+        Returns:
+            None
+
+        """
+        while self._total > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+
+        Returns:
+            None
+
+        """
+        max_bytes, self.max_bytes = self.max_bytes, -1
+        self.evict()
+        self.max_bytes = max_bytes
+
+    def size(self) -> int:
+        """
+        Return the total size of the cached entries.
+
+        Returns:
+            int: The size in bytes.
+
+        """
+        return self._total
@@ -0,0 +1,497 @@
+import re
+from string import Template
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+
+
+class HssSqlDialect:
+    """
+    A SQL dialect rendering HssSqlDatabase and HssSqlTable models to DDL.
+
+    A dialect is a type-mapping table plus a set of statement templates. Templates
+    are compiled once per dialect class, and the model is traversed once when
+    rendering into several dialects with render_many.
+
+    Class Attributes:
+        NAME (str): The dialect name.
+        TYPE_MAP (dict): Maps a base data type to a target type template, where
+            ``$parameter`` is the original parameter and ``$members`` the quoted ENUM/SET members.
+            An empty map emits data types unchanged; otherwise unmapped types raise ValueError.
+        UNSIGNED_TYPE_MAP (dict): Wider target type templates of UNSIGNED base types.
+        UNSIGNED_IDENTITY_MAP (dict): Target type templates of UNSIGNED AUTO_INCREMENT columns,
+            taking precedence over UNSIGNED_TYPE_MAP.
+        UNSIGNED_CHECK (bool): Emulate UNSIGNED with a ``CHECK (column >= 0)`` constraint.
+        CONSTRAINT_MAP (dict): Rewrites of column constraints by leading keyword; None drops the constraint.
+        BOOLEAN_DEFAULTS (dict): Rewrites of the DEFAULT values of BOOL and BOOLEAN columns.
+        COMMENT_TEMPLATE (Template): Template of the statement carrying a column COMMENT, or None.
+        INDEX_KIND_TEMPLATES (dict): Standalone statements replacing the FULLTEXT and SPATIAL
+            table constraints of MySQL; None drops the index, leaving an SQL comment.
+        ENUM_CHECK (bool): Emulate ENUM with a CHECK constraint.
+        DATABASE_TEMPLATES (tuple): Templates of the statements opening a database script.
+        TABLE_TEMPLATE (Template): Template of a CREATE TABLE statement.
+        COLUMN_TEMPLATE (Template): Template of a column definition.
+        GENERATED_TEMPLATE (Template): Template of the generation clause of a generated column.
+        GENERATED_STORAGE_MAP (dict): Rewrites of the generated column storage kind.
+        INLINE_INDEXES (bool): Declare indexes inside CREATE TABLE rather than with CREATE INDEX.
+        INDEX_TEMPLATE (Template): Template of a standalone CREATE INDEX statement. Standalone
+            index names are prefixed with the table name, since they are schema-wide.
+
+    Methods:
+        render_type(data_type: str, name: str = None, parsed: tuple = None, identity: bool = False) -> tuple:
+            Map a data type and its extra constraints.
+        render_constraints(constraints: list) -> list: Rewrite column constraints.
+        render_column(column) -> str: Render a column definition.
+        render_generated(column) -> str: Render the generation clause of a column.
+        render_indexes(table) -> list: Render the standalone index statements of a table.
+        render_comments(table) -> list: Render the column comment statements of a table.
+        render_table(table) -> str: Render a CREATE TABLE statement.
+        render_database_header(database) -> str: Render the statements opening a database script.
+        render_database(database) -> str: Render a database and all of its tables.
+        get(name: str) -> 'HssSqlDialect': Return a registered dialect by name.
+        render_many(database, dialects: list = None) -> dict: Render a database into several dialects at once.
+
+    """
+
+    NAME = None
+    TYPE_MAP = {}
+    UNSIGNED_TYPE_MAP = {}
+    UNSIGNED_IDENTITY_MAP = {}
+    UNSIGNED_CHECK = False
+    CONSTRAINT_MAP = {}
+    BOOLEAN_DEFAULTS = {}
+    COMMENT_TEMPLATE = None
+    INDEX_KIND_TEMPLATES = {}
+    ENUM_CHECK = False
+    DATABASE_TEMPLATES = ()
+    TABLE_TEMPLATE = Template("CREATE TABLE $name (\n$body\n);")
+    COLUMN_TEMPLATE = Template("    $name $type$generated$constraints")
+    GENERATED_TEMPLATE = Template(" GENERATED ALWAYS AS ($expression) $storage")
+    GENERATED_STORAGE_MAP = {}
+    INLINE_INDEXES = False
+    INDEX_TEMPLATE = Template("CREATE ${unique}INDEX $name ON $table ($parts);")
+
+    DIALECTS = {}
+
+    _INDEX_KIND = re.compile(r"^(FULLTEXT|SPATIAL)\s+(?:INDEX\s+|KEY\s+)?(?:[`\"]?(\w+)[`\"]?\s*)?\((.*)\)$",
+                             re.IGNORECASE | re.DOTALL)
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Register dialect subclasses and compile their templates once.
+        """
+        super().__init_subclass__(**kwargs)
+        cls._type_templates = {base: Template(target) for base, target in cls.TYPE_MAP.items()}
+        cls._unsigned_templates = {base: Template(target) for base, target in cls.UNSIGNED_TYPE_MAP.items()}
+        cls._identity_templates = {base: Template(target) for base, target in cls.UNSIGNED_IDENTITY_MAP.items()}
+        cls._constraint_keywords = sorted(cls.CONSTRAINT_MAP, key=len, reverse=True)
+        cls._index_kind_templates = {kind: Template(template) if template is not None else None
+                                     for kind, template in cls.INDEX_KIND_TEMPLATES.items()}
+        cls._database_templates = tuple(Template(template) for template in cls.DATABASE_TEMPLATES)
+        if cls.NAME:
+            HssSqlDialect.DIALECTS[cls.NAME] = cls
+
+    @classmethod
+    def get(cls, name: str) -> 'HssSqlDialect':
+        """
+        Return a registered dialect by name.
+
+        Args:
+            name (str): The dialect name, e.g. ``postgresql``.
+
+        Returns:
+            HssSqlDialect: An instance of the dialect.
+
+        Raises:
+            ValueError: If no dialect is registered under the name.
+        """
+        try:
+            return cls.DIALECTS[name.lower()]()
+        except KeyError:
+            raise ValueError(f"Invalid dialect: {name}")
+
+    def render_type(self, data_type: str, name: str = None, parsed: tuple = None, identity: bool = False) -> tuple:
+        """
+        Map a data type to this dialect.
+
+        UNSIGNED (or ZEROFILL) types are widened through UNSIGNED_TYPE_MAP and, with
+        UNSIGNED_CHECK, keep their lower bound with a CHECK constraint.
+
+        Args:
+            data_type (str): The data type, e.g. ``VARCHAR(255)`` or ``INT UNSIGNED``.
+            name (str, optional): The column name, used by emulated ENUM and UNSIGNED checks.
+            parsed (tuple, optional): The result of HssSqlColumn.split_data_type, if known.
+            identity (bool, optional): Whether the column is an AUTO_INCREMENT column.
+
+        Returns:
+            tuple: The target type and a list of extra column constraints.
+
+        Raises:
+            ValueError: If the dialect has a type map without an entry for the data type.
+        """
+        base_type, parameter = parsed or HssSqlColumn.split_data_type(data_type)
+        if not self.TYPE_MAP:
+            return data_type, []
+        unsigned = HssSqlColumn.TYPE_REGISTRY.is_unsigned(data_type)
+        template = None
+        if unsigned:
+            template = (identity and self._identity_templates.get(base_type)) or self._unsigned_templates.get(base_type)
+        template = template or self._type_templates.get(base_type)
+        if template is None:
+            raise ValueError(f"Data type {data_type} has no {self.NAME} equivalent")
+        members = ", ".join("'" + member.replace("'", "''") + "'" for member in HssSqlColumn.parse_members(parameter)) \
+            if base_type in ("ENUM", "SET") else ""
+        target = template.substitute(parameter=parameter or "", members=members)
+        target = target.replace("()", "")
+        extra = []
+        if base_type == "ENUM" and self.ENUM_CHECK and name:
+            extra.append(f"CHECK ({name} IN ({members}))")
+        if unsigned and self.UNSIGNED_CHECK and name:
+            extra.append(f"CHECK ({name} >= 0)")
+        return target, extra
+
+    def render_constraints(self, constraints) -> list:
+        """
+        Rewrite column constraints for this dialect.
+
+        A constraint starting with a keyword of CONSTRAINT_MAP, e.g. ``ON UPDATE``, is
+        replaced by the rewrite of the keyword, or dropped when the rewrite is None.
+
+        Args:
+            constraints (list): The column constraints.
+
+        Returns:
+            list: The rewritten constraints.
+
+        """
+        rendered = []
+        for constraint in constraints:
+            normalized = " ".join(constraint.upper().split())
+            keyword = next((keyword for keyword in self._constraint_keywords
+                            if normalized == keyword or normalized.startswith(keyword + " ")), None)
+            rewrite = self.CONSTRAINT_MAP[keyword] if keyword is not None else constraint
+            if rewrite is not None:
+                rendered.append(rewrite)
+        return rendered
+
+    def render_column(self, column, parsed: tuple = None) -> str:
+        """
+        Render a column definition.
+
+        Args:
+            column (HssSqlColumn): The column.
+            parsed (tuple, optional): The result of HssSqlColumn.split_data_type, if known.
+
+        Returns:
+            str: The column definition.
+
+        """
+        parsed = parsed or HssSqlColumn.split_data_type(column.data_type)
+        identity = any(constraint.upper() == "AUTO_INCREMENT" for constraint in column.constraints)
+        target, extra = self.render_type(column.data_type, column.name, parsed, identity)
+        constraints = self.render_constraints(column.constraints)
+        if self.BOOLEAN_DEFAULTS and parsed[0] in ("BOOL", "BOOLEAN"):
+            constraints = [self._boolean_default(constraint) for constraint in constraints]
+        constraints += extra
+        return self.COLUMN_TEMPLATE.substitute(
+            name=column.name,
+            type=target,
+            generated=self.render_generated(column),
+            constraints="".join(f" {constraint}" for constraint in constraints),
+        )
+
+    def _boolean_default(self, constraint: str) -> str:
+        """
+        Rewrite the DEFAULT of a boolean column through BOOLEAN_DEFAULTS, e.g. ``DEFAULT 0`` to ``DEFAULT FALSE``.
+
+        Args:
+            constraint (str): The column constraint.
+
+        Returns:
+            str: The rewritten constraint, or the constraint itself.
+
+        """
+        keyword, _, value = constraint.partition(" ")
+        value = value.strip().strip("'").upper()
+        if keyword.upper() != "DEFAULT" or value not in self.BOOLEAN_DEFAULTS:
+            return constraint
+        return f"DEFAULT {self.BOOLEAN_DEFAULTS[value]}"
+
+    def render_generated(self, column) -> str:
+        """
+        Render the generation clause of a column.
+
+        Args:
+            column (HssSqlColumn): The column.
+
+        Returns:
+            str: The clause with a leading space, or an empty string for a regular column.
+
+        """
+        if getattr(column, "generated_expression", None) is None:
+            return ""
+        storage = self.GENERATED_STORAGE_MAP.get(column.generated_storage, column.generated_storage)
+        return self.GENERATED_TEMPLATE.substitute(expression=column.generated_expression, storage=storage)
+
+    def render_indexes(self, table) -> list:
+        """
+        Render the standalone CREATE INDEX statements of a table.
+
+        Key prefix lengths, which only MySQL supports, are dropped from column parts.
+        FULLTEXT and SPATIAL table constraints are rendered through INDEX_KIND_TEMPLATES.
+
+        Args:
+            table (HssSqlTable): The table.
+
+        Returns:
+            list: The statements; empty when the dialect declares indexes inline.
+
+        """
+        statements = []
+        if not self.INLINE_INDEXES:
+            statements = [self.INDEX_TEMPLATE.substitute(
+                unique="UNIQUE " if index.get("unique") else "",
+                name=f"{table.name}_{index['name']}",
+                table=table.name,
+                parts=", ".join(re.sub(r"\s*\(\d+\)", "", part) if table.is_column_part(part) else f"({part})"
+                                for part in index["parts"]),
+            ) for index in table.indexes]
+        kinds = [kind for kind in map(self._index_kind, table.constraints) if kind is not None]
+        for position, (kind, name, columns) in enumerate(kinds):
+            name = f"{table.name}_{name}" if name else f"{table.name}_{kind.lower()}_{position}"
+            template = self._index_kind_templates[kind]
+            if template is None:
+                statements.append(f"-- {kind} INDEX {name} ({', '.join(columns)}) dropped: not supported by {self.NAME}")
+                continue
+            statements.append(template.substitute(
+                name=name,
+                table=table.name,
+                columns=", ".join(columns),
+                document=" || ' ' || ".join(f"COALESCE({column}, '')" for column in columns),
+            ))
+        return statements
+
+    def render_comments(self, table) -> list:
+        """
+        Render the statements carrying the COMMENT clauses of the columns of a table.
+
+        Args:
+            table (HssSqlTable): The table.
+
+        Returns:
+            list: The statements; empty when the dialect keeps comments inline or drops them.
+
+        """
+        if self.COMMENT_TEMPLATE is None:
+            return []
+        statements = []
+        for column in table.columns:
+            for constraint in column.constraints:
+                if HssSqlColumn.TYPE_REGISTRY.constraint_keyword(constraint) == "COMMENT":
+                    comment = constraint[len("COMMENT"):].strip().replace("\\'", "''")
+                    statements.append(self.COMMENT_TEMPLATE.substitute(table=table.name, column=column.name,
+                                                                       comment=comment))
+        return statements
+
+    def _index_kind(self, constraint: str) -> tuple:
+        """
+        Parse a FULLTEXT or SPATIAL table constraint this dialect renders separately.
+
+        Args:
+            constraint (str): The table constraint, e.g. ``FULLTEXT KEY ft_body (body)``.
+
+        Returns:
+            tuple: The kind, the index name (or None) and the column names, or None when
+                the constraint is rendered inline.
+
+        """
+        match = self._INDEX_KIND.match(constraint.strip())
+        if match is None or match.group(1).upper() not in self._index_kind_templates:
+            return None
+        columns = [re.sub(r"\s*\(\d+\)$", "", part.strip().strip("`\"")) for part in match.group(3).split(",")]
+        return match.group(1).upper(), match.group(2), columns
+
+    def render_table(self, table, parsed: list = None) -> str:
+        """
+        Render a CREATE TABLE statement, followed by its CREATE INDEX statements
+        when the dialect does not declare indexes inline.
+
+        Args:
+            table (HssSqlTable): The table.
+            parsed (list, optional): split_data_type results of the columns, if known.
+
+        Returns:
+            str: The statement.
+
+        """
+        parsed = parsed or [None] * len(table.columns)
+        lines = [self.render_column(column, types) for column, types in zip(table.columns, parsed)]
+        lines += [f"    {constraint}" for constraint in table.constraints if self._index_kind(constraint) is None]
+        if self.INLINE_INDEXES:
+            lines += [f"    {table.render_index(index)}" for index in table.indexes]
+        statement = self.TABLE_TEMPLATE.substitute(name=table.name, body=",\n".join(lines))
+        return "\n".join([statement] + self.render_indexes(table) + self.render_comments(table))
+
+    def render_database_header(self, database) -> str:
+        """
+        Render the statements opening a database script.
+
+        Args:
+            database (HssSqlDatabase): The database.
+
+        Returns:
+            str: The statements.
+
+        """
+        values = {
+            "name": database.database_name,
+            "schema": database.schema,
+            "charset": database.charset,
+            "collation": database.collation,
+            "encoding": self.encoding(database.charset),
+        }
+        return "\n\n".join(template.substitute(values) for template in self._database_templates)
+
+    @staticmethod
+    def encoding(charset: str) -> str:
+        """
+        Map a MySQL character set to a client encoding name.
+
+        Args:
+            charset (str): The character set, e.g. ``utf8mb4``.
+
+        Returns:
+            str: The encoding name.
+
+        """
+        return "UTF8" if charset.lower().startswith("utf8") else charset.upper()
+
+    def render_database(self, database) -> str:
+        """
+        Render a database and all of its tables.
+
+        Args:
+            database (HssSqlDatabase): The database.
+
+        Returns:
+            str: The DDL script.
+
+        """
+        return self.render_many(database, [self])[self.NAME]
+
+    @classmethod
+    def render_many(cls, database, dialects=None) -> dict:
+        """
+        Render a database into several dialects in a single traversal of the model.
+
+        Args:
+            database (HssSqlDatabase): The database.
+            dialects (list, optional): Dialect instances or names. Defaults to all registered.
+
+        Returns:
+            dict: Mapping of dialect name to DDL script.
+
+        """
+        dialects = [cls.get(d) if isinstance(d, str) else d for d in (dialects or list(cls.DIALECTS))]
+        scripts = {dialect.NAME: [dialect.render_database_header(database)] for dialect in dialects}
+        for table in database.tables:
+            if not hasattr(table, "columns"):
+                continue
+            parsed = [HssSqlColumn.split_data_type(column.data_type) for column in table.columns]
+            for dialect in dialects:
+                scripts[dialect.NAME].append(dialect.render_table(table, parsed))
+        return {name: "\n\n".join(part for part in parts if part) + "\n" for name, parts in scripts.items()}
+
+
+class HssSqlMySqlDialect(HssSqlDialect):
+    """
+    The MySQL dialect; data types are emitted unchanged.
+    """
+
+    NAME = "mysql"
+    INLINE_INDEXES = True
+    DATABASE_TEMPLATES = (
+        "CREATE DATABASE $name CHARACTER SET $charset COLLATE $collation;",
+        "USE $name;",
+    )
+
+
+class HssSqlPostgreSqlDialect(HssSqlDialect):
+    """
+    The PostgreSQL dialect; tables are created in the database schema.
+
+    PostgreSQL only has STORED generated columns, so VIRTUAL ones are stored.
+    Spatial types map to PostGIS geometries. UNSIGNED integers are widened to the
+    next signed type with a CHECK (column >= 0). FULLTEXT indexes become GIN
+    indexes over to_tsvector and SPATIAL indexes GiST indexes. ON UPDATE clauses
+    are dropped, since PostgreSQL needs a trigger for them, and so are the MySQL
+    column character sets and collations. Column comments become COMMENT ON COLUMN
+    statements and boolean defaults of 0 and 1 become FALSE and TRUE.
+    """
+
+    NAME = "postgresql"
+    TYPE_MAP = {
+        "BIT": "BIT($parameter)", "TINYINT": "SMALLINT", "BOOL": "BOOLEAN", "BOOLEAN": "BOOLEAN",
+        "SMALLINT": "SMALLINT", "MEDIUMINT": "INTEGER", "INT": "INTEGER", "INTEGER": "INTEGER",
+        "BIGINT": "BIGINT", "FLOAT": "REAL", "DOUBLE": "DOUBLE PRECISION", "DECIMAL": "NUMERIC($parameter)",
+        "CHAR": "CHAR($parameter)", "VARCHAR": "VARCHAR($parameter)", "BINARY": "BYTEA", "VARBINARY": "BYTEA",
+        "TINYBLOB": "BYTEA", "BLOB": "BYTEA", "MEDIUMBLOB": "BYTEA", "LONGBLOB": "BYTEA",
+        "TINYTEXT": "TEXT", "TEXT": "TEXT", "MEDIUMTEXT": "TEXT", "LONGTEXT": "TEXT",
+        "ENUM": "VARCHAR(255)", "SET": "TEXT",
+        "DATE": "DATE", "DATETIME": "TIMESTAMP", "TIMESTAMP": "TIMESTAMP", "TIME": "TIME", "YEAR": "SMALLINT",
+        "JSON": "JSONB", "GEOMETRY": "GEOMETRY", "POINT": "GEOMETRY(Point)", "LINESTRING": "GEOMETRY(LineString)",
+        "POLYGON": "GEOMETRY(Polygon)", "MULTIPOINT": "GEOMETRY(MultiPoint)",
+        "MULTILINESTRING": "GEOMETRY(MultiLineString)", "MULTIPOLYGON": "GEOMETRY(MultiPolygon)",
+        "GEOMETRYCOLLECTION": "GEOMETRY(GeometryCollection)",
+    }
+    UNSIGNED_TYPE_MAP = {
+        "TINYINT": "SMALLINT", "SMALLINT": "INTEGER", "MEDIUMINT": "INTEGER", "INT": "BIGINT", "INTEGER": "BIGINT",
+        "BIGINT": "NUMERIC(20)",
+    }
+    UNSIGNED_IDENTITY_MAP = {"BIGINT": "BIGINT"}
+    UNSIGNED_CHECK = True
+    CONSTRAINT_MAP = {"AUTO_INCREMENT": "GENERATED BY DEFAULT AS IDENTITY", "ON UPDATE": None,
+                      "CHARACTER SET": None, "CHARSET": None, "COLLATE": None, "COMMENT": None}
+    BOOLEAN_DEFAULTS = {"0": "FALSE", "1": "TRUE", "B'0'": "FALSE", "B'1'": "TRUE", "FALSE": "FALSE", "TRUE": "TRUE"}
+    COMMENT_TEMPLATE = Template("COMMENT ON COLUMN $table.$column IS $comment;")
+    INDEX_KIND_TEMPLATES = {
+        "FULLTEXT": "CREATE INDEX $name ON $table USING GIN (to_tsvector('simple', $document));",
+        "SPATIAL": "CREATE INDEX $name ON $table USING GIST ($columns);",
+    }
+    GENERATED_STORAGE_MAP = {"VIRTUAL": "STORED"}
+    ENUM_CHECK = True
+    DATABASE_TEMPLATES = (
+        "CREATE DATABASE $name ENCODING '$encoding';",
+        "CREATE SCHEMA IF NOT EXISTS $schema;",
+        "SET search_path TO $schema;",
+    )
+
+
+class HssSqlSqliteDialect(HssSqlDialect):
+    """
+    The SQLite dialect; data types are mapped to SQLite storage classes.
+
+    UNSIGNED is kept as a CHECK (column >= 0). ON UPDATE clauses, column character
+    sets, collations and comments, and the FULLTEXT and SPATIAL indexes, which need
+    FTS5 and R*Tree virtual tables, are dropped. Boolean defaults become 0 and 1.
+    """
+
+    NAME = "sqlite"
+    TYPE_MAP = {
+        "BIT": "INTEGER", "TINYINT": "INTEGER", "BOOL": "INTEGER", "BOOLEAN": "INTEGER",
+        "SMALLINT": "INTEGER", "MEDIUMINT": "INTEGER", "INT": "INTEGER", "INTEGER": "INTEGER",
+        "BIGINT": "INTEGER", "FLOAT": "REAL", "DOUBLE": "REAL", "DECIMAL": "NUMERIC",
+        "CHAR": "TEXT", "VARCHAR": "TEXT", "BINARY": "BLOB", "VARBINARY": "BLOB",
+        "TINYBLOB": "BLOB", "BLOB": "BLOB", "MEDIUMBLOB": "BLOB", "LONGBLOB": "BLOB",
+        "TINYTEXT": "TEXT", "TEXT": "TEXT", "MEDIUMTEXT": "TEXT", "LONGTEXT": "TEXT",
+        "ENUM": "TEXT", "SET": "TEXT",
+        "DATE": "TEXT", "DATETIME": "TEXT", "TIMESTAMP": "TEXT", "TIME": "TEXT", "YEAR": "INTEGER",
+        "JSON": "TEXT", "GEOMETRY": "BLOB", "POINT": "BLOB", "LINESTRING": "BLOB", "POLYGON": "BLOB",
+        "MULTIPOINT": "BLOB", "MULTILINESTRING": "BLOB", "MULTIPOLYGON": "BLOB", "GEOMETRYCOLLECTION": "BLOB",
+    }
+    UNSIGNED_CHECK = True
+    CONSTRAINT_MAP = {"AUTO_INCREMENT": None, "ON UPDATE": None, "CHARACTER SET": None, "CHARSET": None,
+                      "COLLATE": None, "COMMENT": None}
+    BOOLEAN_DEFAULTS = {"0": "0", "1": "1", "B'0'": "0", "B'1'": "1", "FALSE": "0", "TRUE": "1"}
+    INDEX_KIND_TEMPLATES = {"FULLTEXT": None, "SPATIAL": None}
+    ENUM_CHECK = True
+    DATABASE_TEMPLATES = ("-- SQLite database: $name",)
@@ -3,6 +3,8 @@ import os
 import click
 from rich.console import Console
 
+from app.HssSqlWatcher.HssSqlWatcher import HssSqlWatcher
+
 
 class HssSqlGenerator:
     """
@@ -14,6 +16,8 @@ class HssSqlGenerator:
         DEFAULT_PATH (str): The default path for session file.
         TABLES (dict): A dictionary to store tables.
         CHANGES (dict): A dictionary to store changes.
+        HISTORY (dict): Copy-on-write snapshots available to undo, as a list per model.
+        REDO_HISTORY (dict): Copy-on-write snapshots available to redo, as a list per model.
         BANNER (str): The banner read from the file.
         MENU_OPTIONS (dict): Placeholder for menu options.
         _SESSION_FILE_PATH (str): The path for the session file.
@@ -28,6 +32,10 @@ class HssSqlGenerator:
         display_banner(): Display the banner using rich console.
         set_session_file_path(path): Set the session file path.
         get_session_file_path(): Get the session file path.
+        checkpoint(model): Record an undo point for a database or table model.
+        undo(model): Roll a model back to its previous checkpoint.
+        redo(model): Re-apply the last undone change of a model.
+        watch(output_dir, interval, debounce): Regenerate DDL as schema files in the session path change.
     """
 
     CONSOLE_MIN_WIDTH = 100
@@ -50,7 +58,7 @@ class HssSqlGenerator:
             FileNotFoundError: If the banner file is not found.
         """
         try:
-            with open("assets/banner.txt", "r") as banner_file:
+            with open(os.path.join(cls.SCRIPT_DIRECTORY, "assets", "banner.txt"), "r") as banner_file:
                 banner = banner_file.read()
             return banner
         except FileNotFoundError as e:
@@ -68,6 +76,8 @@ class HssSqlGenerator:
         """
         self.TABLES = {}
         self.CHANGES = {}
+        self.HISTORY = {}
+        self.REDO_HISTORY = {}
         self.BANNER = self.get_banner()
 
         if session_file_path is None:
@@ -123,6 +133,68 @@ class HssSqlGenerator:
         """
         return self._SESSION_FILE_PATH
 
+    def checkpoint(self, model):
+        """
+        Record an undo point for a database or table model.
+
+        Snapshots are copy-on-write, so recording one costs O(1) regardless of
+        the size of the model. Every model has its own undo and redo history.
+
+        Args:
+            model: The HssSqlDatabase or HssSqlTable about to be edited.
+        """
+        self.HISTORY.setdefault(model, []).append(model.snapshot())
+        self.REDO_HISTORY.pop(model, None)
+
+    def undo(self, model):
+        """
+        Roll a model back to its previous checkpoint.
+
+        Args:
+            model: The HssSqlDatabase or HssSqlTable to roll back.
+
+        Returns:
+            bool: True if a checkpoint was restored, False if the model has no checkpoint.
+        """
+        history = self.HISTORY.get(model)
+        if not history:
+            return False
+        self.REDO_HISTORY.setdefault(model, []).append(model.snapshot())
+        model.restore(history.pop())
+        return True
+
+    def redo(self, model):
+        """
+        Re-apply the last undone change of a model.
+
+        Args:
+            model: The HssSqlDatabase or HssSqlTable to roll forward.
+
+        Returns:
+            bool: True if a change was re-applied, False if there is nothing to redo.
+        """
+        history = self.REDO_HISTORY.get(model)
+        if not history:
+            return False
+        self.HISTORY.setdefault(model, []).append(model.snapshot())
+        model.restore(history.pop())
+        return True
+
+    def watch(self, output_dir=None, interval=0.5, debounce=0.3):
+        """
+        Regenerate DDL as schema files in the session path change, until interrupted.
+
+        Args:
+            output_dir (str): Directory for the generated .sql files. Defaults to
+                the "generated" directory inside the session path.
+            interval (float): Seconds between two scans of the session path.
+            debounce (float): Quiet period before a burst of saves is rebuilt.
+        """
+        watcher = HssSqlWatcher(self.get_session_file_path(), output_dir, interval, debounce)
+        self.CONSOLE.print(f"Watching {watcher.directory} (Ctrl+C to stop)")
+        watcher.watch(lambda rebuilt: self.CONSOLE.print(f"Regenerated: {', '.join(sorted(rebuilt))}"),
+                      on_skip=lambda path, error: self.CONSOLE.print(f"Skipping {path}: {error}", markup=False))
+
     # Placeholder for additional methods related to menu and script generation
 
 # Example usage:
@@ -0,0 +1,430 @@
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+class HssSqlIntrospector:
+    """
+    An importer building HssSqlDatabase models from the catalog of an existing database.
+
+    Catalog metadata is read with bulk queries over batches of tables, never one
+    query per table: information_schema COLUMNS and STATISTICS for MySQL, and
+    sqlite_master joined with the pragma table-valued functions for SQLite. The
+    batches run in parallel on a thread pool, each worker thread holding its own
+    connection from the connection factory. SQLite expression indexes, whose key
+    parts the pragmas do not expose, are skipped and listed in ``skipped``.
+
+    Attributes:
+        connect (callable): Factory returning a new DB-API connection.
+        dialect (str): ``mysql`` or ``sqlite``.
+        workers (int): Number of worker threads.
+        batch_size (int): Number of tables per bulk query.
+        registry (HssSqlColumnRegistry): Registry interning identical columns, or None.
+        skipped (list): (table, index, reason) tuples of the indexes the last import left out.
+
+    Class Attributes:
+        DIALECTS (tuple): The supported catalog dialects.
+        PLACEHOLDERS (dict): The DB-API parameter placeholder of every dialect.
+        UNQUOTED_DEFAULT_FAMILIES (tuple): Type families whose MySQL defaults are emitted unquoted.
+
+    Methods:
+        from_sqlite(path: str, **kwargs) -> 'HssSqlIntrospector': Create an importer for a SQLite file.
+        list_tables(schema: str = None) -> list: List the base tables of a schema.
+        import_database(schema: str = None, database_name: str = None, tables: list = None) -> HssSqlDatabase: Import a schema.
+        close() -> None: Close the connections opened by the importer.
+
+    """
+
+    DIALECTS = ("mysql", "sqlite")
+
+    PLACEHOLDERS = {"mysql": "%s", "sqlite": "?"}
+
+    UNQUOTED_DEFAULT_FAMILIES = ("integer", "float", "decimal", "boolean", "bit", "year")
+
+    _MYSQL_TABLES = (
+        "SELECT TABLE_NAME FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = {p} AND TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_NAME"
+    )
+    _MYSQL_SCHEMA = (
+        "SELECT DEFAULT_CHARACTER_SET_NAME, DEFAULT_COLLATION_NAME "
+        "FROM information_schema.SCHEMATA WHERE SCHEMA_NAME = {p}"
+    )
+    _MYSQL_COLUMNS = (
+        "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT, EXTRA, GENERATION_EXPRESSION "
+        "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = {p} AND TABLE_NAME IN ({names}) "
+        "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+    )
+    _MYSQL_INDEXES = (
+        "SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART, EXPRESSION, INDEX_TYPE "
+        "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = {p} AND TABLE_NAME IN ({names}) "
+        "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+    )
+    _SQLITE_TABLES = (
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' ORDER BY name"
+    )
+    _SQLITE_COLUMNS = (
+        "SELECT m.name, p.name, p.type, p.\"notnull\", p.dflt_value, p.pk "
+        "FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+        "WHERE m.type = 'table' AND m.name IN ({names}) ORDER BY m.name, p.cid"
+    )
+    _SQLITE_INDEXES = (
+        "SELECT m.name, l.name, l.\"unique\", i.name, l.origin "
+        "FROM sqlite_master AS m JOIN pragma_index_list(m.name) AS l JOIN pragma_index_info(l.name) AS i "
+        "WHERE m.type = 'table' AND l.origin IN ('c', 'u') AND m.name IN ({names}) ORDER BY m.name, l.name, i.seqno"
+    )
+
+    def __init__(self, connect, dialect: str = "mysql", workers: int = 8, batch_size: int = 500, registry=None):
+        """
+        Initialize the HssSqlIntrospector object.
+
+        Args:
+            connect (callable): Factory returning a new DB-API connection, called once per worker thread.
+            dialect (str, optional): ``mysql`` or ``sqlite``.
+            workers (int, optional): Number of worker threads.
+            batch_size (int, optional): Number of tables per bulk query.
+            registry (HssSqlColumnRegistry, optional): Registry interning identical columns.
+
+        Raises:
+            ValueError: If the dialect, worker count or batch size is invalid.
+        """
+        if dialect not in self.DIALECTS:
+            raise ValueError(f"Invalid dialect: {dialect}")
+        if workers < 1 or batch_size < 1:
+            raise ValueError(f"Invalid workers ({workers}) or batch size ({batch_size})")
+        self.connect = connect
+        self.dialect = dialect
+        self.workers = workers
+        self.batch_size = batch_size
+        self.registry = registry
+        self.skipped = []
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+
+    @classmethod
+    def from_sqlite(cls, path: str, **kwargs) -> 'HssSqlIntrospector':
+        """
+        Create an importer for a SQLite database file.
+
+        Batches are fetched in parallel like any other catalog: SQLite releases the
+        GIL while it runs a query, so the worker connections read concurrently.
+
+        Args:
+            path (str): The database file.
+            **kwargs: Further arguments of the constructor.
+
+        Returns:
+            HssSqlIntrospector: The importer.
+
+        """
+        return cls(lambda: sqlite3.connect(path, check_same_thread=False), "sqlite", **kwargs)
+
+    def _connection(self):
+        """
+        Return the connection of the calling thread, opening it on first use.
+
+        Returns:
+            The DB-API connection.
+
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self.connect()
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _query(self, sql: str, parameters=()) -> list:
+        """
+        Run a query on the connection of the calling thread.
+
+        Args:
+            sql (str): The query, with ``{p}`` and ``{names}`` already expanded.
+            parameters (tuple, optional): The query parameters.
+
+        Returns:
+            list: The result rows.
+
+        """
+        cursor = self._connection().cursor()
+        try:
+            cursor.execute(sql, tuple(parameters))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _bulk(self, template: str, schema, names: list) -> list:
+        """
+        Run a catalog query over a batch of tables.
+
+        Args:
+            template (str): The query template with ``{p}`` and ``{names}`` fields.
+            schema (str): The schema, or None for SQLite.
+            names (list): The table names of the batch.
+
+        Returns:
+            list: The result rows.
+
+        """
+        placeholder = self.PLACEHOLDERS[self.dialect]
+        sql = template.format(p=placeholder, names=", ".join([placeholder] * len(names)))
+        parameters = ([schema] if self.dialect == "mysql" else []) + list(names)
+        return self._query(sql, parameters)
+
+    def close(self) -> None:
+        """
+        Close the connections opened by the importer.
+
+        Returns:
+            None
+
+        """
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+    def list_tables(self, schema: str = None) -> list:
+        """
+        List the base tables of a schema.
+
+        Args:
+            schema (str, optional): The MySQL schema; ignored for SQLite.
+
+        Returns:
+            list: The table names.
+
+        """
+        if self.dialect == "sqlite":
+            return [row[0] for row in self._query(self._SQLITE_TABLES)]
+        return [row[0] for row in self._query(self._MYSQL_TABLES.format(p=self.PLACEHOLDERS["mysql"]), [schema])]
+
+    def import_database(self, schema: str = None, database_name: str = None, tables: list = None) -> HssSqlDatabase:
+        """
+        Import a schema into an HssSqlDatabase model.
+
+        Args:
+            schema (str, optional): The MySQL schema to import; ignored for SQLite.
+            database_name (str, optional): Name of the model. Defaults to the schema, or ``main``.
+            tables (list, optional): Restrict the import to these tables.
+
+        Returns:
+            HssSqlDatabase: The database with its tables, columns, keys and indexes. Indexes
+            that could not be imported are listed in ``skipped``.
+
+        Raises:
+            ValueError: If no schema is given for a MySQL import.
+        """
+        if self.dialect == "mysql" and not schema:
+            raise ValueError("A schema is required to import a MySQL catalog")
+        database = HssSqlDatabase(database_name or schema or "main")
+        self.skipped = []
+        if self.dialect == "mysql":
+            rows = self._query(self._MYSQL_SCHEMA.format(p=self.PLACEHOLDERS["mysql"]), [schema])
+            if rows:
+                database.charset, database.collation = rows[0]
+        names = tables if tables is not None else self.list_tables(schema)
+        batches = [names[start:start + self.batch_size] for start in range(0, len(names), self.batch_size)]
+        build = self._build_sqlite_batch if self.dialect == "sqlite" else self._build_mysql_batch
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(batches)))) as pool:
+            for batch_tables in pool.map(lambda batch: build(schema, batch), batches):
+                for table in batch_tables:
+                    database.add_table(table)
+        self.skipped.sort()
+        return database
+
+    def _finish(self, table: HssSqlTable, primary_key: list) -> HssSqlTable:
+        """
+        Attach the primary key to a table and intern its columns.
+
+        Args:
+            table (HssSqlTable): The table.
+            primary_key (list): The primary key columns, in key order.
+
+        Returns:
+            HssSqlTable: The table.
+
+        """
+        if len(primary_key) == 1:
+            for column in table.columns:
+                if column.name == primary_key[0]:
+                    column.constraints.append("PRIMARY KEY")
+        elif primary_key:
+            table.add_constraint(f"PRIMARY KEY ({', '.join(primary_key)})")
+        if self.registry is not None:
+            table.columns = [self.registry.intern(column) for column in table.columns]
+        return table
+
+    def _build_sqlite_batch(self, schema, names: list) -> list:
+        """
+        Build the tables of a batch from the SQLite catalog.
+
+        Args:
+            schema: Unused; SQLite has a single schema.
+            names (list): The table names of the batch.
+
+        Returns:
+            list: The HssSqlTable objects, in table name order.
+
+        """
+        indexes = {table: list(rows) for table, rows in
+                   groupby(self._bulk(self._SQLITE_INDEXES, schema, names), key=itemgetter(0))}
+        tables = []
+        for table_name, rows in groupby(self._bulk(self._SQLITE_COLUMNS, schema, names), key=itemgetter(0)):
+            table = HssSqlTable(table_name)
+            primary_key = {}
+            for _, name, data_type, not_null, default, pk in rows:
+                constraints = ["NOT NULL"] if not_null else []
+                if default is not None:
+                    constraints.append(f"DEFAULT {default}")
+                if pk:
+                    primary_key[pk] = name
+                table.add_column(HssSqlColumn(name, (data_type or "BLOB").upper(), constraints))
+            for index_name, parts in groupby(indexes.get(table_name, []), key=itemgetter(1)):
+                parts = list(parts)
+                columns = [part[3] for part in parts]
+                if None in columns:
+                    self.skipped.append((table_name, index_name, "expression index"))
+                    continue
+                if parts[0][4] == "u":
+                    table.add_constraint(f"UNIQUE ({', '.join(columns)})")
+                else:
+                    self._add_index(table, index_name, columns, bool(parts[0][2]))
+            tables.append(self._finish(table, [primary_key[position] for position in sorted(primary_key)]))
+        return tables
+
+    def _build_mysql_batch(self, schema: str, names: list) -> list:
+        """
+        Build the tables of a batch from the MySQL information_schema.
+
+        Args:
+            schema (str): The schema.
+            names (list): The table names of the batch.
+
+        Returns:
+            list: The HssSqlTable objects, in table name order.
+
+        """
+        indexes = {table: list(rows) for table, rows in
+                   groupby(self._bulk(self._MYSQL_INDEXES, schema, names), key=itemgetter(0))}
+        tables = []
+        for table_name, rows in groupby(self._bulk(self._MYSQL_COLUMNS, schema, names), key=itemgetter(0)):
+            table = HssSqlTable(table_name)
+            for _, name, column_type, nullable, default, extra, expression in rows:
+                table.add_column(self._mysql_column(name, column_type, nullable, default, extra or "", expression))
+            primary_key = []
+            for index_name, parts in groupby(indexes.get(table_name, []), key=itemgetter(1)):
+                parts = list(parts)
+                if index_name == "PRIMARY":
+                    primary_key = [part[3] for part in parts]
+                    continue
+                index_type = (parts[0][6] or "").upper()
+                if index_type in ("FULLTEXT", "SPATIAL"):
+                    table.add_constraint(f"{index_type} INDEX {index_name} ({', '.join(part[3] for part in parts)})")
+                    continue
+                keys = [part[5] or part[3] + (f"({part[4]})" if part[4] else "") for part in parts]
+                self._add_index(table, index_name, keys, not parts[0][2])
+            tables.append(self._finish(table, primary_key))
+        return tables
+
+    @staticmethod
+    def _mysql_column(name: str, column_type: str, nullable: str, default, extra: str, expression) -> HssSqlColumn:
+        """
+        Build a column from an information_schema.COLUMNS row.
+
+        Args:
+            name (str): COLUMN_NAME.
+            column_type (str): COLUMN_TYPE, e.g. ``varchar(255)`` or ``int unsigned``.
+            nullable (str): IS_NULLABLE, ``YES`` or ``NO``.
+            default: COLUMN_DEFAULT.
+            extra (str): EXTRA, e.g. ``auto_increment``, ``STORED GENERATED`` or
+                ``DEFAULT_GENERATED on update CURRENT_TIMESTAMP``.
+            expression: GENERATION_EXPRESSION.
+
+        Returns:
+            HssSqlColumn: The column.
+
+        """
+        column_type = column_type.strip()
+        if "(" in column_type:
+            head, rest = column_type.split("(", 1)
+            parameter, _, modifiers = rest.rpartition(")")
+            data_type = f"{head.strip().upper()}({parameter})"
+        else:
+            head, _, modifiers = column_type.partition(" ")
+            data_type = head.upper()
+        if modifiers.strip():
+            data_type += " " + " ".join(modifiers.upper().split())
+        constraints = []
+        if nullable == "NO":
+            constraints.append("NOT NULL")
+        upper_extra = extra.upper()
+        if "AUTO_INCREMENT" in upper_extra:
+            constraints.append("AUTO_INCREMENT")
+        if default is not None and "GENERATED" not in upper_extra.replace("DEFAULT_GENERATED", ""):
+            constraints.append(f"DEFAULT {HssSqlIntrospector._mysql_default(default, upper_extra, data_type)}")
+        on_update = re.search(r"\bON\s+UPDATE\s+(CURRENT_TIMESTAMP(?:\s*\(\s*\d*\s*\))?)", upper_extra)
+        if on_update:
+            constraints.append("ON UPDATE " + re.sub(r"\s+", "", on_update.group(1)))
+        column = HssSqlColumn(name, data_type, constraints)
+        if expression and "GENERATED" in upper_extra.replace("DEFAULT_GENERATED", ""):
+            column.set_generated(expression, "STORED" if "STORED" in upper_extra else "VIRTUAL")
+        return column
+
+    @staticmethod
+    def _mysql_default(default, extra: str, data_type: str) -> str:
+        """
+        Render a COLUMN_DEFAULT value as a DEFAULT argument.
+
+        Whether the value is quoted follows the type family of the column, not the
+        look of the value, so a VARCHAR default such as ``nan`` or ``1_000`` stays a string.
+
+        Args:
+            default: The COLUMN_DEFAULT value.
+            extra (str): The upper-cased EXTRA value.
+            data_type (str): The data type of the column.
+
+        Returns:
+            str: The literal or expression.
+
+        """
+        text = str(default)
+        if "DEFAULT_GENERATED" in extra:
+            return text if text.upper().startswith("CURRENT_TIMESTAMP") else f"({text})"
+        entry = HssSqlColumn.TYPE_REGISTRY.resolve(data_type)[0]
+        family = entry.family if entry is not None else None
+        if family in HssSqlIntrospector.UNQUOTED_DEFAULT_FAMILIES:
+            return text
+        if family == "datetime" and text.upper().startswith("CURRENT_TIMESTAMP"):
+            return text
+        return "'" + text.replace("'", "''") + "'"
+
+    @staticmethod
+    def _add_index(table: HssSqlTable, name: str, parts: list, unique: bool) -> None:
+        """
+        Add an imported index, keeping it as a table constraint if the model rejects it.
+
+        Args:
+            table (HssSqlTable): The table.
+            name (str): The index name.
+            parts (list): The column names or expressions.
+            unique (bool): Whether the index is unique.
+
+        Returns:
+            None
+
+        """
+        try:
+            table.add_index(name, parts, unique)
+        except ValueError:
+            rendered = ", ".join(part if table.is_column_part(part) else f"({part})" for part in parts)
+            table.add_constraint(f"{'UNIQUE ' if unique else ''}INDEX {name} ({rendered})")
@@ -0,0 +1,417 @@
+import json
+import os
+import re
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+class HssSqlLoader:
+    """
+    A class to load schema specifications into HssSqlDatabase and HssSqlTable models.
+
+    Specifications can be JSON or YAML documents in the to_dict format of the models,
+    or SQL DDL made of CREATE DATABASE, USE and CREATE TABLE statements.
+
+    Class Attributes:
+        FORMATS (tuple): The supported specification formats.
+        EXTENSIONS (dict): File extension to format mapping.
+        TABLE_CONSTRAINT_KEYWORDS (tuple): Keywords starting a table-level constraint.
+        COLUMN_CONSTRAINT_KEYWORDS (tuple): Keywords starting a column constraint.
+
+    Methods:
+        detect_format(text: str, path: str = None) -> str: Guess the format of a specification.
+        load_file(path: str, fmt: str = None, registry=None) -> list: Load the models of a file.
+        load_text(text: str, fmt: str = None, registry=None) -> list: Load the models of a specification.
+        from_data(data, registry=None) -> list: Build models from parsed JSON/YAML data.
+        parse_ddl(text: str) -> list: Build models from DDL statements.
+
+    """
+
+    FORMATS = ("json", "yaml", "ddl")
+
+    EXTENSIONS = {".json": "json", ".yaml": "yaml", ".yml": "yaml", ".sql": "ddl", ".ddl": "ddl"}
+
+    TABLE_CONSTRAINT_KEYWORDS = ("PRIMARY KEY", "UNIQUE", "KEY", "INDEX", "CONSTRAINT", "FOREIGN KEY", "CHECK",
+                                 "FULLTEXT", "SPATIAL")
+
+    COLUMN_CONSTRAINT_KEYWORDS = ("PRIMARY KEY", "UNIQUE", "NOT NULL", "NULL", "DEFAULT", "CHECK", "ON UPDATE",
+                                  "CHARACTER SET", "CHARSET", "COLLATE", "COMMENT")
+
+    _ARGUMENT_KEYWORDS = ("DEFAULT", "CHECK", "ON UPDATE", "CHARACTER SET", "CHARSET", "COLLATE", "COMMENT")
+
+    _CREATE_DATABASE = re.compile(
+        r"^CREATE\s+(?:DATABASE|SCHEMA)\s+(?:IF\s+NOT\s+EXISTS\s+)?[`\"]?(\w+)[`\"]?(.*)$", re.IGNORECASE | re.DOTALL)
+    _CREATE_TABLE = re.compile(
+        r"^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?[`\"]?(\w+)[`\"]?\s*\((.*)\)[^)]*$", re.IGNORECASE | re.DOTALL)
+    _USE = re.compile(r"^USE\s+[`\"]?(\w+)[`\"]?$", re.IGNORECASE)
+    _CHARSET = re.compile(r"(?:DEFAULT\s+)?(?:CHARACTER\s+SET|CHARSET)\s*=?\s*(\w+)", re.IGNORECASE)
+    _COLLATE = re.compile(r"(?:DEFAULT\s+)?COLLATE\s*=?\s*(\w+)", re.IGNORECASE)
+    _INDEX = re.compile(r"^(UNIQUE\s+)?(?:INDEX|KEY)\s+[`\"]?(\w+)[`\"]?\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+    _GENERATED = re.compile(r"(?:GENERATED\s+ALWAYS\s+)?\bAS\s*\(", re.IGNORECASE)
+    _COLUMN = re.compile(r"^[`\"]?(\w+)[`\"]?\s+(\w+(?:\s*\([^)]*\))?(?:\s+(?:UNSIGNED|SIGNED|ZEROFILL)\b)*)\s*(.*)$", re.IGNORECASE | re.DOTALL)
+
+    @classmethod
+    def detect_format(cls, text: str, path: str = None) -> str:
+        """
+        Guess the format of a specification from its file extension or content.
+
+        Args:
+            text (str): The specification text.
+            path (str, optional): The file the text was read from.
+
+        Returns:
+            str: One of FORMATS.
+
+        """
+        if path:
+            fmt = cls.EXTENSIONS.get(os.path.splitext(path)[1].lower())
+            if fmt:
+                return fmt
+        stripped = text.lstrip()
+        if stripped.startswith(("{", "[")):
+            return "json"
+        if re.match(r"^(CREATE|USE|DROP|ALTER|--|/\*)", stripped, re.IGNORECASE):
+            return "ddl"
+        return "yaml"
+
+    @classmethod
+    def load_file(cls, path: str, fmt: str = None, registry=None) -> list:
+        """
+        Load the models of a specification file.
+
+        Args:
+            path (str): The file path.
+            fmt (str, optional): The format; detected when omitted.
+            registry (HssSqlColumnRegistry, optional): Registry sharing identical columns.
+
+        Returns:
+            list: The HssSqlDatabase and HssSqlTable models of the file.
+
+        """
+        with open(path, "r", encoding="utf-8") as spec_file:
+            text = spec_file.read()
+        return cls.load_text(text, fmt or cls.detect_format(text, path), registry)
+
+    @classmethod
+    def load_text(cls, text: str, fmt: str = None, registry=None) -> list:
+        """
+        Load the models of a specification.
+
+        Args:
+            text (str): The specification text.
+            fmt (str, optional): The format; detected when omitted.
+            registry (HssSqlColumnRegistry, optional): Registry sharing identical columns.
+
+        Returns:
+            list: The HssSqlDatabase and HssSqlTable models of the specification.
+
+        Raises:
+            ValueError: If the format is not supported or the specification is invalid.
+            ImportError: If a YAML specification is given and PyYAML is not installed.
+        """
+        fmt = fmt or cls.detect_format(text)
+        if fmt == "json":
+            return cls.from_data(json.loads(text), registry)
+        if fmt == "yaml":
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("Loading YAML specifications requires PyYAML (pip install pyyaml)")
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML specification: {e}")
+            return cls.from_data(data, registry)
+        if fmt == "ddl":
+            return cls.parse_ddl(text)
+        raise ValueError(f"Invalid specification format: {fmt}")
+
+    @classmethod
+    def from_data(cls, data, registry=None) -> list:
+        """
+        Build models from parsed JSON or YAML data.
+
+        A mapping with ``database_name`` is a database, a mapping with ``columns`` is a
+        table, and a mapping with ``databases`` or ``tables`` (or a list) is a collection.
+
+        Args:
+            data (dict | list): The parsed specification.
+            registry (HssSqlColumnRegistry, optional): Registry sharing identical columns.
+
+        Returns:
+            list: The models.
+
+        Raises:
+            ValueError: If the data does not describe databases or tables.
+        """
+        if isinstance(data, list):
+            return [model for item in data for model in cls.from_data(item, registry)]
+        if isinstance(data, dict):
+            if "database_name" in data:
+                return [HssSqlDatabase.from_dict(data, registry)]
+            if "columns" in data and "name" in data:
+                return [HssSqlTable.from_dict(data, registry)]
+            if "databases" in data:
+                return cls.from_data(data["databases"], registry)
+            if "tables" in data:
+                return cls.from_data(data["tables"], registry)
+        raise ValueError("Specification must describe databases or tables")
+
+    @classmethod
+    def parse_ddl(cls, text: str) -> list:
+        """
+        Build models from DDL statements.
+
+        CREATE TABLE statements following a CREATE DATABASE or USE statement are added
+        to that database; others are returned as standalone tables.
+
+        Args:
+            text (str): The DDL text.
+
+        Returns:
+            list: The HssSqlDatabase and HssSqlTable models.
+
+        Raises:
+            ValueError: If a CREATE TABLE statement cannot be parsed.
+        """
+        models = []
+        databases = {}
+        current = None
+        for statement in cls._split(cls._strip_comments(text), ";"):
+            statement = statement.strip()
+            if not statement:
+                continue
+            match = cls._CREATE_DATABASE.match(statement)
+            if match:
+                current = HssSqlDatabase(match.group(1))
+                charset = cls._CHARSET.search(match.group(2))
+                collation = cls._COLLATE.search(match.group(2))
+                if charset:
+                    current.set_charset(charset.group(1))
+                if collation:
+                    current.set_collation(collation.group(1))
+                databases[current.database_name] = current
+                models.append(current)
+                continue
+            match = cls._USE.match(statement)
+            if match:
+                current = databases.get(match.group(1))
+                if current is None:
+                    current = HssSqlDatabase(match.group(1))
+                    databases[current.database_name] = current
+                    models.append(current)
+                continue
+            if re.match(r"^CREATE\s+TABLE", statement, re.IGNORECASE):
+                table = cls._parse_table(statement)
+                if current is not None:
+                    current.add_table(table)
+                else:
+                    models.append(table)
+        return models
+
+    @classmethod
+    def _parse_table(cls, statement: str) -> HssSqlTable:
+        """
+        Parse a CREATE TABLE statement.
+
+        Args:
+            statement (str): The statement, without its trailing semicolon.
+
+        Returns:
+            HssSqlTable: The table.
+
+        Raises:
+            ValueError: If the statement cannot be parsed.
+        """
+        match = cls._CREATE_TABLE.match(statement)
+        if not match:
+            raise ValueError(f"Invalid CREATE TABLE statement: {statement[:60]}")
+        table = HssSqlTable(match.group(1))
+        indexes = []
+        for item in cls._split(match.group(2), ","):
+            item = " ".join(item.split())
+            if not item:
+                continue
+            index_match = cls._INDEX.match(item)
+            if index_match:
+                indexes.append(index_match.groups())
+                continue
+            if re.match(rf"(?:{'|'.join(cls.TABLE_CONSTRAINT_KEYWORDS)})\b", item, re.IGNORECASE):
+                table.add_constraint(item)
+                continue
+            column_match = cls._COLUMN.match(item)
+            if not column_match:
+                raise ValueError(f"Invalid column definition in {table.name}: {item}")
+            name, data_type, rest = column_match.groups()
+            data_type = re.sub(r"\s*\(\s*", "(", data_type)
+            expression, storage, rest = cls._split_generated(rest)
+            table.add_column(HssSqlColumn(name, data_type, cls._split_constraints(rest), expression, storage))
+        for unique, name, parts in indexes:
+            table.add_index(name, [cls._unwrap(part) for part in cls._split(parts, ",")], bool(unique))
+        return table
+
+    @classmethod
+    def _split_generated(cls, text: str) -> tuple:
+        """
+        Extract the ``[GENERATED ALWAYS] AS (expression) [VIRTUAL|STORED]`` clause of a column definition.
+
+        Args:
+            text (str): The text following the data type.
+
+        Returns:
+            tuple: The expression (or None), the storage (or None) and the remaining text.
+
+        """
+        match = cls._GENERATED.search(text)
+        if not match:
+            return None, None, text
+        start = match.end() - 1
+        closing = start + len(cls._split(text[start:], " ")[0])
+        expression = text[start + 1:closing - 1].strip()
+        rest = text[closing:].strip()
+        storage = "VIRTUAL"
+        for keyword in ("VIRTUAL", "STORED", "PERSISTENT"):
+            if rest.upper().startswith(keyword):
+                storage = "STORED" if keyword == "PERSISTENT" else keyword
+                rest = rest[len(keyword):].strip()
+                break
+        return expression, storage, (text[:match.start()] + " " + rest).strip()
+
+    @staticmethod
+    def _unwrap(part: str) -> str:
+        """
+        Remove the parentheses enclosing a functional index key part.
+
+        Args:
+            part (str): The key part, e.g. ``(LOWER(email))``.
+
+        Returns:
+            str: The bare column name or expression.
+
+        """
+        part = part.strip()
+        while part.startswith("(") and part.endswith(")") and HssSqlColumn.is_valid_expression(part[1:-1]):
+            part = part[1:-1].strip()
+        return part
+
+    @classmethod
+    def _split_constraints(cls, text: str) -> list:
+        """
+        Split the tail of a column definition into constraints.
+
+        Args:
+            text (str): The text following the data type.
+
+        Returns:
+            list: The constraints, e.g. ``["NOT NULL", "DEFAULT 0"]``.
+
+        """
+        constraints = []
+        rest = text.strip()
+        while rest:
+            upper = rest.upper()
+            keyword = next((k for k in cls.COLUMN_CONSTRAINT_KEYWORDS if upper.startswith(k)
+                            and (len(rest) == len(k) or not rest[len(k)].isalnum())), None)
+            if keyword is None:
+                parts = cls._split(rest, " ")
+                constraints.append(parts[0])
+                rest = rest[len(parts[0]):].strip()
+                continue
+            rest = rest[len(keyword):].strip()
+            if keyword in cls._ARGUMENT_KEYWORDS and rest:
+                argument = cls._split(rest, " ")[0]
+                constraints.append(f"{keyword} {argument}")
+                rest = rest[len(argument):].strip()
+            else:
+                constraints.append(keyword)
+        return constraints
+
+    @staticmethod
+    def _strip_comments(text: str) -> str:
+        """
+        Remove SQL line and block comments outside of quoted strings and identifiers.
+
+        As in MySQL, ``#`` starts a line comment, ``--`` only when followed by
+        whitespace, and ``/* ... */`` is a block comment. Quoted text such as
+        ``DEFAULT '#fff'`` or ``'a--b'`` is kept as is.
+
+        Args:
+            text (str): The DDL text.
+
+        Returns:
+            str: The text without comments.
+
+        Raises:
+            ValueError: If a quoted string, quoted identifier or block comment is not terminated.
+        """
+        parts = []
+        quote = None
+        start = 0
+        index = 0
+        length = len(text)
+        while index < length:
+            char = text[index]
+            if quote:
+                if char == "\\" and quote != "`":
+                    index += 1
+                elif char == quote:
+                    quote = None
+            elif char in "'\"`":
+                quote = char
+            elif char == "#" or (text.startswith("--", index) and (index + 2 == length or text[index + 2].isspace())):
+                end = text.find("\n", index)
+                parts.append(text[start:index] + " ")
+                start = index = length if end < 0 else end
+                continue
+            elif text.startswith("/*", index):
+                end = text.find("*/", index + 2)
+                if end < 0:
+                    raise ValueError("Unterminated block comment in DDL")
+                parts.append(text[start:index] + " ")
+                start = index = end + 2
+                continue
+            index += 1
+        if quote:
+            raise ValueError(f"Unterminated {quote} quote in DDL")
+        parts.append(text[start:])
+        return "".join(parts)
+
+    @staticmethod
+    def _split(text: str, separator: str) -> list:
+        """
+        Split text on a separator outside of quotes and parentheses.
+
+        Args:
+            text (str): The text to split.
+            separator (str): The one-character separator.
+
+        Returns:
+            list: The parts.
+
+        """
+        parts = []
+        depth = 0
+        quote = None
+        escaped = False
+        start = 0
+        for index, char in enumerate(text):
+            if escaped:
+                escaped = False
+            elif quote:
+                if char == "\\" and quote != "`":
+                    escaped = True
+                elif char == quote:
+                    quote = None
+            elif char in "'\"`":
+                quote = char
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char == separator and depth == 0:
+                parts.append(text[start:index])
+                start = index + 1
+        parts.append(text[start:])
+        return [part for part in parts if part.strip()] if separator == " " else parts
@@ -0,0 +1,947 @@
+import datetime
+import decimal
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import weakref
+from collections.abc import Mapping
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+
+
+class HssSqlRowCodec:
+    """
+    A fixed-width binary row layout derived from the columns of an HssSqlTable.
+
+    Every row is packed into a record of record_size bytes: a null bitmap followed by
+    one fixed-width slot per column. Variable-length values (VARCHAR, TEXT, BLOB,
+    DECIMAL, JSON, ...) store an (offset, length) pair in their slot and their bytes
+    in a separate heap. Types are classified by their family in the type registry;
+    spatial values are stored as bytes.
+
+    Attributes:
+        table_name (str): The name of the table the codec was generated from.
+        fields (list): (name, kind, struct format) of every column, in table order.
+        offsets (dict): Byte offset of every column slot inside a record.
+        sizes (dict): Byte size of every column slot.
+        null_bytes (int): Size of the null bitmap at the start of a record.
+        record_size (int): Size of a packed record.
+
+    Class Attributes:
+        FIXED_FORMATS (dict): struct format of the fixed-width data types.
+        UNSIGNED_FORMATS (dict): struct format replacing a signed integer format for UNSIGNED columns.
+        BINARY_FAMILIES (set): Type registry families holding bytes rather than text.
+        CHAR_WIDTH (int): Bytes reserved per character of CHAR(n) columns.
+
+    Methods:
+        from_table(table) -> 'HssSqlRowCodec': Generate the codec of a table.
+        encode(row, heap: bytearray) -> bytes: Pack a row, appending variable data to heap.
+        pack_into(buffer, offset: int, row, heap: bytearray) -> None: Pack a row into a buffer.
+        decode(record, heap) -> tuple: Unpack a record.
+        field_view(record, heap, name: str) -> memoryview: Zero-copy view of one field.
+        field_value(record, heap, name: str): Decode one field.
+
+    """
+
+    FIXED_FORMATS = {
+        "BIT": "Q", "TINYINT": "b", "BOOL": "?", "BOOLEAN": "?", "SMALLINT": "h",
+        "MEDIUMINT": "i", "INT": "i", "INTEGER": "i", "BIGINT": "q",
+        "FLOAT": "f", "DOUBLE": "d",
+        "DATE": "i", "DATETIME": "q", "TIMESTAMP": "q", "TIME": "q", "YEAR": "H",
+        "ENUM": "H", "SET": "Q",
+    }
+
+    UNSIGNED_FORMATS = {"b": "B", "h": "H", "i": "I", "q": "Q"}
+
+    BINARY_FAMILIES = {"binary", "blob", "spatial"}
+
+    CHAR_WIDTH = 4
+
+    _HEAP_REFERENCE = "QI"
+    _HEAP_KINDS = ("text", "bytes", "decimal")
+    _EPOCH = datetime.datetime(1970, 1, 1)
+
+    def __init__(self, table_name: str, columns):
+        """
+        Initialize a codec for a list of columns.
+
+        Args:
+            table_name (str): The name of the table.
+            columns (list): The HssSqlColumn objects of the table.
+
+        """
+        self.table_name = table_name
+        self.fields = []
+        self.offsets = {}
+        self.sizes = {}
+        self._members = {}
+        self._lengths = {}
+        self.null_bytes = (len(columns) + 7) // 8
+
+        layout = "<"
+        offset = self.null_bytes
+        for column in columns:
+            base_type, parameter = HssSqlColumn.split_data_type(column.data_type)
+            kind, field_format = self._field_format(base_type, parameter)
+            if kind == "number" and HssSqlColumn.TYPE_REGISTRY.is_unsigned(column.data_type):
+                field_format = self.UNSIGNED_FORMATS.get(field_format, field_format)
+            if kind in ("enum", "set"):
+                self._members[column.name] = HssSqlColumn.parse_members(parameter)
+            if kind in ("char", "binary"):
+                self._lengths[column.name] = int(parameter) if parameter and parameter.isdigit() else 1
+            size = struct.calcsize("<" + field_format)
+            self.fields.append((column.name, kind, field_format))
+            self.offsets[column.name] = offset
+            self.sizes[column.name] = size
+            layout += field_format
+            offset += size
+
+        self.record_size = offset
+        self._kinds = {name: kind for name, kind, _ in self.fields}
+        self._names = [name for name, _, _ in self.fields]
+        self._struct = struct.Struct(layout)
+        self._field_structs = {name: struct.Struct("<" + field_format) for name, _, field_format in self.fields}
+
+    @classmethod
+    def from_table(cls, table) -> 'HssSqlRowCodec':
+        """
+        Generate the codec of a table.
+
+        Args:
+            table (HssSqlTable): The table whose columns define the layout.
+
+        Returns:
+            HssSqlRowCodec: The codec.
+
+        """
+        return cls(table.name, table.columns)
+
+    def _field_format(self, base_type: str, parameter) -> tuple:
+        """
+        Map a data type to its kind and struct format.
+
+        Args:
+            base_type (str): The upper-cased base data type.
+            parameter (str): The data type parameter, or None.
+
+        Returns:
+            tuple: The field kind and its struct format.
+
+        """
+        if base_type in ("CHAR", "BINARY"):
+            length = int(parameter) if parameter and parameter.isdigit() else 1
+            width = length * self.CHAR_WIDTH if base_type == "CHAR" else length
+            return ("binary" if base_type == "BINARY" else "char"), f"{width}s"
+        if base_type in self.FIXED_FORMATS:
+            kind = {
+                "DATE": "date", "DATETIME": "datetime", "TIMESTAMP": "datetime",
+                "TIME": "time", "ENUM": "enum", "SET": "set",
+            }.get(base_type, "number")
+            return kind, self.FIXED_FORMATS[base_type]
+        entry = HssSqlColumn.TYPE_REGISTRY.get(base_type)
+        family = entry.family if entry is not None else None
+        if family in self.BINARY_FAMILIES:
+            return "bytes", self._HEAP_REFERENCE
+        if family == "decimal":
+            return "decimal", self._HEAP_REFERENCE
+        return "text", self._HEAP_REFERENCE
+
+    def _to_slot(self, name: str, kind: str, value, heap: bytearray) -> list:
+        """
+        Convert a value to the struct values of its slot.
+
+        Args:
+            name (str): The column name.
+            kind (str): The field kind.
+            value: The Python value.
+            heap (bytearray): The heap receiving variable-length data.
+
+        Returns:
+            list: The values to pack for the slot.
+
+        Raises:
+            ValueError: If a CHAR or BINARY value is longer than its column.
+        """
+        if kind == "number":
+            return [value]
+        if kind in self._HEAP_KINDS:
+            data = value if isinstance(value, (bytes, bytearray, memoryview)) else str(value).encode("utf-8")
+            offset = len(heap)
+            heap += data
+            return [offset, len(data)]
+        if kind == "char" or kind == "binary":
+            is_bytes = isinstance(value, (bytes, bytearray))
+            data = value if is_bytes else str(value).encode("utf-8")
+            if kind == "char" and not is_bytes:
+                size, limit, unit = len(str(value)), self._lengths[name], "characters"
+            else:
+                size, limit, unit = len(data), self.sizes[name], "bytes"
+            if size > limit:
+                raise ValueError(f"Value too long for {self.table_name}.{name}, at most {limit} {unit}: {value!r}")
+            return [data]
+        if kind == "date":
+            return [value.toordinal()]
+        if kind == "datetime":
+            delta = value - self._EPOCH
+            return [(delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds]
+        if kind == "time":
+            if isinstance(value, datetime.time):
+                value = datetime.timedelta(hours=value.hour, minutes=value.minute,
+                                           seconds=value.second, microseconds=value.microsecond)
+            return [(value.days * 86400 + value.seconds) * 1000000 + value.microseconds]
+        if kind == "enum":
+            return [self._members[name].index(value) + 1 if value != "" else 0]
+        members = self._members[name]
+        selected = value.split(",") if isinstance(value, str) else value
+        return [sum(1 << members.index(member) for member in selected if member)]
+
+    def _from_slot(self, name: str, kind: str, values: list, heap):
+        """
+        Convert the struct values of a slot back to a Python value.
+
+        Args:
+            name (str): The column name.
+            kind (str): The field kind.
+            values (list): The unpacked slot values.
+            heap: The heap holding variable-length data.
+
+        Returns:
+            The Python value.
+
+        """
+        if kind == "number":
+            return values[0]
+        if kind == "text":
+            offset, length = values
+            return bytes(heap[offset:offset + length]).decode("utf-8")
+        if kind == "bytes":
+            offset, length = values
+            return bytes(heap[offset:offset + length])
+        if kind == "decimal":
+            offset, length = values
+            return decimal.Decimal(bytes(heap[offset:offset + length]).decode("ascii"))
+        if kind == "char":
+            return values[0].rstrip(b"\x00").decode("utf-8")
+        if kind == "binary":
+            return values[0]
+        if kind == "date":
+            return datetime.date.fromordinal(values[0])
+        if kind == "datetime":
+            return self._EPOCH + datetime.timedelta(microseconds=values[0])
+        if kind == "time":
+            return datetime.timedelta(microseconds=values[0])
+        if kind == "enum":
+            return self._members[name][values[0] - 1] if values[0] else ""
+        members = self._members[name]
+        return ",".join(member for bit, member in enumerate(members) if values[0] >> bit & 1)
+
+    def _pack_values(self, row, heap: bytearray) -> tuple:
+        """
+        Build the null bitmap and the struct values of a row.
+
+        Args:
+            row (Sequence | Mapping): The row, in column order or keyed by column name.
+            heap (bytearray): The heap receiving variable-length data.
+
+        Returns:
+            tuple: The null bitmap and the list of values to pack.
+
+        """
+        if isinstance(row, Mapping):
+            row = [row.get(name) for name in self._names]
+        if len(row) != len(self.fields):
+            raise ValueError(f"Expected {len(self.fields)} values for {self.table_name}, got {len(row)}")
+        nulls = bytearray(self.null_bytes)
+        values = []
+        for index, ((name, kind, field_format), value) in enumerate(zip(self.fields, row)):
+            if value is None:
+                nulls[index >> 3] |= 1 << (index & 7)
+                values.extend(self._field_structs[name].unpack(bytes(self.sizes[name])))
+            else:
+                values.extend(self._to_slot(name, kind, value, heap))
+        return nulls, values
+
+    def encode(self, row, heap: bytearray) -> bytes:
+        """
+        Pack a row into a new record, appending variable-length data to heap.
+
+        Args:
+            row (Sequence | Mapping): The row, in column order or keyed by column name.
+            heap (bytearray): The heap receiving variable-length data.
+
+        Returns:
+            bytes: The packed record.
+
+        """
+        record = bytearray(self.record_size)
+        self.pack_into(record, 0, row, heap)
+        return bytes(record)
+
+    def pack_into(self, buffer, offset: int, row, heap: bytearray) -> None:
+        """
+        Pack a row into a writable buffer at the given offset.
+
+        Args:
+            buffer: A writable buffer of at least offset + record_size bytes.
+            offset (int): The byte offset of the record in the buffer.
+            row (Sequence | Mapping): The row, in column order or keyed by column name.
+            heap (bytearray): The heap receiving variable-length data.
+
+        Returns:
+            None
+
+        """
+        nulls, values = self._pack_values(row, heap)
+        buffer[offset:offset + self.null_bytes] = nulls
+        self._struct.pack_into(buffer, offset + self.null_bytes, *values)
+
+    def _is_null(self, record, index: int) -> bool:
+        """
+        Check the null bit of a field.
+
+        Args:
+            record: The packed record.
+            index (int): The column position.
+
+        Returns:
+            bool: True if the field is NULL.
+
+        """
+        return bool(record[index >> 3] >> (index & 7) & 1)
+
+    def decode(self, record, heap) -> tuple:
+        """
+        Unpack a record.
+
+        Args:
+            record: The packed record (bytes or memoryview).
+            heap: The heap holding variable-length data.
+
+        Returns:
+            tuple: The row values in column order.
+
+        """
+        values = self._struct.unpack_from(record, self.null_bytes)
+        row = []
+        position = 0
+        for index, (name, kind, field_format) in enumerate(self.fields):
+            width = 2 if kind in self._HEAP_KINDS else 1
+            if self._is_null(record, index):
+                row.append(None)
+            else:
+                row.append(self._from_slot(name, kind, values[position:position + width], heap))
+            position += width
+        return tuple(row)
+
+    def field_view(self, record, heap, name: str) -> memoryview:
+        """
+        Return a zero-copy view of the raw bytes of one field.
+
+        Fixed-width fields are viewed inside the record; variable-length fields are
+        viewed inside the heap.
+
+        Args:
+            record: The packed record.
+            heap: The heap holding variable-length data.
+            name (str): The column name.
+
+        Returns:
+            memoryview: The field bytes, or None if the field is NULL.
+
+        """
+        if self._is_null(record, self._names.index(name)):
+            return None
+        start = self.offsets[name]
+        view = memoryview(record)[start:start + self.sizes[name]]
+        if self._kinds[name] in self._HEAP_KINDS:
+            offset, length = self._field_structs[name].unpack(view)
+            return memoryview(heap)[offset:offset + length]
+        return view
+
+    def field_value(self, record, heap, name: str):
+        """
+        Decode one field of a record.
+
+        Args:
+            record: The packed record.
+            heap: The heap holding variable-length data.
+            name (str): The column name.
+
+        Returns:
+            The Python value, or None if the field is NULL.
+
+        """
+        if self._is_null(record, self._names.index(name)):
+            return None
+        values = self._field_structs[name].unpack_from(record, self.offsets[name])
+        return self._from_slot(name, self._kinds[name], list(values), heap)
+
+
+class HssSqlRowStore:
+    """
+    A growable, contiguous store of rows packed with an HssSqlRowCodec.
+
+    Records live in one buffer and variable-length data in one heap, so staging
+    millions of rows costs record_size bytes per row plus the string payloads.
+    A store can be saved to disk and re-opened memory-mapped; datasets larger
+    than RAM are written straight to disk with HssSqlRowWriter.
+
+    Attributes:
+        codec (HssSqlRowCodec): The codec defining the record layout.
+        records: The buffer holding the packed records.
+        heap: The buffer holding variable-length data.
+
+    Class Attributes:
+        MAGIC (bytes): The file signature.
+        HEADER (struct.Struct): The file header layout.
+
+    Methods:
+        append(row) -> None: Pack and append a row.
+        extend(rows) -> None: Pack and append many rows.
+        record(index: int) -> memoryview: Zero-copy view of a packed record.
+        field(index: int, name: str) -> memoryview: Zero-copy view of one field.
+        get(index: int, name: str): Decode one field.
+        save(path: str) -> None: Write the store to a file.
+        open(path: str, codec) -> 'HssSqlRowStore': Memory-map a saved store.
+        close() -> None: Release a memory-mapped file and the views handed out on it.
+
+    """
+
+    MAGIC = b"HSRC"
+    HEADER = struct.Struct("<4sHIQQ")
+    VERSION = 1
+
+    def __init__(self, codec: HssSqlRowCodec):
+        """
+        Initialize an empty, in-memory store.
+
+        Args:
+            codec (HssSqlRowCodec): The codec defining the record layout.
+
+        """
+        self.codec = codec
+        self.records = bytearray()
+        self.heap = bytearray()
+        self._count = 0
+        self._mmap = None
+        self._views = weakref.WeakSet()
+
+    def __enter__(self) -> 'HssSqlRowStore':
+        """
+        Enter a with block.
+
+        Returns:
+            HssSqlRowStore: The store itself.
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Close the store when leaving a with block.
+
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows in the store.
+
+        Returns:
+            int: The number of rows.
+
+        """
+        return self._count
+
+    def __getitem__(self, index: int) -> tuple:
+        """
+        Decode a row.
+
+        Args:
+            index (int): The row position.
+
+        Returns:
+            tuple: The row values.
+
+        """
+        return self.codec.decode(self.record(index), self.heap)
+
+    def __iter__(self):
+        """
+        Iterate over the decoded rows.
+
+        Yields:
+            tuple: The row values.
+        """
+        for index in range(self._count):
+            yield self[index]
+
+    def append(self, row) -> None:
+        """
+        Pack and append a row.
+
+        Args:
+            row (Sequence | Mapping): The row values.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the store is a read-only memory-mapped file.
+            ValueError: If the row does not fit the codec. Whatever the error, the
+                store is left unchanged.
+        """
+        if self._mmap is not None:
+            raise TypeError("Memory-mapped row stores are read-only")
+        offset = len(self.records)
+        heap_size = len(self.heap)
+        self.records.extend(bytes(self.codec.record_size))
+        try:
+            self.codec.pack_into(self.records, offset, row, self.heap)
+        except BaseException:
+            del self.records[offset:]
+            if len(self.heap) > heap_size:
+                del self.heap[heap_size:]
+            raise
+        self._count += 1
+
+    def extend(self, rows) -> None:
+        """
+        Pack and append many rows.
+
+        Args:
+            rows (Iterable): The rows to append.
+
+        Returns:
+            None
+
+        """
+        for row in rows:
+            self.append(row)
+
+    def record(self, index: int) -> memoryview:
+        """
+        Return a zero-copy view of a packed record.
+
+        Args:
+            index (int): The row position.
+
+        Returns:
+            memoryview: The record bytes. On a memory-mapped store it is released by close().
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(f"Row index out of range: {index}")
+        start = index * self.codec.record_size
+        return self._track(memoryview(self.records)[start:start + self.codec.record_size])
+
+    def _track(self, view):
+        """
+        Remember a view handed out on a memory-mapped store, so close() can release it.
+
+        Args:
+            view (memoryview): The view, or None.
+
+        Returns:
+            memoryview: The same view.
+
+        """
+        if self._mmap is not None and view is not None:
+            self._views.add(view)
+        return view
+
+    def field(self, index: int, name: str) -> memoryview:
+        """
+        Return a zero-copy view of one field of a row.
+
+        Args:
+            index (int): The row position.
+            name (str): The column name.
+
+        Returns:
+            memoryview: The field bytes, or None if the field is NULL. On a memory-mapped
+            store it is released by close().
+
+        """
+        return self._track(self.codec.field_view(self.record(index), self.heap, name))
+
+    def get(self, index: int, name: str):
+        """
+        Decode one field of a row.
+
+        Args:
+            index (int): The row position.
+            name (str): The column name.
+
+        Returns:
+            The Python value, or None if the field is NULL.
+
+        """
+        return self.codec.field_value(self.record(index), self.heap, name)
+
+    def save(self, path: str) -> None:
+        """
+        Write the store to a file that open() can memory-map.
+
+        The store is built in memory first; use HssSqlRowWriter to stream rows
+        that do not fit in RAM straight to the file.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            None
+
+        """
+        with open(path, "wb") as store_file:
+            store_file.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.codec.record_size,
+                                              self._count, len(self.heap)))
+            store_file.write(self.records)
+            store_file.write(self.heap)
+
+    @classmethod
+    def open(cls, path: str, codec: HssSqlRowCodec) -> 'HssSqlRowStore':
+        """
+        Memory-map a store saved with save().
+
+        Records and heap are views over the mapped file, so only the pages that are
+        accessed are read from disk.
+
+        Args:
+            path (str): The file path.
+            codec (HssSqlRowCodec): The codec the store was written with.
+
+        Returns:
+            HssSqlRowStore: A read-only store backed by the file.
+
+        Raises:
+            ValueError: If the file is not a row store or its layout does not match the codec.
+        """
+        with open(path, "rb") as store_file:
+            mapped = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count, heap_size = cls.HEADER.unpack_from(mapped, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            mapped.close()
+            raise ValueError(f"Not a row store file: {path}")
+        if record_size != codec.record_size:
+            mapped.close()
+            raise ValueError(f"Record size {record_size} does not match codec record size {codec.record_size}")
+
+        instance = cls(codec)
+        instance._count = count
+        instance._heap_size = heap_size
+        instance._mmap = mapped
+        instance._map_views()
+        return instance
+
+    def _map_views(self) -> None:
+        """
+        Create the record and heap views over the memory-mapped file.
+
+        Returns:
+            None
+
+        """
+        self._view = memoryview(self._mmap)
+        heap_start = self.HEADER.size + self._count * self.codec.record_size
+        self.records = self._view[self.HEADER.size:heap_start]
+        self.heap = self._view[heap_start:heap_start + self._heap_size]
+
+    def close(self) -> None:
+        """
+        Release a memory-mapped file.
+
+        Record and field views returned by record() and field() are released too;
+        using them afterwards raises ValueError. Views sliced from them by the
+        caller must be released by the caller first.
+
+        Returns:
+            None
+
+        Raises:
+            BufferError: If a view derived from the store is still alive; the store stays open.
+        """
+        if self._mmap is None:
+            return
+        for view in list(self._views):
+            view.release()
+        self._views = weakref.WeakSet()
+        self.records.release()
+        self.heap.release()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError as e:
+            self._map_views()
+            raise BufferError(f"Row store views are still in use; release them before closing: {e}")
+        self._mmap = None
+
+
+class HssSqlRowWriter:
+    """
+    A streaming writer producing a row store file larger than RAM.
+
+    Packed records are appended to the store file as they fill a batch, and
+    variable-length data is spooled to a temporary file in the same directory;
+    close() appends the heap and writes the header. Memory use is bounded by the
+    batch size, whatever the number of rows. The file is read back with
+    HssSqlRowStore.open().
+
+    Attributes:
+        codec (HssSqlRowCodec): The codec defining the record layout.
+        path (str): The store file being written.
+        batch_bytes (int): Bytes of records or heap buffered before they are written out.
+
+    Class Attributes:
+        DEFAULT_BATCH_BYTES (int): The default batch size.
+
+    Methods:
+        append(row) -> None: Pack and append a row.
+        extend(rows) -> None: Pack and append many rows.
+        close() -> None: Write the heap and the header and close the file.
+        abort() -> None: Close and delete the partial file.
+
+    """
+
+    DEFAULT_BATCH_BYTES = 1 << 20
+
+    def __init__(self, path: str, codec: HssSqlRowCodec, batch_bytes: int = DEFAULT_BATCH_BYTES):
+        """
+        Create the store file and the heap spool.
+
+        Args:
+            path (str): The store file to write.
+            codec (HssSqlRowCodec): The codec defining the record layout.
+            batch_bytes (int, optional): Bytes buffered before a write.
+
+        Raises:
+            OSError: If an error occurs while creating the files.
+        """
+        self.codec = codec
+        self.path = path
+        self.batch_bytes = batch_bytes
+        self._count = 0
+        self._records = bytearray()
+        try:
+            self._file = open(path, "wb")
+            self._file.write(bytes(HssSqlRowStore.HEADER.size))
+            spool = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
+        except OSError as e:
+            raise OSError(f"Error creating row store file: {e}")
+        self._heap = _HssSqlHeapSpool(spool, batch_bytes)
+
+    def __enter__(self) -> 'HssSqlRowWriter':
+        """
+        Enter a with block.
+
+        Returns:
+            HssSqlRowWriter: The writer itself.
+
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Finish the file when leaving a with block, or delete it if the block raised.
+
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __len__(self) -> int:
+        """
+        Return the number of rows written so far.
+
+        Returns:
+            int: The number of rows.
+
+        """
+        return self._count
+
+    def append(self, row) -> None:
+        """
+        Pack and append a row.
+
+        Args:
+            row (Sequence | Mapping): The row values.
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If the writer is closed, or the row does not fit the codec.
+            OSError: If an error occurs while writing.
+        """
+        if self._file is None:
+            raise ValueError(f"Row store writer for {self.path} is closed")
+        offset = len(self._records)
+        heap_size = len(self._heap)
+        self._records.extend(bytes(self.codec.record_size))
+        try:
+            self.codec.pack_into(self._records, offset, row, self._heap)
+        except BaseException:
+            del self._records[offset:]
+            self._heap.truncate(heap_size)
+            raise
+        self._count += 1
+        if len(self._records) >= self.batch_bytes:
+            self._flush()
+
+    def extend(self, rows) -> None:
+        """
+        Pack and append many rows.
+
+        Args:
+            rows (Iterable): The rows to append.
+
+        Returns:
+            None
+
+        """
+        for row in rows:
+            self.append(row)
+
+    def _flush(self) -> None:
+        """
+        Write the buffered records to the store file.
+
+        Raises:
+            OSError: If an error occurs while writing.
+        """
+        try:
+            self._file.write(self._records)
+        except OSError as e:
+            raise OSError(f"Error writing row store file: {e}")
+        self._records = bytearray()
+
+    def close(self) -> None:
+        """
+        Write the remaining records, the heap and the header, and close the file.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If an error occurs while writing.
+        """
+        if self._file is None:
+            return
+        try:
+            self._flush()
+            heap_size = len(self._heap)
+            self._heap.flush()
+            self._heap.file.seek(0)
+            shutil.copyfileobj(self._heap.file, self._file)
+            self._file.seek(0)
+            self._file.write(HssSqlRowStore.HEADER.pack(HssSqlRowStore.MAGIC, HssSqlRowStore.VERSION,
+                                                        self.codec.record_size, self._count, heap_size))
+        except OSError as e:
+            raise OSError(f"Error writing row store file: {e}")
+        finally:
+            self._heap.file.close()
+            self._file.close()
+            self._file = None
+
+    def abort(self) -> None:
+        """
+        Close and delete the partial file.
+
+        Returns:
+            None
+
+        """
+        if self._file is not None:
+            self._heap.file.close()
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class _HssSqlHeapSpool:
+    """
+    An append-only heap spooled to a file, used by HssSqlRowWriter in place of a bytearray.
+
+    HssSqlRowCodec only needs ``len(heap)`` for the next offset and ``heap += data``;
+    HssSqlRowWriter truncates it when a row fails to pack.
+
+    """
+
+    def __init__(self, spool_file, batch_bytes: int):
+        """
+        Initialize an empty spool.
+
+        Args:
+            spool_file: The binary file receiving the heap bytes.
+            batch_bytes (int): Bytes buffered before a write.
+
+        """
+        self.file = spool_file
+        self.batch_bytes = batch_bytes
+        self._buffer = bytearray()
+        self._written = 0
+
+    def __len__(self) -> int:
+        """
+        Return the size of the heap.
+
+        Returns:
+            int: The bytes written and buffered.
+
+        """
+        return self._written + len(self._buffer)
+
+    def __iadd__(self, data) -> '_HssSqlHeapSpool':
+        """
+        Append bytes to the heap.
+
+        Args:
+            data: The bytes to append.
+
+        Returns:
+            _HssSqlHeapSpool: The spool itself.
+
+        """
+        self._buffer += data
+        if len(self._buffer) >= self.batch_bytes:
+            self.flush()
+        return self
+
+    def truncate(self, size: int) -> None:
+        """
+        Drop the heap bytes past size, undoing the appends of a row that failed to pack.
+
+        Args:
+            size (int): The heap size to return to.
+
+        Returns:
+            None
+
+        """
+        if size >= self._written:
+            del self._buffer[size - self._written:]
+            return
+        self.file.seek(size)
+        self.file.truncate()
+        self._written = size
+        self._buffer = bytearray()
+
+    def flush(self) -> None:
+        """
+        Write the buffered bytes to the spool file.
+
+        Returns:
+            None
+
+        """
+        self.file.write(self._buffer)
+        self._written += len(self._buffer)
+        self._buffer = bytearray()
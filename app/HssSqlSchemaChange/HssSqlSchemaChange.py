@@ -0,0 +1,331 @@
+import math
+import re
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+
+
+class HssSqlSchemaChange:
+    """
+    A planner for online (non-blocking) MySQL schema changes of large tables.
+
+    Instead of an ALTER TABLE that locks the table, the plan creates a shadow table
+    with the new definition, keeps it in sync with triggers, backfills it in chunks
+    of primary key ranges, and swaps it in with an atomic RENAME TABLE. Integer keys
+    are chunked by fixed key ranges; other keys (e.g. CHAR(36) UUIDs) are chunked by
+    keyset, ``chunk_size`` rows at a time in key order.
+
+    Attributes:
+        old_table: The current HssSqlTable definition.
+        new_table: The target HssSqlTable definition.
+        chunk_size (int): Primary key range (integer keys) or rows (other keys) copied per chunk.
+        throttle (float): Seconds to sleep between two backfill chunks.
+        shadow_name (str): Name of the shadow table.
+        retired_name (str): Name given to the old table at cutover.
+        primary_key (str): The primary key column used to chunk the backfill.
+        key_type (str): The data type of the primary key column.
+        integer_key (bool): Whether the primary key is an integer, chunked by key range.
+        columns (list): The columns copied from the old to the new table; generated
+            columns of the new table are computed by the server and never copied.
+
+    Methods:
+        estimate_chunks(row_count: int = None, min_key: int = None, max_key: int = None) -> int: Estimate the number of chunks.
+        create_shadow_table() -> str: Render the CREATE TABLE of the shadow table.
+        create_triggers() -> str: Render the triggers keeping the shadow table in sync.
+        backfill_statements(min_key: int, max_key: int) -> generator: Yield the chunked backfill statements of an integer key.
+        backfill_procedure() -> str: Render a procedure backfilling an unknown key range.
+        cutover() -> str: Render the atomic swap and the trigger cleanup.
+        plan(row_count: int = None, min_key: int = None, max_key: int = None) -> str: Render the full migration script.
+
+    """
+
+    def __init__(self, old_table, new_table, chunk_size: int = 10000, throttle: float = 0.0,
+                 shadow_suffix: str = "_new", retired_suffix: str = "_old"):
+        """
+        Initialize the planner.
+
+        Args:
+            old_table (HssSqlTable): The current table definition.
+            new_table (HssSqlTable): The target table definition; must keep the table name.
+            chunk_size (int, optional): Primary key range (integer keys) or rows (other keys)
+                copied per chunk.
+            throttle (float, optional): Seconds to sleep between two backfill chunks.
+            shadow_suffix (str, optional): Suffix of the shadow table name.
+            retired_suffix (str, optional): Suffix given to the old table at cutover.
+
+        Raises:
+            ValueError: If the chunk size is invalid, or the tables do not share a
+                single-column primary key that is one of their columns.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        if throttle < 0:
+            raise ValueError(f"Invalid throttle: {throttle}")
+        self.old_table = old_table
+        self.new_table = new_table
+        self.chunk_size = chunk_size
+        self.throttle = throttle
+        self.shadow_name = f"{old_table.name}{shadow_suffix}"
+        self.retired_name = f"{old_table.name}{retired_suffix}"
+
+        self.primary_key = self.find_primary_key(old_table)
+        if self.find_primary_key(new_table) != self.primary_key:
+            raise ValueError(f"Tables {old_table.name} and {new_table.name} must share the primary key {self.primary_key}")
+        key_column = next((column for column in old_table.columns if column.name == self.primary_key), None)
+        if key_column is None:
+            raise ValueError(f"Primary key {self.primary_key} is not a column of table {old_table.name}")
+        self.key_type = key_column.data_type
+        entry = HssSqlColumn.TYPE_REGISTRY.resolve(self.key_type)[0]
+        self.integer_key = entry is not None and entry.family == "integer"
+        new_columns = {column.name for column in new_table.columns
+                       if getattr(column, "generated_expression", None) is None}
+        self.columns = [column.name for column in old_table.columns if column.name in new_columns]
+
+    @staticmethod
+    def find_primary_key(table) -> str:
+        """
+        Return the single-column primary key of a table.
+
+        Args:
+            table (HssSqlTable): The table.
+
+        Returns:
+            str: The primary key column name.
+
+        Raises:
+            ValueError: If the table has no primary key or a composite one.
+        """
+        keys = [column.name for column in table.columns
+                if any(constraint.upper().startswith("PRIMARY KEY") for constraint in column.constraints)]
+        for constraint in table.constraints:
+            match = re.match(r"^(?:CONSTRAINT\s+\w+\s+)?PRIMARY\s+KEY\s*\(([^)]*)\)", constraint, re.IGNORECASE)
+            if match:
+                keys += [key.strip().strip("`\"") for key in match.group(1).split(",")]
+        if len(keys) != 1:
+            raise ValueError(f"Table {table.name} needs a single-column primary key for an online schema change")
+        return keys[0]
+
+    def estimate_chunks(self, row_count: int = None, min_key: int = None, max_key: int = None) -> int:
+        """
+        Estimate the number of backfill chunks.
+
+        With a key range the estimate is exact, since integer keys are chunked by fixed
+        key ranges even when the keys are sparse; otherwise keys are assumed to be dense.
+        Keyset-chunked (non-integer) keys only support the row count estimate.
+
+        Args:
+            row_count (int, optional): The number of rows in the table.
+            min_key (int, optional): The smallest primary key value.
+            max_key (int, optional): The largest primary key value.
+
+        Returns:
+            int: The number of chunks.
+
+        Raises:
+            ValueError: If neither a row count nor a key range is given, or a key range
+                is given for a non-integer key.
+        """
+        if min_key is not None and max_key is not None:
+            self._require_integer_key()
+            return max(0, math.ceil((max_key - min_key + 1) / self.chunk_size))
+        if row_count is not None:
+            return math.ceil(row_count / self.chunk_size)
+        raise ValueError("A row count or a primary key range is required to estimate chunks")
+
+    def create_shadow_table(self) -> str:
+        """
+        Render the CREATE TABLE of the shadow table from the new definition.
+
+        Returns:
+            str: The statement.
+
+        """
+        shadow = self.new_table.snapshot()
+        shadow.set_table_name(self.shadow_name)
+        return shadow.generate_create_table()
+
+    def _trigger_name(self, event: str) -> str:
+        """
+        Return the name of a sync trigger.
+
+        Args:
+            event (str): The trigger event, e.g. ``insert``.
+
+        Returns:
+            str: The trigger name.
+
+        """
+        return f"{self.old_table.name}_osc_{event}"
+
+    def create_triggers(self) -> str:
+        """
+        Render the triggers keeping the shadow table in sync during the backfill.
+
+        Returns:
+            str: The trigger statements, using a custom delimiter.
+
+        """
+        table = self.old_table.name
+        columns = ", ".join(self.columns)
+        new_values = ", ".join(f"NEW.{column}" for column in self.columns)
+        replace = f"REPLACE INTO {self.shadow_name} ({columns}) VALUES ({new_values});"
+        delete = f"DELETE FROM {self.shadow_name} WHERE {self.primary_key} = OLD.{self.primary_key};"
+        return "\n".join([
+            "DELIMITER $$",
+            f"CREATE TRIGGER {self._trigger_name('insert')} AFTER INSERT ON {table} FOR EACH ROW",
+            f"BEGIN\n    {replace}\nEND$$",
+            f"CREATE TRIGGER {self._trigger_name('update')} AFTER UPDATE ON {table} FOR EACH ROW",
+            f"BEGIN\n    {delete}\n    {replace}\nEND$$",
+            f"CREATE TRIGGER {self._trigger_name('delete')} AFTER DELETE ON {table} FOR EACH ROW",
+            f"BEGIN\n    {delete}\nEND$$",
+            "DELIMITER ;",
+        ])
+
+    def _require_integer_key(self) -> None:
+        """
+        Check that the primary key can be chunked by key range.
+
+        Raises:
+            ValueError: If the primary key is not an integer.
+        """
+        if not self.integer_key:
+            raise ValueError(f"Primary key {self.old_table.name}.{self.primary_key} is {self.key_type}, "
+                             "not an integer; key ranges cannot be chunked, omit min_key and max_key "
+                             "to backfill by keyset")
+
+    def _chunk_statement(self, low: str, high: str, inclusive: bool = False) -> str:
+        """
+        Render the statement copying one primary key range.
+
+        Args:
+            low (str): The inclusive lower bound expression.
+            high (str): The upper bound expression.
+            inclusive (bool, optional): Whether the upper bound is inclusive.
+
+        Returns:
+            str: The INSERT ... SELECT statement.
+
+        """
+        columns = ", ".join(self.columns)
+        return (f"INSERT IGNORE INTO {self.shadow_name} ({columns}) "
+                f"SELECT {columns} FROM {self.old_table.name} "
+                f"WHERE {self.primary_key} >= {low} AND {self.primary_key} {'<=' if inclusive else '<'} {high};")
+
+    def backfill_statements(self, min_key: int, max_key: int):
+        """
+        Yield the chunked backfill statements for a known integer primary key range.
+
+        Args:
+            min_key (int): The smallest primary key value.
+            max_key (int): The largest primary key value.
+
+        Yields:
+            str: One INSERT ... SELECT per chunk, each followed by a throttle sleep.
+
+        Raises:
+            ValueError: If the primary key is not an integer.
+        """
+        self._require_integer_key()
+        for low in range(min_key, max_key + 1, self.chunk_size):
+            yield self._chunk_statement(str(low), str(min(low + self.chunk_size, max_key + 1)))
+            if self.throttle:
+                yield f"DO SLEEP({self.throttle});"
+
+    def backfill_procedure(self) -> str:
+        """
+        Render a procedure backfilling the table when its key range is not known up front.
+
+        Integer keys are copied by fixed key ranges. Other keys are copied by keyset:
+        each chunk takes the next ``chunk_size`` keys in key order, so the procedure
+        works for any ordered key type, e.g. CHAR(36) UUIDs.
+
+        Returns:
+            str: The procedure definition, its call and its removal.
+
+        """
+        procedure = f"{self.old_table.name}_osc_backfill"
+        pk = self.primary_key
+        table = self.old_table.name
+        lines = [
+            "DELIMITER $$",
+            f"CREATE PROCEDURE {procedure}()",
+            "BEGIN",
+        ]
+        if self.integer_key:
+            counter = "DECIMAL(20)" if "UNSIGNED" in self.key_type.upper() else "BIGINT"
+            lines += [
+                f"    DECLARE low_key {counter};",
+                f"    DECLARE max_key {counter};",
+                f"    SELECT MIN({pk}), MAX({pk}) INTO low_key, max_key FROM {table};",
+                "    WHILE low_key <= max_key DO",
+                f"        {self._chunk_statement('low_key', f'low_key + {self.chunk_size}')}",
+                f"        SET low_key = low_key + {self.chunk_size};",
+            ]
+        else:
+            lines += [
+                f"    DECLARE low_key {self.key_type};",
+                f"    DECLARE high_key {self.key_type};",
+                f"    SELECT MIN({pk}) INTO low_key FROM {table};",
+                "    WHILE low_key IS NOT NULL DO",
+                f"        SELECT MAX({pk}) INTO high_key FROM (SELECT {pk} FROM {table} "
+                f"WHERE {pk} >= low_key ORDER BY {pk} LIMIT {self.chunk_size}) AS chunk;",
+                f"        {self._chunk_statement('low_key', 'high_key', inclusive=True)}",
+                f"        SET low_key = (SELECT MIN({pk}) FROM {table} WHERE {pk} > high_key);",
+            ]
+        if self.throttle:
+            lines.append(f"        DO SLEEP({self.throttle});")
+        lines += [
+            "    END WHILE;",
+            "END$$",
+            "DELIMITER ;",
+            f"CALL {procedure}();",
+            f"DROP PROCEDURE {procedure};",
+        ]
+        return "\n".join(lines)
+
+    def cutover(self) -> str:
+        """
+        Render the atomic swap of the tables and the removal of the sync triggers.
+
+        Returns:
+            str: The statements.
+
+        """
+        table = self.old_table.name
+        lines = [f"RENAME TABLE {table} TO {self.retired_name}, {self.shadow_name} TO {table};"]
+        lines += [f"DROP TRIGGER IF EXISTS {self._trigger_name(event)};" for event in ("insert", "update", "delete")]
+        lines.append(f"-- DROP TABLE {self.retired_name};")
+        return "\n".join(lines)
+
+    def plan(self, row_count: int = None, min_key: int = None, max_key: int = None) -> str:
+        """
+        Render the full online migration script.
+
+        Args:
+            row_count (int, optional): The number of rows, used for the chunk estimate.
+            min_key (int, optional): The smallest primary key value.
+            max_key (int, optional): The largest primary key value. With min_key, the
+                backfill is emitted as explicit chunk statements; otherwise as a procedure.
+
+        Returns:
+            str: The migration script.
+
+        Raises:
+            ValueError: If a key range is given for a non-integer primary key.
+        """
+        header = [f"-- Online schema change for {self.old_table.name}"]
+        if row_count is not None or (min_key is not None and max_key is not None):
+            chunks = self.estimate_chunks(row_count, min_key, max_key)
+            header.append(f"-- Estimated backfill: {chunks} chunk(s) of {self.chunk_size} key(s)"
+                          + (f", at least {chunks * self.throttle:.1f}s of throttling" if self.throttle else ""))
+        if min_key is not None and max_key is not None:
+            backfill = "\n".join(self.backfill_statements(min_key, max_key))
+        else:
+            backfill = self.backfill_procedure()
+        sections = [
+            "\n".join(header),
+            "-- 1. Shadow table\n" + self.create_shadow_table(),
+            "-- 2. Sync triggers\n" + self.create_triggers(),
+            "-- 3. Chunked backfill\n" + backfill,
+            "-- 4. Cutover\n" + self.cutover(),
+        ]
+        return "\n\n".join(sections) + "\n"
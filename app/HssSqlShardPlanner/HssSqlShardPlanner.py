@@ -0,0 +1,492 @@
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlGenerator.HssSqlGenerator import HssSqlGenerator
+
+
+class HssSqlHashRing:
+    """
+    A consistent hash ring mapping keys to shards.
+
+    Every shard owns ``virtual_nodes`` tokens on a 64-bit ring. A key hashes to
+    the first 8 bytes of the MD5 digest of its UTF-8 text, read big-endian, and
+    belongs to the shard of the first token at or after that hash, wrapping
+    around. Tokens depend only on the shard name, so adding a shard only moves
+    the keys falling in front of its new tokens, about 1/N of them.
+
+    Attributes:
+        virtual_nodes (int): Number of tokens per shard.
+        shards (list): The shard names, in insertion order.
+
+    Class Attributes:
+        SPACE (int): The size of the hash space.
+
+    Methods:
+        hash(key) -> int: Return the ring position of a key.
+        add_shard(shard: str) -> None: Add a shard and its tokens.
+        remove_shard(shard: str) -> None: Remove a shard and its tokens.
+        shard_for(key) -> str: Return the shard owning a key.
+        points() -> list: Return the ring tokens and their shards, in ring order.
+        moved_ranges(other: 'HssSqlHashRing') -> list: Return the hash ranges owned by another shard in another ring.
+        moved_fraction(other: 'HssSqlHashRing') -> float: Return the fraction of the hash space owned by another shard in another ring.
+
+    """
+
+    SPACE = 1 << 64
+
+    def __init__(self, shards=(), virtual_nodes: int = 128):
+        """
+        Initialize the HssSqlHashRing object.
+
+        Args:
+            shards (iterable, optional): The initial shard names.
+            virtual_nodes (int, optional): Number of tokens per shard.
+
+        Raises:
+            ValueError: If the number of virtual nodes is invalid.
+        """
+        if virtual_nodes < 1:
+            raise ValueError(f"Invalid number of virtual nodes: {virtual_nodes}")
+        self.virtual_nodes = virtual_nodes
+        self.shards = []
+        self._points = []
+        self._tokens = []
+        for shard in shards:
+            self.add_shard(shard)
+
+    @staticmethod
+    def hash(key) -> int:
+        """
+        Return the ring position of a key.
+
+        Args:
+            key: The key; it is hashed through its string form.
+
+        Returns:
+            int: The position, in [0, SPACE).
+
+        """
+        return int.from_bytes(hashlib.md5(str(key).encode("utf-8")).digest()[:8], "big")
+
+    def _rebuild(self) -> None:
+        """
+        Sort the tokens after shards were added or removed, for binary search by shard_for.
+        """
+        self._points.sort()
+        self._tokens = [token for token, _ in self._points]
+
+    def add_shard(self, shard: str) -> None:
+        """
+        Add a shard and its tokens.
+
+        Args:
+            shard (str): The shard name.
+
+        Raises:
+            ValueError: If the shard is already on the ring.
+        """
+        if shard in self.shards:
+            raise ValueError(f"Shard '{shard}' is already on the ring")
+        self.shards.append(shard)
+        self._points += [(self.hash(f"{shard}#{node}"), shard) for node in range(self.virtual_nodes)]
+        self._rebuild()
+
+    def remove_shard(self, shard: str) -> None:
+        """
+        Remove a shard and its tokens.
+
+        Args:
+            shard (str): The shard name.
+
+        Raises:
+            KeyError: If the shard is not on the ring.
+        """
+        if shard not in self.shards:
+            raise KeyError(f"Shard '{shard}' is not on the ring")
+        self.shards.remove(shard)
+        self._points = [point for point in self._points if point[1] != shard]
+        self._rebuild()
+
+    def _owner(self, position: int) -> str:
+        """
+        Return the shard of the first token at or after a ring position, wrapping around.
+
+        Args:
+            position (int): The ring position.
+
+        Returns:
+            str: The shard name.
+
+        """
+        index = bisect_left(self._tokens, position)
+        return self._points[index % len(self._points)][1]
+
+    def shard_for(self, key) -> str:
+        """
+        Return the shard owning a key.
+
+        Args:
+            key: The shard key value.
+
+        Returns:
+            str: The shard name.
+
+        Raises:
+            ValueError: If the ring has no shards.
+        """
+        if not self._points:
+            raise ValueError("The ring has no shards")
+        return self._owner(self.hash(key))
+
+    def points(self) -> list:
+        """
+        Return the ring tokens and their shards, in ring order.
+
+        Returns:
+            list: ``(token, shard)`` pairs.
+
+        """
+        return list(self._points)
+
+    def moved_ranges(self, other: 'HssSqlHashRing') -> list:
+        """
+        Return the hash ranges owned by another shard in another ring.
+
+        A range ``(start, end, source, target)`` covers the positions after
+        ``start`` up to and including ``end``; the last range may wrap around.
+
+        Args:
+            other (HssSqlHashRing): The ring after the change.
+
+        Returns:
+            list: The moved ranges.
+
+        Raises:
+            ValueError: If either ring has no shards.
+        """
+        if not self._points or not other._points:
+            raise ValueError("The ring has no shards")
+        boundaries = sorted(set(self._tokens) | set(other._tokens))
+        moved = []
+        for index, end in enumerate(boundaries):
+            source, target = self._owner(end), other._owner(end)
+            if source != target:
+                start = boundaries[index - 1]
+                if moved and moved[-1][1] == start and moved[-1][2:] == (source, target):
+                    start = moved.pop()[0]
+                moved.append((start, end, source, target))
+        return moved
+
+    def moved_fraction(self, other: 'HssSqlHashRing') -> float:
+        """
+        Return the fraction of the hash space owned by another shard in another ring.
+
+        Args:
+            other (HssSqlHashRing): The ring after the change.
+
+        Returns:
+            float: The fraction, between 0 and 1; it estimates the share of rows to move.
+
+        """
+        return sum((end - start) % self.SPACE for start, end, _, _ in self.moved_ranges(other)) / self.SPACE
+
+
+class HssSqlShardPlanner:
+    """
+    A planner splitting a HssSqlDatabase across N physical shards.
+
+    Every table with a shard key is sharded: its rows live on the shard owning
+    the key value on a consistent hash ring, so all tables keyed by the same
+    tenant id keep a tenant's rows together. Tables without a shard key are
+    global reference tables, replicated in full to every shard. Each shard gets
+    the whole schema as its own database; the routing manifest records the ring,
+    so routers in any language can map a key to its shard.
+
+    Attributes:
+        database (HssSqlDatabase): The logical database.
+        shard_count (int): The number of shards.
+        shard_keys (dict): The shard-key column of every sharded table.
+        reference_tables (list): The tables replicated to every shard.
+        name_template (str): Format of the shard database names, with ``database`` and ``index`` fields.
+        ring (HssSqlHashRing): The hash ring over the shard names.
+
+    Class Attributes:
+        DEFAULT_VIRTUAL_NODES (int): Tokens per shard on the ring.
+        DEFAULT_NAME_TEMPLATE (str): The default shard database name format.
+        MANIFEST_FILE (str): The file name of the routing manifest.
+
+    Methods:
+        shard_names(count: int = None) -> list: Return the shard database names.
+        shard_for(key) -> str: Return the shard owning a shard key value.
+        shard_database(shard: str) -> HssSqlDatabase: Return the database model of a shard.
+        generate_shard_script(shard: str) -> str: Generate the DDL script of a shard.
+        warnings() -> list: Return the schema problems sharding introduces.
+        manifest(keys=None) -> dict: Return the routing manifest.
+        rebalance(shard_count: int, keys=None) -> dict: Plan the data movement to another shard count.
+        write(session=None, keys=None) -> list: Write the shard scripts and the routing manifest under a session path.
+
+    """
+
+    DEFAULT_VIRTUAL_NODES = 128
+    DEFAULT_NAME_TEMPLATE = "{database}_shard_{index:02d}"
+    MANIFEST_FILE = "routing_manifest.json"
+
+    _UNIQUE = re.compile(r"(PRIMARY\s+KEY|UNIQUE)\b[^(]*\((.*)\)", re.IGNORECASE)
+
+    def __init__(self, database: HssSqlDatabase, shard_count: int, shard_keys: dict, reference_tables=None,
+                 virtual_nodes: int = DEFAULT_VIRTUAL_NODES, name_template: str = DEFAULT_NAME_TEMPLATE):
+        """
+        Initialize the HssSqlShardPlanner object.
+
+        Args:
+            database (HssSqlDatabase): The logical database.
+            shard_count (int): The number of shards.
+            shard_keys (dict): Table name to shard-key column name.
+            reference_tables (list, optional): The replicated tables. Defaults to every table without a shard key.
+            virtual_nodes (int, optional): Tokens per shard on the ring.
+            name_template (str, optional): Format of the shard database names.
+
+        Raises:
+            ValueError: If the shard count is invalid, a shard key is not a column,
+                a table is both sharded and replicated, or a table is neither.
+            KeyError: If a shard key or reference table names an unknown table.
+        """
+        if not isinstance(shard_count, int) or shard_count < 1:
+            raise ValueError(f"Invalid shard count: {shard_count}")
+        tables = {table.name: table for table in database.tables if hasattr(table, "columns")}
+        for table_name, column_name in shard_keys.items():
+            if table_name not in tables:
+                raise KeyError(f"Table '{table_name}' not found")
+            if column_name not in [column.name for column in tables[table_name].columns]:
+                raise ValueError(f"Shard key '{column_name}' is not a column of table '{table_name}'")
+        if reference_tables is None:
+            reference_tables = [name for name in tables if name not in shard_keys]
+        for table_name in reference_tables:
+            if table_name not in tables:
+                raise KeyError(f"Table '{table_name}' not found")
+            if table_name in shard_keys:
+                raise ValueError(f"Table '{table_name}' cannot be both sharded and replicated")
+        unplaced = [name for name in tables if name not in shard_keys and name not in reference_tables]
+        if unplaced:
+            raise ValueError(f"Tables without a shard key or reference mark: {', '.join(unplaced)}")
+        self.database = database
+        self.shard_count = shard_count
+        self.shard_keys = dict(shard_keys)
+        self.reference_tables = list(reference_tables)
+        self.name_template = name_template
+        self.ring = HssSqlHashRing(self.shard_names(), virtual_nodes)
+
+    def shard_names(self, count: int = None) -> list:
+        """
+        Return the shard database names.
+
+        Names depend only on the shard index, so growing the shard count keeps
+        the existing shards and their ring tokens.
+
+        Args:
+            count (int, optional): The shard count. Defaults to shard_count.
+
+        Returns:
+            list: The shard names.
+
+        """
+        count = self.shard_count if count is None else count
+        return [self.name_template.format(database=self.database.database_name, index=index) for index in range(count)]
+
+    def shard_for(self, key) -> str:
+        """
+        Return the shard owning a shard key value.
+
+        Args:
+            key: The shard key value, e.g. a tenant id.
+
+        Returns:
+            str: The shard name.
+
+        """
+        return self.ring.shard_for(key)
+
+    def shard_database(self, shard: str) -> HssSqlDatabase:
+        """
+        Return the database model of a shard.
+
+        Args:
+            shard (str): The shard name.
+
+        Returns:
+            HssSqlDatabase: A copy-on-write snapshot of the database, renamed to the shard.
+
+        Raises:
+            KeyError: If the shard is unknown.
+        """
+        if shard not in self.ring.shards:
+            raise KeyError(f"Shard '{shard}' not found")
+        shard_database = self.database.snapshot()
+        shard_database.set_database_name(shard)
+        return shard_database
+
+    def generate_shard_script(self, shard: str) -> str:
+        """
+        Generate the DDL script of a shard.
+
+        Args:
+            shard (str): The shard name.
+
+        Returns:
+            str: A header listing the sharded and replicated tables, then the schema script.
+
+        Raises:
+            KeyError: If the shard is unknown.
+        """
+        shard_database = self.shard_database(shard)
+        header = [f"-- Shard {self.ring.shards.index(shard) + 1} of {self.shard_count} "
+                  f"for database {self.database.database_name}"]
+        header += [f"-- Sharded table {table_name} by {column_name}" for table_name, column_name in self.shard_keys.items()]
+        header += [f"-- Reference table {table_name}, replicated to every shard" for table_name in self.reference_tables]
+        return "\n".join(header) + "\n\n" + shard_database.generate_schema_script()
+
+    def _unique_keys(self, table) -> list:
+        """
+        Return the primary and unique keys of a table, from column constraints, table
+        constraints and unique indexes.
+
+        Args:
+            table (HssSqlTable): The table.
+
+        Returns:
+            list: The column names of every key.
+
+        """
+        keys = [[column.name] for column in table.columns
+                if any(constraint.upper().startswith(("PRIMARY KEY", "UNIQUE")) for constraint in column.constraints)]
+        for constraint in table.constraints:
+            match = self._UNIQUE.match(constraint)
+            if match:
+                keys.append([table.part_column(part.strip()) for part in match.group(2).split(",")])
+        keys += [[table.part_column(part) for part in index["parts"]]
+                 for index in getattr(table, "indexes", []) if index.get("unique")]
+        return keys
+
+    def warnings(self) -> list:
+        """
+        Return the schema problems sharding introduces.
+
+        A unique key of a sharded table is only enforced within one shard unless
+        it contains the shard key, and AUTO_INCREMENT values collide across shards.
+
+        Returns:
+            list: The warning messages.
+
+        """
+        messages = []
+        for table in self.database.tables:
+            column_name = self.shard_keys.get(getattr(table, "name", None))
+            if column_name is None:
+                continue
+            for key in self._unique_keys(table):
+                if column_name not in key:
+                    messages.append(f"Table '{table.name}': unique key ({', '.join(key)}) does not contain "
+                                    f"shard key '{column_name}' and is only enforced per shard")
+            for column in table.columns:
+                if any(constraint.upper() == "AUTO_INCREMENT" for constraint in column.constraints):
+                    messages.append(f"Table '{table.name}': AUTO_INCREMENT column '{column.name}' "
+                                    f"generates colliding values across shards")
+        return messages
+
+    def manifest(self, keys=None) -> dict:
+        """
+        Return the routing manifest.
+
+        Args:
+            keys (iterable, optional): Known shard key values to resolve in the manifest.
+
+        Returns:
+            dict: The shards, the ring tokens, the placement of every table and, if given, the key to shard map.
+
+        """
+        manifest = {
+            "database": self.database.database_name,
+            "shards": list(self.ring.shards),
+            "hash": "md5-64",
+            "routing": "position = first 8 bytes of MD5(UTF-8 key), big-endian; "
+                       "shard = shard of the first ring token >= position, wrapping around",
+            "virtual_nodes": self.ring.virtual_nodes,
+            "ring": [[token, self.ring.shards.index(shard)] for token, shard in self.ring.points()],
+            "tables": {
+                **{table_name: {"shard_key": column_name} for table_name, column_name in self.shard_keys.items()},
+                **{table_name: {"replicated": True} for table_name in self.reference_tables},
+            },
+        }
+        if keys is not None:
+            manifest["keys"] = {str(key): self.shard_for(key) for key in keys}
+        return manifest
+
+    def rebalance(self, shard_count: int, keys=None) -> dict:
+        """
+        Plan the data movement to another shard count.
+
+        Args:
+            shard_count (int): The new shard count.
+            keys (iterable, optional): Known shard key values; the moving ones are listed.
+
+        Returns:
+            dict: The added and removed shards, the moved hash ranges and fraction and, if given, the moved keys.
+
+        Raises:
+            ValueError: If the shard count is invalid.
+        """
+        if not isinstance(shard_count, int) or shard_count < 1:
+            raise ValueError(f"Invalid shard count: {shard_count}")
+        names = self.shard_names(shard_count)
+        target = HssSqlHashRing(names, self.ring.virtual_nodes)
+        plan = {
+            "added": [name for name in names if name not in self.ring.shards],
+            "removed": [name for name in self.ring.shards if name not in names],
+            "ranges": self.ring.moved_ranges(target),
+            "moved_fraction": self.ring.moved_fraction(target),
+        }
+        if keys is not None:
+            plan["keys"] = {str(key): (self.ring.shard_for(key), target.shard_for(key)) for key in keys
+                            if self.ring.shard_for(key) != target.shard_for(key)}
+        return plan
+
+    def write(self, session=None, keys=None) -> list:
+        """
+        Write the shard scripts and the routing manifest to a ``<database>_shards``
+        directory under a session path.
+
+        Args:
+            session (HssSqlGenerator | str, optional): A generator, whose get_session_file_path()
+                is used, or a session path. Defaults to the session path of a new HssSqlGenerator.
+            keys (iterable, optional): Known shard key values to resolve in the manifest.
+
+        Returns:
+            list: The paths of the written files.
+
+        Raises:
+            OSError: If an error occurs while writing the files.
+        """
+        if session is None:
+            session = HssSqlGenerator()
+        if isinstance(session, HssSqlGenerator):
+            session = session.get_session_file_path()
+        output_dir = os.path.join(session, f"{self.database.database_name}_shards")
+        paths = []
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            for shard in self.ring.shards:
+                path = os.path.join(output_dir, f"{shard}.sql")
+                with open(path, "w", encoding="utf-8") as sql_file:
+                    sql_file.write(self.generate_shard_script(shard))
+                paths.append(path)
+            path = os.path.join(output_dir, self.MANIFEST_FILE)
+            with open(path, "w", encoding="utf-8") as manifest_file:
+                json.dump(self.manifest(keys), manifest_file, indent=2)
+            paths.append(path)
+        except OSError as e:
+            raise OSError(f"Error writing shard layout: {e}")
+        return paths
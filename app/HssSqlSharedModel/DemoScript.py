@@ -0,0 +1,43 @@
+"""
+Demo script for the HssSqlSharedModel class.
+
+Wrap a database in an HssSqlSharedModel, commit a write, roll back a failed write,
+and render the published version while a reader holds an older one.
+
+Run it from the repository root:
+
+    python -m app.HssSqlSharedModel.DemoScript
+
+Author: devinci-it
+"""
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlSharedModel.HssSqlSharedModel import HssSqlSharedModel
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+# Build a database and share it
+database = HssSqlDatabase("demo_db")
+users = HssSqlTable("users")
+users.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY"]))
+database.add_table(users)
+shared = HssSqlSharedModel(database)
+
+# A reader keeps the version published before the write
+with shared.read() as before:
+
+    # Commit a write through the copy-on-write accessors
+    with shared.write() as db:
+        db.edit_table("users").add_column(HssSqlColumn("email", "VARCHAR(255)"))
+
+    # A failed write is rolled back
+    try:
+        with shared.write() as db:
+            db.edit_table("users").add_column(HssSqlColumn("draft", "TEXT"))
+            raise RuntimeError("validation failed")
+    except RuntimeError as e:
+        print(f"Write rolled back: {e}")
+
+    print(f"Reader still sees {[column.name for column in before.tables[0].columns]}")
+
+print(f"Version {shared.version}:\n{shared.render()}")
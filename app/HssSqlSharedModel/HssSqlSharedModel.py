@@ -0,0 +1,129 @@
+import threading
+from contextlib import contextmanager
+
+
+class HssSqlSharedModel:
+    """
+    A thread-safe wrapper sharing one schema model between editing and rendering threads.
+
+    Writers are serialized by a lock and edit the live model. When a write ends,
+    an O(1) copy-on-write snapshot of the model is published as the new version.
+    Readers never take the lock: they render the latest published version, which
+    no writer modifies, so a render always sees one consistent version and never
+    waits for a writer, and writers never wait for renders.
+
+    Published versions stay immutable only if writers reach nested objects through
+    the copy-on-write accessors (HssSqlDatabase.edit_table, HssSqlTable.edit_column),
+    which detach a private copy before the first change.
+
+    Attributes:
+        version (int): Number of writes committed so far.
+
+    Methods:
+        write() -> contextmanager: Lock the live model for editing and publish it on exit.
+        apply(change, *args, **kwargs): Run a change function as a single write.
+        current() -> object: Return the latest published version.
+        read() -> contextmanager: Yield the latest published version.
+        render(method: str = None, *args, **kwargs): Render the latest published version.
+
+    """
+
+    def __init__(self, model):
+        """
+        Initialize the HssSqlSharedModel object.
+
+        Args:
+            model: The HssSqlDatabase or HssSqlTable to share. It must not be edited
+                directly once wrapped.
+
+        """
+        self._model = model
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.version = 0
+        self._published = model.snapshot()
+
+    @contextmanager
+    def write(self):
+        """
+        Lock the live model for editing and publish the new version on exit.
+
+        Writes are transactional: if the block raises, the model is rolled back to
+        the last published version and nothing is published. Nested writes on the
+        same thread join the outermost one.
+
+        Yields:
+            The live model.
+
+        """
+        with self._lock:
+            self._depth += 1
+            try:
+                yield self._model
+            except BaseException:
+                if self._depth == 1:
+                    self._model.restore(self._published)
+                raise
+            else:
+                if self._depth == 1:
+                    self._published = self._model.snapshot()
+                    self.version += 1
+            finally:
+                self._depth -= 1
+
+    def apply(self, change, *args, **kwargs):
+        """
+        Run a change function on the live model as a single write.
+
+        Args:
+            change (callable): Called with the model followed by args and kwargs.
+
+        Returns:
+            The value returned by the change function.
+
+        """
+        with self.write() as model:
+            return change(model, *args, **kwargs)
+
+    def current(self):
+        """
+        Return the latest published version without locking.
+
+        Returns:
+            A snapshot of the model; it must be treated as read-only.
+
+        """
+        return self._published
+
+    @contextmanager
+    def read(self):
+        """
+        Yield the latest published version, stable for the whole block.
+
+        Yields:
+            A snapshot of the model; it must be treated as read-only.
+
+        """
+        yield self._published
+
+    def render(self, method: str = None, *args, **kwargs):
+        """
+        Render the latest published version.
+
+        The render runs on a private O(1) clone, so generate_* methods that append
+        to ``script`` never touch state seen by other threads.
+
+        Args:
+            method (str, optional): The generate_* method to call. Defaults to
+                generate_schema_script for a database and generate_create_table for a table.
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            str: The rendered DDL.
+
+        """
+        clone = self._published.snapshot()
+        if method is None:
+            method = "generate_schema_script" if hasattr(clone, "generate_schema_script") else "generate_create_table"
+        return getattr(clone, method)(*args, **kwargs)
@@ -1,5 +1,11 @@
+import re
+
 from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
-class HssSqlTable:
+from app.HssSqlUtilities.HssSqlCopyOnWrite import HssSqlCopyOnWrite
+from app.HssSqlUtilities.HssSqlFingerprint import fingerprint
+
+
+class HssSqlTable(HssSqlCopyOnWrite):
     """
     A class representing a SQL table.
 
@@ -7,18 +13,40 @@ class HssSqlTable:
         name (str): The name of the table.
         columns (list): List of columns in the table.
         constraints (list): List of constraints on the table.
+        indexes (list): Secondary indexes, as dicts with ``name``, ``parts`` and ``unique``;
+            a part is a column name or an expression (functional key part).
+
+    Class Attributes:
+        DEFAULT_PREFIX_LENGTH (int): Key prefix length used when suggesting indexes on TEXT/BLOB values.
 
     Methods:
         set_table_name(name: str) -> None: Set the name of the table.
         add_column(column) -> None: Add a column to the table.
         remove_column(column_name: str) -> None: Remove a column from the table.
+        edit_column(column_name: str) -> HssSqlColumn: Return a column of the table that is safe to modify.
         add_constraint(constraint: str) -> None: Add a constraint to the table.
         remove_constraint(constraint: str) -> None: Remove a constraint from the table.
+        is_column_part(part: str) -> bool: Check if an index part is a column name rather than an expression.
+        part_column(part: str) -> str: Return the column name of a column index part.
+        add_index(name: str, parts: list, unique: bool = False) -> dict: Add a column or functional index.
+        remove_index(name: str) -> None: Remove an index from the table.
+        render_index(index: dict) -> str: Render an index definition for use in CREATE TABLE.
+        suggest_generated_index(expression: str, data_type: str, column_name: str = None, storage: str = "VIRTUAL", apply: bool = False) -> dict: Suggest a generated column and index for a hot predicate.
+        estimate_row_size() -> int: Estimate the maximum stored size of a row in bytes.
         generate_create_table() -> str: Generate SQL command for creating the table.
         to_dict() -> dict: Convert the table object to a dictionary.
-        from_dict(data: dict) -> 'HssSqlTable': Create a table object from a dictionary.
+        from_dict(data: dict, registry=None) -> 'HssSqlTable': Create a table object from a dictionary.
+        fingerprint() -> str: Compute the structural hash of the table.
+        snapshot() -> 'HssSqlTable': Return an O(1) copy-on-write clone of the table.
+        restore(snapshot: 'HssSqlTable') -> None: Roll the table back to a snapshot.
+        is_shared() -> bool: Check if the table is shared with a snapshot through its parent.
 
     """
+
+    COW_ATTRIBUTES = ("columns", "constraints", "indexes")
+
+    DEFAULT_PREFIX_LENGTH = 191
+
     def __init__(self, name):
         """
         Initialize a new instance of HssSqlTable.
@@ -30,6 +58,7 @@ class HssSqlTable:
         self.name = name
         self.columns = []
         self.constraints = []
+        self.indexes = []
 
     def set_table_name(self, name: str) -> None:
         """
@@ -41,7 +70,10 @@ class HssSqlTable:
         Returns:
             None
 
+        Raises:
+            TypeError: If the table is shared with a snapshot.
         """
+        self._cow_check()
         self.name = name
 
     def add_column(self, column) -> None:
@@ -54,8 +86,10 @@ class HssSqlTable:
         Returns:
             None
 
+        Raises:
+            TypeError: If the table is shared with a snapshot.
         """
-        self.columns.append(column)
+        self._cow_adopt("columns", column)
 
     def remove_column(self, column_name: str) -> None:
         """
@@ -67,8 +101,33 @@ class HssSqlTable:
         Returns:
             None
 
+        Raises:
+            TypeError: If the table is shared with a snapshot.
+        """
+        self._cow_assign("columns", [col for col in self.columns if col.name != column_name])
+
+    def edit_column(self, column_name: str) -> HssSqlColumn:
+        """
+        Return a column of the table that is safe to modify.
+
+        Shared column templates and columns shared with a snapshot are replaced in
+        this table by a private copy on the first edit (copy-on-write), leaving every
+        other table and snapshot that references them untouched.
+
+        Args:
+            column_name (str): The name of the column to edit.
+
+        Returns:
+            HssSqlColumn: The column owned by this table.
+
+        Raises:
+            KeyError: If the table has no column with that name.
+            TypeError: If the table is shared with a snapshot.
         """
-        self.columns = [col for col in self.columns if col.name != column_name]
+        for index, column in enumerate(self.columns):
+            if column.name == column_name:
+                return self._cow_child("columns", index)
+        raise KeyError(f"Column not found: {column_name}")
 
     def add_constraint(self, constraint: str) -> None:
         """
@@ -80,8 +139,10 @@ class HssSqlTable:
         Returns:
             None
 
+        Raises:
+            TypeError: If the table is shared with a snapshot.
         """
-        self.constraints.append(constraint)
+        self._cow_mutable("constraints").append(constraint)
 
     def remove_constraint(self, constraint: str) -> None:
         """
@@ -93,8 +154,186 @@ class HssSqlTable:
         Returns:
             None
 
+        Raises:
+            TypeError: If the table is shared with a snapshot.
+        """
+        self._cow_mutable("constraints").remove(constraint)
+
+    @staticmethod
+    def is_column_part(part: str) -> bool:
         """
-        self.constraints.remove(constraint)
+        Check if an index part is a plain column name rather than an expression.
+
+        Column parts may carry a key prefix length and a direction, e.g. ``bio(64) DESC``.
+
+        Args:
+            part (str): The index part.
+
+        Returns:
+            bool: True for a column name, False for a functional key part.
+
+        """
+        return re.fullmatch(r"[`\"]?\w+[`\"]?(?:\s*\(\d+\))?(?:\s+(?:ASC|DESC))?", part.strip(), re.IGNORECASE) is not None
+
+    @classmethod
+    def part_column(cls, part: str) -> str:
+        """
+        Return the column name of a column index part.
+
+        Args:
+            part (str): The index part.
+
+        Returns:
+            str: The column name, or None for a functional key part.
+
+        """
+        if not cls.is_column_part(part):
+            return None
+        return re.match(r"[`\"]?(\w+)", part.strip()).group(1)
+
+    def add_index(self, name: str, parts, unique: bool = False) -> dict:
+        """
+        Add a secondary index to the table.
+
+        Parts that are column names are indexed directly; any other part is an
+        expression and becomes a functional key part, rendered as ``((expression))``.
+
+        Args:
+            name (str): The index name.
+            parts (list | str): The column names or expressions, in key order.
+            unique (bool, optional): Create a UNIQUE index.
+
+        Returns:
+            dict: The index definition.
+
+        Raises:
+            ValueError: If the name is taken, a part is empty or malformed, a column
+                part does not name a column of the table, or the type registry reports
+                that the column type cannot be indexed as written.
+            TypeError: If the table is shared with a snapshot.
+        """
+        if isinstance(parts, str):
+            parts = [parts]
+        if not name or any(index["name"] == name for index in self.indexes):
+            raise ValueError(f"Invalid or duplicate index name: {name}")
+        if not parts:
+            raise ValueError(f"Index {name} needs at least one part")
+        columns = {column.name: column for column in self.columns}
+        cleaned = []
+        for part in parts:
+            if not HssSqlColumn.is_valid_expression(part):
+                raise ValueError(f"Invalid index part in {name}: {part}")
+            part = part.strip()
+            column_name = self.part_column(part)
+            if column_name is not None:
+                if column_name not in columns:
+                    raise ValueError(f"Column not found for index {name}: {part}")
+                indexable = HssSqlColumn.TYPE_REGISTRY.indexable(columns[column_name].data_type)
+                if indexable == "spatial":
+                    raise ValueError(f"Column {column_name} ({columns[column_name].data_type}) needs a SPATIAL INDEX, "
+                                     f"declare it as a table constraint")
+                if indexable is None:
+                    raise ValueError(f"Column {column_name} ({columns[column_name].data_type}) cannot be indexed "
+                                     f"directly; index an expression or a generated column instead")
+                if indexable == "prefix" and not re.search(r"\(\d+\)", part):
+                    raise ValueError(f"Column {column_name} ({columns[column_name].data_type}) needs a key prefix "
+                                     f"length in index {name}, e.g. {column_name}({self.DEFAULT_PREFIX_LENGTH})")
+            cleaned.append(part)
+        index = {"name": name, "parts": cleaned, "unique": bool(unique)}
+        self._cow_mutable("indexes").append(index)
+        return index
+
+    def remove_index(self, name: str) -> None:
+        """
+        Remove an index from the table.
+
+        Args:
+            name (str): The name of the index to remove.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the table is shared with a snapshot.
+        """
+        self._cow_assign("indexes", [index for index in self.indexes if index["name"] != name])
+
+    def render_index(self, index: dict) -> str:
+        """
+        Render an index definition for use in CREATE TABLE.
+
+        Args:
+            index (dict): The index definition.
+
+        Returns:
+            str: The definition, e.g. ``INDEX idx_email ((LOWER(email)))``.
+
+        """
+        parts = ", ".join(part if self.is_column_part(part) else f"({part})" for part in index["parts"])
+        return f"{'UNIQUE ' if index.get('unique') else ''}INDEX {index['name']} ({parts})"
+
+    def suggest_generated_index(self, expression: str, data_type: str, column_name: str = None,
+                                storage: str = "VIRTUAL", apply: bool = False) -> dict:
+        """
+        Suggest a generated column and an index for an expression used as a hot query predicate.
+
+        A predicate such as ``WHERE LOWER(email) = ?`` cannot use an index on ``email``
+        and scans the table. Materializing the expression as a generated column and
+        indexing it gives the optimizer an index path; MySQL also matches the original
+        expression against the generated column when the two are written identically.
+        An existing generated column or index for the same expression is reused.
+
+        Args:
+            expression (str): The predicate expression, e.g. ``LOWER(email)``.
+            data_type (str): The data type of the expression result, e.g. ``VARCHAR(255)``.
+            column_name (str, optional): Name of the generated column. Derived from the expression when omitted.
+            storage (str, optional): VIRTUAL (no row storage) or STORED.
+            apply (bool, optional): Add the suggested column and index to the table.
+
+        Returns:
+            dict: ``column`` (HssSqlColumn), ``index`` (dict), ``statements`` (list of
+            ALTER TABLE statements, empty when nothing is missing) and ``hint`` (str).
+
+        Raises:
+            ValueError: If the expression or the storage is invalid, or the data type cannot be indexed.
+        """
+        if not HssSqlColumn.is_valid_expression(expression):
+            raise ValueError(f"Invalid predicate expression: {expression}")
+        indexable = HssSqlColumn.TYPE_REGISTRY.indexable(data_type)
+        if indexable not in ("full", "prefix"):
+            raise ValueError(f"Data type {data_type} cannot back a B-tree index")
+        normalized = " ".join(expression.split())
+        column = next((col for col in self.columns if col.generated_expression is not None
+                       and " ".join(col.generated_expression.split()) == normalized), None)
+        statements = []
+        if column is None:
+            if column_name is None:
+                column_name = "gc_" + (re.sub(r"\W+", "_", normalized).strip("_").lower()[:48] or "expr")
+            column = HssSqlColumn(column_name, data_type, generated_expression=normalized, generated_storage=storage)
+            statements.append(f"ALTER TABLE {self.name} ADD COLUMN {column.generate_column_definition.strip()};")
+        index = next((idx for idx in self.indexes if self.part_column(idx["parts"][0]) == column.name), None)
+        if index is None:
+            part = column.name if indexable == "full" else f"{column.name}({self.DEFAULT_PREFIX_LENGTH})"
+            index = {"name": f"idx_{column.name}", "parts": [part], "unique": False}
+            statements.append(f"ALTER TABLE {self.name} ADD {self.render_index(index)};")
+        hint = (f"Filter on {column.name} (or on exactly `{column.generated_expression}`) "
+                f"so that the optimizer can use index {index['name']} instead of a full scan of {self.name}.")
+        if apply and statements:
+            if column not in self.columns:
+                self.add_column(column)
+            if index not in self.indexes:
+                self.add_index(index["name"], index["parts"], index["unique"])
+        return {"column": column, "index": index, "statements": statements, "hint": hint}
+
+    def estimate_row_size(self) -> int:
+        """
+        Estimate the maximum stored size of a row from the type registry.
+
+        Returns:
+            int: The sum of the maximum storage sizes of the columns, in bytes.
+
+        """
+        return sum(column.storage_size() for column in self.columns)
 
     def generate_create_table(self) -> str:
         """
@@ -107,7 +346,8 @@ class HssSqlTable:
         create_command = f"CREATE TABLE {self.name} (\n"
         column_commands = [f"    {col.generate_column_definition}" for col in self.columns]
         constraint_commands = [f"    {constraint}" for constraint in self.constraints]
-        create_command += ",\n".join(column_commands + constraint_commands)
+        index_commands = [f"    {self.render_index(index)}" for index in self.indexes]
+        create_command += ",\n".join(column_commands + constraint_commands + index_commands)
         create_command += "\n);"
         return create_command
 
@@ -119,27 +359,47 @@ class HssSqlTable:
             dict: The dictionary representation of the table.
 
         """
-        return {
+        data = {
             "name": self.name,
             "columns": [col.to_dict() for col in self.columns],
             "constraints": self.constraints
         }
+        if self.indexes:
+            data["indexes"] = self.indexes
+        return data
 
     @classmethod
-    def from_dict(cls, data: dict) -> 'HssSqlTable':
+    def from_dict(cls, data: dict, registry=None) -> 'HssSqlTable':
         """
         Create a table object from a dictionary.
 
         Args:
             data (dict): The dictionary containing table information.
+            registry (HssSqlColumnRegistry, optional): When given, identical column
+                dictionaries are de-duplicated into shared column templates.
 
         Returns:
             HssSqlTable: The table object.
 
         """
         instance = cls(data["name"])
-        instance.columns = [HssSqlColumn.from_dict(col_data) for col_data in data.get("columns", [])]
+        for col_data in data.get("columns", []):
+            if registry is not None:
+                column = registry.intern(col_data)
+            else:
+                column = HssSqlColumn.from_dict(col_data)
+            instance._cow_adopt("columns", column)
         instance.constraints = data.get("constraints", [])
+        for index in data.get("indexes", []):
+            instance.add_index(index["name"], index["parts"], index.get("unique", False))
         return instance
 
+    def fingerprint(self) -> str:
+        """
+        Compute the structural hash of the table.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest of the canonical to_dict content.
 
+        """
+        return fingerprint(self.to_dict())
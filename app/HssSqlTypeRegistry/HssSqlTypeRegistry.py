@@ -0,0 +1,630 @@
+import re
+
+
+class HssSqlDataType:
+    """
+    A SQL data type with its parameter grammar and its size and cost metadata.
+
+    Attributes:
+        name (str): The upper-cased base type name, e.g. ``VARCHAR``.
+        family (str): The value family, e.g. ``integer``, ``char``, ``text``, ``json`` or ``spatial``.
+        grammar (str): The parameter grammar: a key of GRAMMARS, a regular expression, or None
+            when the type takes no parameter.
+        parameter_required (bool): Whether the parameter is mandatory.
+        indexable (str): ``full``, ``prefix`` (needs a key prefix length), ``spatial``
+            (SPATIAL INDEX only), or None when the type cannot be indexed directly.
+        compare_cost (int): Relative cost of comparing or sorting two values (1 for integers).
+
+    Class Attributes:
+        GRAMMARS (dict): Named parameter grammars.
+
+    Methods:
+        accepts(parameter: str = None) -> bool: Check a parameter against the grammar.
+        storage_size(parameter: str = None) -> int: Return the maximum storage size in bytes.
+
+    """
+
+    GRAMMARS = {
+        "length": r"\d+",
+        "precision": r"\d+(?:\s*,\s*\d+)?",
+        "members": r"'(?:[^']|'')*'(?:\s*,\s*'(?:[^']|'')*')*",
+        "fsp": r"[0-6]",
+    }
+
+    def __init__(self, name: str, family: str, grammar: str = None, parameter_required: bool = False,
+                 storage_size=None, indexable: str = "full", compare_cost: int = 1):
+        """
+        Initialize a new instance of HssSqlDataType.
+
+        Args:
+            name (str): The base type name.
+            family (str): The value family.
+            grammar (str, optional): A key of GRAMMARS or a regular expression for the parameter.
+            parameter_required (bool, optional): Whether the parameter is mandatory.
+            storage_size (int | callable, optional): The size in bytes, or a function of the
+                parameter returning it. Defaults to 0 (unknown).
+            indexable (str, optional): ``full``, ``prefix``, ``spatial`` or None.
+            compare_cost (int, optional): Relative comparison and sort cost.
+
+        Raises:
+            ValueError: If the indexability is invalid.
+        """
+        if indexable not in ("full", "prefix", "spatial", None):
+            raise ValueError(f"Invalid indexability: {indexable}")
+        self.name = name.upper()
+        self.family = family
+        self.grammar = grammar
+        self.parameter_required = parameter_required
+        self.indexable = indexable
+        self.compare_cost = compare_cost
+        self._size = storage_size if callable(storage_size) else (lambda parameter, size=storage_size or 0: size)
+        self._pattern = re.compile(self.GRAMMARS.get(grammar, grammar)) if grammar else None
+
+    def accepts(self, parameter: str = None) -> bool:
+        """
+        Check a parameter against the grammar of the type.
+
+        Args:
+            parameter (str, optional): The parameter, e.g. ``"10,2"``.
+
+        Returns:
+            bool: True if the parameter is valid for the type.
+
+        """
+        if parameter is None or not parameter.strip():
+            return not self.parameter_required
+        return self._pattern is not None and self._pattern.fullmatch(parameter.strip()) is not None
+
+    def storage_size(self, parameter: str = None) -> int:
+        """
+        Return the maximum storage size of a value in bytes.
+
+        Args:
+            parameter (str, optional): The type parameter.
+
+        Returns:
+            int: The size in bytes.
+
+        """
+        return self._size(parameter)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+
+        Returns:
+            str: The string representation.
+
+        """
+        return f"HssSqlDataType(name='{self.name}', family='{self.family}', grammar={self.grammar!r})"
+
+
+class HssSqlRegistryView:
+    """
+    A read-only class attribute derived from a type registry on every access.
+
+    Class-level lists that mirror the registry, such as the legacy
+    ``HssSqlColumn.VALID_DATA_TYPES``, are declared with this descriptor so that
+    they always reflect the types and constraints registered so far.
+
+    Methods:
+        __get__(instance, owner) -> object: Compute the value for the owner class.
+        __set__(instance, value) -> None: Reject assignment through an instance.
+
+    """
+
+    def __init__(self, compute):
+        """
+        Initialize the view.
+
+        Args:
+            compute (callable): Called with the owner class; returns the value.
+
+        """
+        self._compute = compute
+        self._name = None
+
+    def __set_name__(self, owner, name) -> None:
+        """
+        Remember the attribute name, for error messages.
+
+        Args:
+            owner (type): The class declaring the attribute.
+            name (str): The attribute name.
+
+        """
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        """
+        Compute the value for the owner class.
+
+        Args:
+            instance: The instance the attribute is read through, or None.
+            owner (type, optional): The class the attribute is read through.
+
+        Returns:
+            object: The computed value.
+
+        """
+        return self._compute(owner if owner is not None else type(instance))
+
+    def __set__(self, instance, value) -> None:
+        """
+        Reject assignment through an instance.
+
+        Raises:
+            AttributeError: Always; register types and constraints on the registry instead.
+        """
+        raise AttributeError(f"{self._name} is derived from the type registry and is read-only")
+
+
+class HssSqlTypeRegistry:
+    """
+    A pluggable registry of SQL data types and column constraint keywords.
+
+    Every validation, rendering, estimation and linting path resolves types through
+    a registry: a dictionary keyed by base type name, so a lookup is O(1) whatever
+    the number of types. Vendor types are added at runtime with register().
+
+    Trailing type modifiers (``UNSIGNED``, ``SIGNED``, ``ZEROFILL``) qualify the base
+    type rather than naming a type of their own, so ``INT(10) UNSIGNED`` resolves to
+    the INT entry with the parameter ``10``. They are only valid on numeric types.
+
+    Attributes:
+        constraints (list): The valid column constraint keywords, in registration order.
+
+    Class Attributes:
+        CHARSET_WIDTH (int): Maximum bytes per character (utf8mb4) used for size estimates.
+        MODIFIERS (tuple): The type modifiers accepted after a numeric type.
+        NUMERIC_FAMILIES (tuple): The families accepting type modifiers.
+
+    Methods:
+        register(data_type: HssSqlDataType, replace: bool = False) -> HssSqlDataType: Add a type.
+        unregister(name: str) -> None: Remove a type.
+        get(name: str) -> HssSqlDataType: Return a type by base name, or None.
+        names() -> list: Return the registered type names.
+        split(data_type: str) -> tuple: Split a data type into base type and parameter.
+        modifiers(data_type: str) -> tuple: Return the type modifiers of a data type.
+        is_unsigned(data_type: str) -> bool: Check if a data type only holds non-negative values.
+        resolve(data_type: str) -> tuple: Return the type entry and parameter of a data type.
+        is_valid(data_type: str, parameter: str = None) -> bool: Validate a data type.
+        storage_size(data_type: str) -> int: Return the maximum storage size of a data type.
+        indexable(data_type: str) -> str: Return the indexability of a data type.
+        compare_cost(data_type: str) -> int: Return the comparison cost of a data type.
+        register_constraint(keyword: str) -> None: Add a column constraint keyword.
+        constraint_keyword(constraint: str) -> str: Return the keyword a constraint starts with.
+        is_valid_constraint(constraint: str) -> bool: Check if a column constraint is valid.
+        default() -> 'HssSqlTypeRegistry': Return the process-wide registry of built-in types.
+
+    """
+
+    CHARSET_WIDTH = 4
+
+    MODIFIERS = ("UNSIGNED", "SIGNED", "ZEROFILL")
+
+    NUMERIC_FAMILIES = ("integer", "float", "decimal")
+
+    _MODIFIER_PATTERN = re.compile(r"(?:\s+(?:UNSIGNED|SIGNED|ZEROFILL)\b)+\s*$", re.IGNORECASE)
+
+    _default = None
+
+    def __init__(self, types=None, constraints=None):
+        """
+        Initialize the HssSqlTypeRegistry object.
+
+        Args:
+            types (list, optional): HssSqlDataType entries to register.
+            constraints (list, optional): Column constraint keywords to register.
+
+        """
+        self._types = {}
+        self._constraints = {}
+        self.constraints = []
+        for data_type in types or []:
+            self.register(data_type)
+        for keyword in constraints or []:
+            self.register_constraint(keyword)
+
+    def __contains__(self, name) -> bool:
+        """
+        Check if a base type is registered.
+
+        Returns:
+            bool: True if the type is registered.
+
+        """
+        return isinstance(name, str) and name.strip().upper() in self._types
+
+    def register(self, data_type: HssSqlDataType, replace: bool = False) -> HssSqlDataType:
+        """
+        Add a type to the registry.
+
+        Args:
+            data_type (HssSqlDataType): The type entry.
+            replace (bool, optional): Replace an existing entry with the same name.
+
+        Returns:
+            HssSqlDataType: The registered entry.
+
+        Raises:
+            ValueError: If the type is already registered and replace is False.
+        """
+        if data_type.name in self._types and not replace:
+            raise ValueError(f"Data type already registered: {data_type.name}")
+        self._types[data_type.name] = data_type
+        return data_type
+
+    def unregister(self, name: str) -> None:
+        """
+        Remove a type from the registry.
+
+        Args:
+            name (str): The base type name.
+
+        Returns:
+            None
+
+        """
+        self._types.pop(name.upper(), None)
+
+    def get(self, name: str) -> HssSqlDataType:
+        """
+        Return a type by base name.
+
+        Args:
+            name (str): The base type name, e.g. ``varchar``.
+
+        Returns:
+            HssSqlDataType: The entry, or None if the type is not registered.
+
+        """
+        return self._types.get(name.strip().upper()) if isinstance(name, str) else None
+
+    def names(self) -> list:
+        """
+        Return the registered type names.
+
+        Returns:
+            list: The base type names, in registration order.
+
+        """
+        return list(self._types)
+
+    @classmethod
+    def _strip_modifiers(cls, data_type: str) -> tuple:
+        """
+        Separate the trailing type modifiers of a data type string.
+
+        Args:
+            data_type (str): The data type, e.g. ``INT(10) UNSIGNED ZEROFILL``.
+
+        Returns:
+            tuple: The data type without modifiers and the upper-cased modifiers, in order.
+
+        """
+        data_type = (data_type or "").strip()
+        match = cls._MODIFIER_PATTERN.search(data_type)
+        if match is None:
+            return data_type, ()
+        return data_type[:match.start()].strip(), tuple(match.group(0).upper().split())
+
+    @classmethod
+    def split(cls, data_type: str) -> tuple:
+        """
+        Split a data type string into its base type and parameter, ignoring type modifiers.
+
+        Args:
+            data_type (str): The data type, e.g. ``VARCHAR(255)``, ``INT`` or ``INT UNSIGNED``.
+
+        Returns:
+            tuple: The upper-cased base type and the parameter string (or None).
+
+        """
+        data_type = cls._strip_modifiers(data_type)[0]
+        if "(" in data_type and data_type.endswith(")"):
+            base, parameter = data_type[:-1].split("(", 1)
+            return base.strip().upper(), parameter.strip()
+        return data_type.upper(), None
+
+    @classmethod
+    def modifiers(cls, data_type: str) -> tuple:
+        """
+        Return the type modifiers of a data type string.
+
+        Args:
+            data_type (str): The data type, e.g. ``BIGINT UNSIGNED``.
+
+        Returns:
+            tuple: The upper-cased modifiers, in order; empty if there are none.
+
+        """
+        return cls._strip_modifiers(data_type)[1]
+
+    @classmethod
+    def is_unsigned(cls, data_type: str) -> bool:
+        """
+        Check if a data type only holds non-negative values.
+
+        ZEROFILL implies UNSIGNED, as in MySQL.
+
+        Args:
+            data_type (str): The data type.
+
+        Returns:
+            bool: True if the data type carries UNSIGNED or ZEROFILL.
+
+        """
+        modifiers = cls.modifiers(data_type)
+        return "UNSIGNED" in modifiers or "ZEROFILL" in modifiers
+
+    def resolve(self, data_type: str) -> tuple:
+        """
+        Return the type entry and the parameter of a data type string.
+
+        Args:
+            data_type (str): The data type, e.g. ``DECIMAL(10,2)``.
+
+        Returns:
+            tuple: The HssSqlDataType (or None if unknown) and the parameter (or None).
+
+        """
+        base_type, parameter = self.split(data_type)
+        return self._types.get(base_type), parameter
+
+    def is_valid(self, data_type: str, parameter: str = None) -> bool:
+        """
+        Validate a data type, its parameter and its type modifiers.
+
+        Args:
+            data_type (str): The base type, or a full data type such as ``VARCHAR(255)``
+                or ``INT UNSIGNED``.
+            parameter (str, optional): The parameter, when data_type is a base type.
+
+        Returns:
+            bool: True if the type is registered and accepts the parameter, and its
+                modifiers are distinct, not contradictory and on a numeric type.
+
+        """
+        data_type, modifiers = self._strip_modifiers(data_type)
+        if parameter is None:
+            entry, parameter = self.resolve(data_type)
+        else:
+            entry = self.get(data_type)
+        if entry is None or not entry.accepts(parameter):
+            return False
+        if modifiers:
+            return (entry.family in self.NUMERIC_FAMILIES and len(set(modifiers)) == len(modifiers)
+                    and not {"SIGNED", "UNSIGNED"} <= set(modifiers))
+        return True
+
+    def storage_size(self, data_type: str) -> int:
+        """
+        Return the maximum storage size of a data type.
+
+        Args:
+            data_type (str): The data type, e.g. ``VARCHAR(255)``.
+
+        Returns:
+            int: The size in bytes, or 0 for an unknown type.
+
+        """
+        entry, parameter = self.resolve(data_type)
+        return entry.storage_size(parameter) if entry is not None else 0
+
+    def indexable(self, data_type: str) -> str:
+        """
+        Return the indexability of a data type.
+
+        Args:
+            data_type (str): The data type.
+
+        Returns:
+            str: ``full``, ``prefix``, ``spatial`` or None. Unknown types are assumed ``full``.
+
+        """
+        entry = self.resolve(data_type)[0]
+        return entry.indexable if entry is not None else "full"
+
+    def compare_cost(self, data_type: str) -> int:
+        """
+        Return the relative comparison and sort cost of a data type.
+
+        Args:
+            data_type (str): The data type.
+
+        Returns:
+            int: The cost, 1 for integers. Unknown types cost 1.
+
+        """
+        entry = self.resolve(data_type)[0]
+        return entry.compare_cost if entry is not None else 1
+
+    def register_constraint(self, keyword: str) -> None:
+        """
+        Add a column constraint keyword.
+
+        Args:
+            keyword (str): The keyword, e.g. ``AUTO_INCREMENT`` or ``PRIMARY KEY``.
+
+        Returns:
+            None
+
+        """
+        keyword = " ".join(keyword.upper().split())
+        if keyword not in self._constraints:
+            self._constraints[keyword] = keyword
+            self.constraints.append(keyword)
+
+    def constraint_keyword(self, constraint: str) -> str:
+        """
+        Return the registered keyword a column constraint starts with.
+
+        Arguments following the keyword are allowed, so ``DEFAULT 0`` and
+        ``CHECK (age > 0)`` resolve to ``DEFAULT`` and ``CHECK``.
+
+        Args:
+            constraint (str): The constraint.
+
+        Returns:
+            str: The keyword, or None if the constraint starts with no registered keyword.
+
+        """
+        words = re.findall(r"[A-Z_]+|[^A-Z_\s]", constraint.upper()[:64])
+        if len(words) > 1 and f"{words[0]} {words[1]}" in self._constraints:
+            return f"{words[0]} {words[1]}"
+        return self._constraints.get(words[0]) if words else None
+
+    def is_valid_constraint(self, constraint: str) -> bool:
+        """
+        Check if a column constraint starts with a registered keyword.
+
+        Args:
+            constraint (str): The constraint.
+
+        Returns:
+            bool: True if the constraint is valid.
+
+        """
+        return self.constraint_keyword(constraint) is not None
+
+    @classmethod
+    def default(cls) -> 'HssSqlTypeRegistry':
+        """
+        Return the process-wide registry, populated with the built-in MySQL types.
+
+        Returns:
+            HssSqlTypeRegistry: The shared registry.
+
+        """
+        if cls._default is None:
+            cls._default = cls(cls._builtin_types(),
+                               ["PRIMARY KEY", "UNIQUE", "NOT NULL", "CHECK", "DEFAULT", "NULL", "AUTO_INCREMENT",
+                                "ON UPDATE", "CHARACTER SET", "CHARSET", "COLLATE", "COMMENT"])
+        return cls._default
+
+    @staticmethod
+    def _leading_number(parameter, default: int) -> int:
+        """
+        Return the leading integer of a parameter.
+
+        Args:
+            parameter (str): The parameter, or None.
+            default (int): The value used when the parameter has no leading integer.
+
+        Returns:
+            int: The number.
+
+        """
+        head = (parameter or "").split(",", 1)[0].strip()
+        return int(head) if head.isdigit() else default
+
+    @classmethod
+    def _decimal_size(cls, parameter) -> int:
+        """
+        Return the storage size of DECIMAL(M,D): 4 bytes per 9 digits plus the leftover digits.
+
+        Args:
+            parameter (str): The ``M,D`` parameter, or None for DECIMAL(10,0).
+
+        Returns:
+            int: The size in bytes.
+
+        """
+        precision, _, scale = (parameter or "10").partition(",")
+        precision = int(precision) if precision.strip().isdigit() else 10
+        scale = int(scale) if scale.strip().isdigit() else 0
+        leftover = (0, 1, 1, 2, 2, 3, 3, 4, 4, 4)
+        digits = (precision - scale, scale)
+        return sum(d // 9 * 4 + leftover[d % 9] for d in digits)
+
+    @staticmethod
+    def _member_count(parameter) -> int:
+        """
+        Count the quoted members of an ENUM or SET parameter.
+
+        Args:
+            parameter (str): The parameter, or None.
+
+        Returns:
+            int: The number of members.
+
+        """
+        return len(re.findall(r"'(?:[^']|'')*'", parameter or ""))
+
+    @classmethod
+    def _set_size(cls, parameter) -> int:
+        """
+        Return the storage size of a SET: (N + 7) / 8 bytes, rounded up to 8 beyond 4.
+
+        Args:
+            parameter (str): The member list.
+
+        Returns:
+            int: The size in bytes.
+
+        """
+        size = (cls._member_count(parameter) + 7) // 8
+        return size if size <= 4 else 8
+
+    @classmethod
+    def _builtin_types(cls) -> list:
+        """
+        Build the entries of the built-in MySQL types, including JSON and the spatial types.
+
+        Returns:
+            list: The HssSqlDataType entries.
+
+        """
+        width = cls.CHARSET_WIDTH
+        number = cls._leading_number
+
+        def fsp(base):
+            return lambda parameter: base + (number(parameter, 0) + 1) // 2
+
+        def length_prefixed(maximum):
+            return maximum + (1 if maximum < 256 else 2)
+
+        blob_sizes = {"TINY": 2 ** 8 - 1, "": 2 ** 16 - 1, "MEDIUM": 2 ** 24 - 1, "LONG": 2 ** 32 - 1}
+        prefixes = {"TINY": 1, "": 2, "MEDIUM": 3, "LONG": 4}
+        types = [
+            HssSqlDataType("BIT", "bit", "length", storage_size=lambda p: (number(p, 1) + 7) // 8),
+            HssSqlDataType("TINYINT", "integer", "length", storage_size=1),
+            HssSqlDataType("BOOL", "boolean", storage_size=1),
+            HssSqlDataType("BOOLEAN", "boolean", storage_size=1),
+            HssSqlDataType("SMALLINT", "integer", "length", storage_size=2),
+            HssSqlDataType("MEDIUMINT", "integer", "length", storage_size=3),
+            HssSqlDataType("INT", "integer", "length", storage_size=4),
+            HssSqlDataType("INTEGER", "integer", "length", storage_size=4),
+            HssSqlDataType("BIGINT", "integer", "length", storage_size=8),
+            HssSqlDataType("FLOAT", "float", "precision", storage_size=lambda p: 8 if number(p, 0) > 24 and "," not in (p or "") else 4),
+            HssSqlDataType("DOUBLE", "float", "precision", storage_size=8),
+            HssSqlDataType("DECIMAL", "decimal", "precision", storage_size=cls._decimal_size, compare_cost=2),
+            HssSqlDataType("CHAR", "char", "length", storage_size=lambda p: number(p, 1) * width, compare_cost=4),
+            HssSqlDataType("VARCHAR", "char", "length", True,
+                           storage_size=lambda p: length_prefixed(number(p, 0) * width), compare_cost=4),
+            HssSqlDataType("BINARY", "binary", "length", storage_size=lambda p: number(p, 1), compare_cost=2),
+            HssSqlDataType("VARBINARY", "binary", "length", True,
+                           storage_size=lambda p: length_prefixed(number(p, 0)), compare_cost=2),
+        ]
+        for size, maximum in blob_sizes.items():
+            types.append(HssSqlDataType(f"{size}BLOB", "blob", "length" if not size else None,
+                                        storage_size=maximum + prefixes[size], indexable="prefix", compare_cost=6))
+            types.append(HssSqlDataType(f"{size}TEXT", "text", "length" if not size else None,
+                                        storage_size=maximum + prefixes[size], indexable="prefix", compare_cost=8))
+        types += [
+            HssSqlDataType("ENUM", "enum", "members", True,
+                           storage_size=lambda p: 1 if cls._member_count(p) < 256 else 2),
+            HssSqlDataType("SET", "set", "members", True, storage_size=cls._set_size),
+            HssSqlDataType("DATE", "date", storage_size=3),
+            HssSqlDataType("DATETIME", "datetime", "fsp", storage_size=fsp(5)),
+            HssSqlDataType("TIMESTAMP", "datetime", "fsp", storage_size=fsp(4)),
+            HssSqlDataType("TIME", "time", "fsp", storage_size=fsp(3)),
+            HssSqlDataType("YEAR", "year", r"4", storage_size=1),
+            HssSqlDataType("JSON", "json", storage_size=2 ** 32 + 3, indexable=None, compare_cost=16),
+        ]
+        for spatial in ("GEOMETRY", "POINT", "LINESTRING", "POLYGON", "MULTIPOINT",
+                        "MULTILINESTRING", "MULTIPOLYGON", "GEOMETRYCOLLECTION"):
+            types.append(HssSqlDataType(spatial, "spatial", storage_size=25 if spatial == "POINT" else 2 ** 32 + 3,
+                                        indexable="spatial", compare_cost=32))
+        return types
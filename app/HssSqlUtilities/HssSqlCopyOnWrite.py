@@ -0,0 +1,240 @@
+import copy
+
+
+class HssSqlCopyOnWrite:
+    """
+    Mixin providing O(1) snapshots of model objects through copy-on-write.
+
+    A snapshot is a shallow clone that shares the collections named in
+    COW_ATTRIBUTES with the original. Both sides mark those collections as shared,
+    and the first mutation on either side replaces the shared collection with a
+    private copy. Child objects (the tables of a database, the columns of a table)
+    are shared as well and are detached one at a time when they are edited through
+    their parent (``edit_table``, ``edit_column``).
+
+    Children remember the parents they were added to. A child still shared with a
+    snapshot is frozen: its mutating methods raise TypeError instead of silently
+    changing the snapshot too. Checking costs one step per ancestor, so snapshots
+    stay O(1).
+
+    Class Attributes:
+        COW_ATTRIBUTES (tuple): Names of the collection attributes shared with snapshots.
+
+    Methods:
+        snapshot() -> object: Return an O(1) copy-on-write clone of the object.
+        restore(snapshot) -> None: Roll the object back to a snapshot in O(1).
+        is_shared() -> bool: Check if the object is shared with a snapshot through one of its parents.
+
+    """
+
+    COW_ATTRIBUTES = ()
+
+    def snapshot(self):
+        """
+        Return an O(1) copy-on-write clone of the object.
+
+        Returns:
+            object: A clone sharing all collections and children with this object.
+                The clone belongs to no parent.
+
+        """
+        clone = copy.copy(self)
+        clone.__dict__.pop("_cow_parents", None)
+        self._cow_reset()
+        clone._cow_reset()
+        return clone
+
+    def restore(self, snapshot) -> None:
+        """
+        Roll the object back to a snapshot in O(1).
+
+        The snapshot stays valid and can be restored again later.
+
+        Args:
+            snapshot: A snapshot previously returned by snapshot().
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the object is shared with a snapshot through one of its parents.
+        """
+        self._cow_check()
+        parents = self.__dict__.get("_cow_parents")
+        self.__dict__.update(snapshot.__dict__)
+        self.__dict__.pop("_cow_parents", None)
+        if parents is not None:
+            self._cow_parents = parents
+        self._cow_reset()
+        snapshot._cow_reset()
+
+    def is_shared(self) -> bool:
+        """
+        Check if the object is shared with a snapshot through one of its parents.
+
+        A child is shared when a parent was snapshotted after the child was added
+        and has not detached it since, or when the parent itself is shared.
+
+        Returns:
+            bool: True if mutating the object in place would also change a snapshot.
+
+        """
+        for parent in self.__dict__.get("_cow_parents", ()):
+            owned = parent.__dict__.get("_cow_owned")
+            if owned is not None and owned.get(id(self)) is not self:
+                return True
+            if parent.is_shared():
+                return True
+        return False
+
+    def _cow_check(self) -> None:
+        """
+        Refuse to mutate an object that is shared with a snapshot.
+
+        Raises:
+            TypeError: If the object is shared with a snapshot.
+        """
+        if self.is_shared():
+            raise TypeError(f"{type(self).__name__} '{getattr(self, 'name', '')}' is shared with a snapshot; "
+                            f"use HssSqlDatabase.edit_table or HssSqlTable.edit_column to modify it")
+
+    def _cow_reset(self) -> None:
+        """
+        Mark every collection and child of the object as shared.
+
+        Returns:
+            None
+
+        """
+        self._cow_shared = set(self.COW_ATTRIBUTES)
+        self._cow_owned = {}
+
+    def _cow_mutable(self, attribute: str):
+        """
+        Return a collection attribute that is safe to mutate in place.
+
+        Args:
+            attribute (str): The name of the collection attribute.
+
+        Returns:
+            The collection, copied first if it was shared with a snapshot.
+
+        Raises:
+            TypeError: If the object itself is shared with a snapshot.
+        """
+        self._cow_check()
+        shared = self.__dict__.get("_cow_shared")
+        if shared and attribute in shared:
+            setattr(self, attribute, copy.copy(getattr(self, attribute)))
+            shared.discard(attribute)
+        return getattr(self, attribute)
+
+    def _cow_assign(self, attribute: str, value) -> None:
+        """
+        Replace a collection attribute with a new, private collection.
+
+        Args:
+            attribute (str): The name of the collection attribute.
+            value: The new collection.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the object itself is shared with a snapshot.
+        """
+        self._cow_check()
+        kept = {id(child) for child in value}
+        for child in getattr(self, attribute):
+            if id(child) not in kept:
+                self._cow_release(child)
+        setattr(self, attribute, value)
+        shared = self.__dict__.get("_cow_shared")
+        if shared:
+            shared.discard(attribute)
+
+    def _cow_adopt(self, attribute: str, child) -> None:
+        """
+        Append a child to a list attribute and record this object as its parent.
+
+        Args:
+            attribute (str): The name of the list attribute.
+            child: The child to append.
+
+        Returns:
+            None
+
+        Raises:
+            TypeError: If the object itself is shared with a snapshot.
+        """
+        self._cow_mutable(attribute).append(child)
+        self._cow_own(child)
+
+    def _cow_own(self, child) -> None:
+        """
+        Record this object as a parent owning a child.
+
+        Immutable children providing ``thaw()`` and plain values are not tracked.
+
+        Args:
+            child: The child.
+
+        Returns:
+            None
+
+        """
+        if not isinstance(child, HssSqlCopyOnWrite) or hasattr(child, "thaw"):
+            return
+        owned = self.__dict__.get("_cow_owned")
+        if owned is not None:
+            owned[id(child)] = child
+        parents = child.__dict__.setdefault("_cow_parents", [])
+        if not any(parent is self for parent in parents):
+            parents.append(self)
+
+    def _cow_release(self, child) -> None:
+        """
+        Forget that this object is a parent of a removed child.
+
+        Args:
+            child: The removed child.
+
+        Returns:
+            None
+
+        """
+        parents = getattr(child, "__dict__", {}).get("_cow_parents")
+        if parents:
+            child._cow_parents = [parent for parent in parents if parent is not self]
+        owned = self.__dict__.get("_cow_owned")
+        if owned is not None and owned.get(id(child)) is child:
+            del owned[id(child)]
+
+    def _cow_child(self, attribute: str, index: int):
+        """
+        Return a child object that is safe to mutate, detaching it if shared.
+
+        Immutable children providing ``thaw()`` are always replaced by a mutable copy.
+
+        Args:
+            attribute (str): The name of the list attribute holding the child.
+            index (int): The position of the child in the list.
+
+        Returns:
+            The child owned by this object.
+
+        Raises:
+            TypeError: If the object itself is shared with a snapshot.
+        """
+        self._cow_check()
+        child = getattr(self, attribute)[index]
+        owned = self.__dict__.get("_cow_owned")
+        if hasattr(child, "thaw"):
+            child = child.thaw()
+        elif owned is None or owned.get(id(child)) is child:
+            return child
+        else:
+            child = child.snapshot()
+        self._cow_mutable(attribute)[index] = child
+        self._cow_own(child)
+        return child
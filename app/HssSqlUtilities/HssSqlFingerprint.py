@@ -0,0 +1,55 @@
+import hashlib
+import json
+
+
+def canonical_json(data) -> str:
+    """
+    Serialize data to JSON with canonical key ordering and separators.
+
+    Objects that are not JSON serializable but provide a ``to_dict`` method are
+    serialized through it.
+
+    Args:
+        data: The data to serialize, usually the output of a ``to_dict`` call.
+
+    Returns:
+        str: The canonical JSON text.
+
+    """
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+                      default=_to_serializable)
+
+
+def fingerprint(data) -> str:
+    """
+    Compute the content-addressed structural hash of data.
+
+    Args:
+        data: The data to hash, usually the output of a ``to_dict`` call.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the canonical JSON form.
+
+    """
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
+
+
+def _to_serializable(value):
+    """
+    Convert a model object to a JSON serializable value.
+
+    Args:
+        value: The object json could not serialize.
+
+    Returns:
+        The serializable representation of the object.
+
+    Raises:
+        TypeError: If the object has no ``to_dict`` method.
+
+    """
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
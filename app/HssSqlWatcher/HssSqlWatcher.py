@@ -0,0 +1,251 @@
+import hashlib
+import os
+import time
+
+from app.HssSqlLoader.HssSqlLoader import HssSqlLoader
+
+
+class HssSqlWatcher:
+    """
+    A polling watcher that regenerates DDL for schema files as they change.
+
+    The watcher scans a directory for specification files. A file whose mtime or
+    size changed is re-hashed, and only a real content change marks it dirty. Once
+    no further change has been seen for the debounce period, each dirty file is
+    re-parsed and only the tables whose fingerprint changed are re-rendered with
+    generate_create_table, so a burst of saves triggers a single rebuild.
+
+    Attributes:
+        directory (str): The watched directory.
+        output_dir (str): The directory receiving one .sql file per table.
+        interval (float): Seconds between two scans.
+        debounce (float): Quiet period, in seconds, before dirty files are rebuilt.
+        fmt (str): Forced input format, or None to detect it per file.
+        skipped (list): (path, error) pairs of the files the last rebuild could not parse.
+
+    Methods:
+        scan() -> bool: Detect changed, new and deleted specification files.
+        rebuild() -> list: Re-render the tables of the dirty files.
+        poll(now: float = None) -> list: Scan and rebuild once the debounce period elapsed.
+        watch(callback=None, max_cycles: int = None, on_skip=None) -> None: Poll until interrupted.
+
+    """
+
+    def __init__(self, directory: str, output_dir: str = None, interval: float = 0.5,
+                 debounce: float = 0.3, fmt: str = None):
+        """
+        Initialize the HssSqlWatcher object.
+
+        Args:
+            directory (str): The directory to watch.
+            output_dir (str, optional): Output directory. Defaults to ``<directory>/generated``.
+            interval (float, optional): Seconds between two scans.
+            debounce (float, optional): Quiet period before rebuilding.
+            fmt (str, optional): Input format; detected per file when omitted.
+
+        Raises:
+            ValueError: If the output directory is the watched directory, where generated
+                files would overwrite and be read back as specifications.
+            OSError: If an error occurs while creating the output directory.
+        """
+        self.directory = directory
+        self.output_dir = output_dir if output_dir is not None else os.path.join(directory, "generated")
+        if os.path.realpath(self.output_dir) == os.path.realpath(directory):
+            raise ValueError(f"The output directory must differ from the watched directory: {directory}")
+        self.interval = interval
+        self.debounce = debounce
+        self.fmt = fmt
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+        except OSError as e:
+            raise OSError(f"Error creating directory: {e}")
+
+        self._stats = {}
+        self._hashes = {}
+        self._tables = {}
+        self._dirty = set()
+        self._last_change = None
+        self.skipped = []
+
+    def _spec_files(self) -> dict:
+        """
+        List the specification files of the watched directory with their stat signature.
+
+        Returns:
+            dict: Mapping of path to (mtime_ns, size).
+
+        """
+        files = {}
+        for entry in os.scandir(self.directory):
+            if not entry.is_file():
+                continue
+            if os.path.splitext(entry.name)[1].lower() not in HssSqlLoader.EXTENSIONS:
+                continue
+            stat = entry.stat()
+            files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """
+        Compute the content hash of a file.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            str: The hexadecimal SHA-256 digest, or None if the file vanished.
+
+        """
+        try:
+            with open(path, "rb") as spec_file:
+                return hashlib.sha256(spec_file.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+
+    def scan(self) -> bool:
+        """
+        Detect changed, new and deleted specification files.
+
+        Returns:
+            bool: True if any file content changed since the previous scan.
+
+        """
+        changed = False
+        files = self._spec_files()
+        for path, signature in files.items():
+            if self._stats.get(path) == signature:
+                continue
+            self._stats[path] = signature
+            digest = self._hash_file(path)
+            if digest is not None and digest != self._hashes.get(path):
+                self._hashes[path] = digest
+                self._dirty.add(path)
+                changed = True
+        for path in set(self._stats) - set(files):
+            del self._stats[path]
+            self._hashes.pop(path, None)
+            self._dirty.add(path)
+            changed = True
+        return changed
+
+    def _output_path(self, key: str) -> str:
+        """
+        Return the output file of a table.
+
+        Args:
+            key (str): The table key, ``database.table`` or ``table``.
+
+        Returns:
+            str: The .sql file path.
+
+        """
+        return os.path.join(self.output_dir, f"{key}.sql")
+
+    def _file_tables(self, path: str) -> dict:
+        """
+        Parse a specification file into its tables.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            dict: Mapping of table key to HssSqlTable.
+
+        """
+        tables = {}
+        for model in HssSqlLoader.load_file(path, self.fmt):
+            if hasattr(model, "database_name"):
+                for table in model.tables:
+                    if hasattr(table, "generate_create_table"):
+                        tables[f"{model.database_name}.{table.name}"] = table
+            else:
+                tables[model.name] = model
+        return tables
+
+    def rebuild(self) -> list:
+        """
+        Re-render the tables of the dirty files whose definition changed.
+
+        Files that cannot be parsed keep their previous output and are recorded in
+        ``skipped`` with the error.
+
+        Returns:
+            list: The keys of the tables written or removed.
+
+        """
+        rebuilt = []
+        self.skipped = []
+        for path in sorted(self._dirty):
+            previous = self._tables.get(path, {})
+            if path in self._stats:
+                try:
+                    tables = self._file_tables(path)
+                except (OSError, ValueError, ImportError) as e:
+                    self.skipped.append((path, e))
+                    continue
+            else:
+                tables = {}
+            current = {}
+            for key, table in tables.items():
+                digest = table.fingerprint()
+                current[key] = digest
+                if previous.get(key) != digest:
+                    with open(self._output_path(key), "w", encoding="utf-8") as sql_file:
+                        sql_file.write(table.generate_create_table() + "\n")
+                    rebuilt.append(key)
+            for key in set(previous) - set(current):
+                try:
+                    os.remove(self._output_path(key))
+                except FileNotFoundError:
+                    pass
+                rebuilt.append(key)
+            if current:
+                self._tables[path] = current
+            else:
+                self._tables.pop(path, None)
+        self._dirty.clear()
+        return rebuilt
+
+    def poll(self, now: float = None) -> list:
+        """
+        Scan once and rebuild if the debounce period elapsed since the last change.
+
+        Args:
+            now (float, optional): The current monotonic time, for testing.
+
+        Returns:
+            list: The keys of the tables rebuilt during this poll.
+
+        """
+        now = time.monotonic() if now is None else now
+        if self.scan():
+            self._last_change = now
+        if self._dirty and now - self._last_change >= self.debounce:
+            return self.rebuild()
+        return []
+
+    def watch(self, callback=None, max_cycles: int = None, on_skip=None) -> None:
+        """
+        Poll the directory until interrupted.
+
+        Args:
+            callback (callable, optional): Called with the list of rebuilt table keys.
+            max_cycles (int, optional): Stop after this many polls.
+            on_skip (callable, optional): Called with the path and the error of every file
+                that could not be parsed.
+        """
+        cycles = 0
+        try:
+            while max_cycles is None or cycles < max_cycles:
+                self.skipped = []
+                rebuilt = self.poll()
+                if rebuilt and callback is not None:
+                    callback(rebuilt)
+                if on_skip is not None:
+                    for path, error in self.skipped:
+                        on_skip(path, error)
+                cycles += 1
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
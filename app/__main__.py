@@ -0,0 +1,5 @@
+from app.HssSqlCli.HssSqlCli import main
+
+
+if __name__ == "__main__":
+    main()
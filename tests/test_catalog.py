@@ -0,0 +1,78 @@
+from collections import Counter
+
+import pytest
+
+import app.HssSqlCatalog.HssSqlCatalog as catalog_module
+from app.HssSqlCatalog.HssSqlCatalog import HssSqlCatalog
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_databases() -> list:
+    shop = HssSqlDatabase("shop")
+    users = HssSqlTable("users")
+    users.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY", "AUTO_INCREMENT"]))
+    users.add_column(HssSqlColumn("email", "VARCHAR(255)", ["NOT NULL", "UNIQUE"]))
+    users.add_column(HssSqlColumn("bio", "TEXT"))
+    users.add_column(HssSqlColumn("notes", "TEXT"))
+    orders = HssSqlTable("orders")
+    orders.add_column(HssSqlColumn("id", "BIGINT UNSIGNED", ["PRIMARY KEY"]))
+    orders.add_column(HssSqlColumn("code", "VARCHAR(20)", ["NOT NULL"]))
+    orders.add_column(HssSqlColumn("comment", "TEXT"))
+    shop.add_table(users)
+    shop.add_table(orders)
+    blog = HssSqlDatabase("blog")
+    posts = HssSqlTable("posts")
+    posts.add_column(HssSqlColumn("title", "VARCHAR(255)", ["NOT NULL"]))
+    posts.add_column(HssSqlColumn("body", "TEXT"))
+    posts.add_column(HssSqlColumn("summary", "TEXT"))
+    posts.add_column(HssSqlColumn("tags", "TEXT"))
+    blog.add_table(posts)
+    return [shop, blog]
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def catalog(request, monkeypatch) -> HssSqlCatalog:
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(catalog_module, "numpy", None)
+    return HssSqlCatalog.from_databases(build_databases())
+
+
+def test_rows_follow_the_model(catalog):
+    assert len(catalog) == 11
+    assert catalog.database_names == ["shop", "blog"]
+    assert catalog.table_names == ["users", "orders", "posts"]
+    assert list(catalog.table_database) == [0, 0, 1]
+    assert catalog.column_names[:2] == ["id", "email"]
+    assert list(catalog.column_length[:3]) == [-1, 255, -1]
+    assert catalog.type_distribution() == Counter({"TEXT": 6, "VARCHAR": 3, "INT": 1, "BIGINT": 1})
+
+
+def test_mask_and_select_combine_filters(catalog):
+    assert catalog.select(data_type="varchar", min_length=100) == [1, 7]
+    assert catalog.select(data_type="VARCHAR", max_length=100) == [5]
+    assert catalog.select(constraint="primary  key") == [0, 4]
+    assert catalog.select(data_type="TEXT", constraint="NOT NULL") == []
+    assert catalog.select(data_type="VECTOR") == []
+    assert catalog.mask(constraint="NOT NULL") == bytearray([0, 1, 0, 0, 0, 1, 0, 1, 0, 0, 0])
+    with pytest.raises(ValueError, match="Invalid constraint"):
+        catalog.mask(constraint="NOT A CONSTRAINT")
+
+
+def test_per_table_aggregates(catalog):
+    assert list(catalog.count_by_table(data_type="TEXT")) == [2, 1, 3]
+    assert catalog.tables_having(2, data_type="TEXT") == [("shop", "users", 2), ("blog", "posts", 3)]
+    sizes = catalog.size_by_table(data_type="INT")
+    assert list(sizes) == [4, 0, 0]
+    assert catalog.length_distribution("VARCHAR") == Counter({255: 2, 20: 1})
+
+
+def test_paths_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    fast = HssSqlCatalog.from_databases(build_databases())
+    results = [fast.mask(data_type="TEXT"), fast.count_by_table(constraint="NOT NULL"), fast.size_by_table()]
+    monkeypatch.setattr(catalog_module, "numpy", None)
+    assert [fast.mask(data_type="TEXT"), fast.count_by_table(constraint="NOT NULL"), fast.size_by_table()] == results
@@ -0,0 +1,51 @@
+import json
+
+import pytest
+
+from click.testing import CliRunner
+
+from app.HssSqlCli.HssSqlCli import main
+
+
+def write_table(path, name: str) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"name": name, "columns": [{"name": "id", "data_type": "INT"}]}), encoding="utf-8")
+    return str(path)
+
+
+def test_models_with_the_same_name_are_not_overwritten(tmp_path):
+    first = write_table(tmp_path / "a" / "users.json", "users")
+    second = write_table(tmp_path / "b" / "users.json", "users")
+    output = tmp_path / "out"
+    result = CliRunner().invoke(main, [first, second, "--output-dir", str(output)])
+    assert result.exit_code == 1
+    assert f"{first} and {second} both define users; refusing to overwrite users.sql" in result.output
+    assert [path.name for path in output.iterdir()] == ["users.sql"]
+
+
+def test_distinct_models_are_written(tmp_path):
+    inputs = [write_table(tmp_path / "users.json", "users"), write_table(tmp_path / "more" / "users.json", "teams")]
+    output = tmp_path / "out"
+    result = CliRunner().invoke(main, inputs + ["--output-dir", str(output)])
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in output.iterdir()) == ["teams.sql", "users.sql"]
+
+
+def assert_reported(path, message: str) -> None:
+    result = CliRunner().invoke(main, [str(path)])
+    assert result.exit_code == 1
+    assert message in result.output
+    assert "Traceback" not in result.output
+
+
+def test_invalid_yaml_is_reported_without_a_traceback(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "bad.yaml"
+    path.write_text("name: [unclosed\n", encoding="utf-8")
+    assert_reported(path, "Error: Invalid YAML specification")
+
+
+def test_invalid_json_is_reported_without_a_traceback(tmp_path):
+    path = tmp_path / "bad.json"
+    path.write_text("{", encoding="utf-8")
+    assert_reported(path, "Error: Expecting property name")
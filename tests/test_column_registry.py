@@ -0,0 +1,70 @@
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlColumnRegistry.HssSqlColumnRegistry import HssSqlColumnRegistry, HssSqlSharedColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def table_data(name: str) -> dict:
+    return {
+        "name": name,
+        "columns": [
+            {"name": "id", "data_type": "BIGINT", "constraints": ["PRIMARY KEY"]},
+            {"name": "created_at", "data_type": "DATETIME", "constraints": ["NOT NULL"]},
+            {"name": f"{name}_label", "data_type": "VARCHAR(50)", "constraints": []},
+        ],
+        "constraints": [],
+    }
+
+
+def test_identical_specs_share_one_instance():
+    registry = HssSqlColumnRegistry()
+    first = registry.intern(HssSqlColumn("id", "BIGINT", ["PRIMARY KEY"]))
+    second = registry.intern({"name": "id", "data_type": "BIGINT", "constraints": ["PRIMARY KEY"]})
+    other = registry.intern(HssSqlColumn("id", "BIGINT", ["NOT NULL"]))
+    assert first is second
+    assert other is not first
+    assert len(registry) == 2
+    assert registry.register("pk", HssSqlColumn("id", "BIGINT", ["PRIMARY KEY"])) is first
+    assert registry.template("pk") is first
+    with pytest.raises(KeyError, match="Unknown column template"):
+        registry.template("missing")
+
+
+def test_shared_columns_are_immutable_and_thaw_to_independent_copies():
+    shared = HssSqlColumnRegistry().intern(HssSqlColumn("email", "VARCHAR(255)", ["NOT NULL"]))
+    assert isinstance(shared, HssSqlSharedColumn)
+    with pytest.raises(TypeError):
+        shared.add_constraint("UNIQUE")
+    with pytest.raises(TypeError):
+        shared.name = "mail"
+    thawed = shared.thaw()
+    assert type(thawed) is HssSqlColumn
+    thawed.add_constraint("UNIQUE")
+    thawed.set_column_name("mail")
+    assert (shared.name, list(shared.constraints)) == ("email", ["NOT NULL"])
+    assert shared.thaw().to_dict() == shared.to_dict()
+
+
+def test_from_dict_with_registry_deduplicates_columns():
+    registry = HssSqlColumnRegistry()
+    users = HssSqlTable.from_dict(table_data("users"), registry)
+    orders = HssSqlTable.from_dict(table_data("orders"), registry)
+    assert users.columns[0] is orders.columns[0]
+    assert users.columns[1] is orders.columns[1]
+    assert users.columns[2] is not orders.columns[2]
+    assert len(registry) == 4
+    assert users.to_dict() == table_data("users")
+
+
+def test_edit_column_detaches_a_shared_column_per_table():
+    registry = HssSqlColumnRegistry()
+    database = HssSqlDatabase.from_dict({"database_name": "shop", "tables": [table_data("users"),
+                                                                             table_data("orders")]}, registry)
+    users, orders = database.tables
+    users.edit_column("created_at").add_constraint("DEFAULT CURRENT_TIMESTAMP")
+    assert users.columns[1].constraints == ["NOT NULL", "DEFAULT CURRENT_TIMESTAMP"]
+    assert not isinstance(users.columns[1], HssSqlSharedColumn)
+    assert orders.columns[1] is registry.intern(table_data("orders")["columns"][1])
+    assert list(orders.columns[1].constraints) == ["NOT NULL"]
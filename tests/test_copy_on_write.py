@@ -0,0 +1,105 @@
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlGenerator.HssSqlGenerator import HssSqlGenerator
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_database() -> HssSqlDatabase:
+    database = HssSqlDatabase("shop")
+    table = HssSqlTable("users")
+    table.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY"]))
+    table.add_column(HssSqlColumn("email", "VARCHAR(255)"))
+    database.add_table(table)
+    return database
+
+
+def test_direct_table_mutation_after_snapshot_does_not_leak():
+    database = build_database()
+    snap = database.snapshot()
+    with pytest.raises(TypeError):
+        database.tables[0].add_column(HssSqlColumn("age", "INT"))
+    with pytest.raises(TypeError):
+        snap.tables[0].add_index("idx_email", ["email"])
+    assert [column.name for column in snap.tables[0].columns] == ["id", "email"]
+    assert [column.name for column in database.tables[0].columns] == ["id", "email"]
+
+
+def test_direct_column_mutation_after_snapshot_does_not_leak():
+    database = build_database()
+    snap = database.snapshot()
+    with pytest.raises(TypeError):
+        database.edit_table("users").columns[1].add_constraint("NOT NULL")
+    with pytest.raises(TypeError):
+        database.tables[0].columns[1].set_data_type("TEXT")
+    assert snap.tables[0].columns[1].constraints == []
+    assert snap.tables[0].columns[1].data_type == "VARCHAR(255)"
+
+
+def test_edit_accessors_detach_and_then_allow_direct_mutation():
+    database = build_database()
+    snap = database.snapshot()
+    database.edit_table("users").edit_column("email").add_constraint("NOT NULL")
+    database.tables[0].add_column(HssSqlColumn("age", "INT"))
+    database.tables[0].columns[2].add_constraint("NOT NULL")
+    with pytest.raises(TypeError):
+        database.tables[0].columns[0].add_constraint("NOT NULL")
+    database.tables[0].edit_column("id").add_constraint("NOT NULL")
+    assert database.tables[0].columns[0].constraints == ["PRIMARY KEY", "NOT NULL"]
+    assert database.tables[0].columns[1].constraints == ["NOT NULL"]
+    assert [column.name for column in database.tables[0].columns] == ["id", "email", "age"]
+    assert snap.tables[0].columns[0].constraints == ["PRIMARY KEY"]
+    assert snap.tables[0].columns[1].constraints == []
+    assert [column.name for column in snap.tables[0].columns] == ["id", "email"]
+
+
+def test_mutation_without_snapshot_is_unchanged():
+    database = build_database()
+    database.tables[0].add_column(HssSqlColumn("age", "INT"))
+    database.tables[0].columns[0].add_constraint("NOT NULL")
+    assert len(database.tables[0].columns) == 3
+    assert database.tables[0].columns[0].constraints == ["PRIMARY KEY", "NOT NULL"]
+
+
+def test_table_snapshot_is_an_independent_root():
+    database = build_database()
+    shadow = database.tables[0].snapshot()
+    shadow.set_table_name("_users_new")
+    shadow.add_column(HssSqlColumn("age", "INT"))
+    with pytest.raises(TypeError):
+        shadow.columns[0].add_constraint("NOT NULL")
+    assert database.tables[0].name == "users"
+    assert len(database.tables[0].columns) == 2
+
+
+def test_undo_history_is_kept_per_model(tmp_path):
+    generator = HssSqlGenerator(str(tmp_path))
+    database = build_database()
+    table = HssSqlTable("orders")
+    generator.checkpoint(database)
+    database.add_table(HssSqlTable("audit"))
+    generator.checkpoint(table)
+    table.add_column(HssSqlColumn("id", "INT"))
+
+    assert generator.undo(database)
+    assert database.database_name == "shop"
+    assert [t.name for t in database.tables] == ["users"]
+    assert not generator.undo(database)
+    assert generator.undo(table)
+    assert table.columns == []
+    assert generator.redo(database)
+    assert [t.name for t in database.tables] == ["users", "audit"]
+
+
+def test_model_loaded_from_dict_is_isolated_from_snapshot():
+    database = HssSqlDatabase.from_dict(build_database().to_dict())
+    snap = database.snapshot()
+    with pytest.raises(TypeError):
+        database.tables[0].add_column(HssSqlColumn("age", "INT"))
+    with pytest.raises(TypeError):
+        database.tables[0].columns[1].add_constraint("NOT NULL")
+    database.edit_table("users").edit_column("email").add_constraint("NOT NULL")
+    assert [column.name for column in snap.tables[0].columns] == ["id", "email"]
+    assert snap.tables[0].columns[1].constraints == []
+    assert database.tables[0].columns[1].constraints == ["NOT NULL"]
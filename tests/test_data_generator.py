@@ -0,0 +1,72 @@
+import csv
+import io
+from decimal import Decimal
+
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDataGenerator.HssSqlDataGenerator import HssSqlDataGenerator
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_generator(*columns) -> HssSqlDataGenerator:
+    table = HssSqlTable("t")
+    for name, data_type, constraints in columns:
+        table.add_column(HssSqlColumn(name, data_type, constraints))
+    return HssSqlDataGenerator(table, seed=7, null_fraction=0)
+
+
+def test_unsigned_primary_key_and_values():
+    generator = build_generator(("id", "INT UNSIGNED", ["PRIMARY KEY"]),
+                                ("qty", "SMALLINT(5) UNSIGNED ZEROFILL", []),
+                                ("tiny", "TINYINT UNSIGNED", []))
+    ids, quantities, tiny = generator.batch(2000)
+    assert ids == list(range(1, 2001))
+    assert all(isinstance(value, int) and 0 <= value < 2 ** 16 for value in quantities)
+    assert all(isinstance(value, int) and 0 <= value < 2 ** 8 for value in tiny)
+    assert max(tiny) > 127
+
+
+def test_unique_decimal_respects_precision_and_scale():
+    generator = build_generator(("score", "DECIMAL(3,1)", ["UNIQUE"]))
+    values = generator.batch(999)[0]
+    assert len(set(values)) == 999
+    assert all(Decimal("0") < Decimal(value) <= Decimal("99.9") for value in values)
+    with pytest.raises(ValueError, match="cannot hold more than 999 unique values"):
+        generator.batch(1)
+
+
+def test_unique_float_with_precision_is_bounded():
+    generator = build_generator(("ratio", "FLOAT(4,2) UNSIGNED", ["UNIQUE"]))
+    values = generator.batch(9999)[0]
+    assert values[-1] == "99.99"
+    with pytest.raises(ValueError):
+        generator.batch(1)
+
+
+def test_random_float_with_precision_and_unsigned_fits():
+    generator = build_generator(("ratio", "FLOAT(3,1)", []), ("weight", "DOUBLE UNSIGNED", []))
+    ratios, weights = generator.batch(1000)
+    assert all(abs(Decimal(value)) <= Decimal("99.9") for value in ratios)
+    assert all(value >= 0 for value in weights)
+
+
+def test_csv_hex_encodes_bytes():
+    columns = [("id", "INT", ["PRIMARY KEY"]), ("digest", "BINARY(4)", ["UNIQUE"]), ("data", "BLOB", []),
+               ("shape", "GEOMETRY", [])]
+    stream = io.StringIO(newline="")
+    build_generator(*columns).write_csv(stream, 50)
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    expected = list(zip(*build_generator(*columns).batch(50)))
+    assert rows[0] == ["id", "digest", "data", "shape"]
+    assert [[int(row[0])] + [bytes.fromhex(field) for field in row[1:]] for row in rows[1:]] == \
+        [list(row) for row in expected]
+    assert all(isinstance(value, bytes) for row in expected for value in row[1:])
+
+
+@pytest.mark.parametrize("data_type, capacity", [("DATE", 2921940), ("TIMESTAMP", 1200798848)])
+def test_unique_moments_are_bounded(data_type, capacity):
+    generator = build_generator(("at", data_type, ["UNIQUE"]))
+    with pytest.raises(ValueError, match=f"cannot hold more than {capacity} unique values"):
+        generator.batch(3_000_000 if data_type == "DATE" else capacity + 1)
+    assert generator.batch(2)[0][0] in ("2000-01-01", "2000-01-01 00:00:00")
@@ -0,0 +1,65 @@
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDdlCache.HssSqlDdlCache import HssSqlDdlCache
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_table(name: str = "users", extra: str = None) -> HssSqlTable:
+    table = HssSqlTable(name)
+    table.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY"]))
+    table.add_column(HssSqlColumn("email", "VARCHAR(255)", ["NOT NULL"]))
+    if extra:
+        table.add_column(HssSqlColumn(extra, "TEXT"))
+    return table
+
+
+def test_fingerprint_is_stable_and_structural():
+    assert build_table().fingerprint() == build_table().fingerprint()
+    assert build_table().fingerprint() == HssSqlTable.from_dict(build_table().to_dict()).fingerprint()
+    assert build_table().fingerprint() != build_table(extra="bio").fingerprint()
+    assert build_table().fingerprint() != build_table("accounts").fingerprint()
+
+
+def test_hits_and_misses(tmp_path):
+    cache = HssSqlDdlCache(str(tmp_path))
+    first = cache.get_or_render(build_table())
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.get_or_render(build_table()) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.get_or_render(build_table(extra="bio"))
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert HssSqlDdlCache(str(tmp_path)).get(HssSqlDdlCache.key(build_table(), "generate_create_table")) == first
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = HssSqlDdlCache(str(tmp_path), max_bytes=30)
+    cache.put("a", "x" * 10)
+    cache.put("b", "y" * 10)
+    cache.put("c", "z" * 10)
+    assert cache.get("a") == "x" * 10
+    cache.put("d", "w" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["x" * 10, "z" * 10, "w" * 10]
+    assert cache.size() == 30
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.sql", "c.sql", "d.sql"]
+    cache.clear()
+    assert cache.size() == 0 and list(tmp_path.iterdir()) == []
+
+
+def test_renderer_version_is_part_of_the_key(tmp_path):
+    table = build_table()
+    assert HssSqlDdlCache.key(table, "create_table").endswith(f"-create_table-{HssSqlDdlCache.RENDERER_VERSION}")
+    assert HssSqlDdlCache.key(table, "create_table", "v1") != HssSqlDdlCache.key(table, "create_table", "v2")
+    cache = HssSqlDdlCache(str(tmp_path))
+    assert cache.get_or_render(table, lambda model: "old", kind="custom", version="1") == "old"
+    assert cache.get_or_render(table, lambda model: "new", kind="custom", version="2") == "new"
+    assert cache.get_or_render(table, lambda model: "unused", kind="custom", version="1") == "old"
+
+
+def test_invalid_kinds_are_rejected(tmp_path):
+    cache = HssSqlDdlCache(str(tmp_path))
+    with pytest.raises(ValueError, match="kind is required"):
+        cache.get_or_render(build_table(), lambda model: "")
+    with pytest.raises(ValueError, match="Invalid cache key part"):
+        HssSqlDdlCache.key(build_table(), "../escape")
@@ -0,0 +1,81 @@
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDialect.HssSqlDialect import HssSqlDialect
+from app.HssSqlLoader.HssSqlLoader import HssSqlLoader
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+DDL = (
+    "CREATE TABLE posts (id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY, views BIGINT UNSIGNED,"
+    " body TEXT, area POLYGON NOT NULL,"
+    " updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,"
+    " FULLTEXT KEY ft_body (body), SPATIAL INDEX sp_area (area));"
+)
+
+
+@pytest.fixture
+def table() -> HssSqlTable:
+    return HssSqlLoader.parse_ddl(DDL)[0]
+
+
+def test_postgresql_translates_mysql_only_features(table):
+    script = HssSqlDialect.get("postgresql").render_table(table)
+    assert "UNSIGNED" not in script and "ON UPDATE" not in script and "FULLTEXT" not in script
+    assert "id BIGINT NOT NULL GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY CHECK (id >= 0)" in script
+    assert "views NUMERIC(20) CHECK (views >= 0)" in script
+    assert "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP\n);" in script
+    assert "CREATE INDEX posts_ft_body ON posts USING GIN (to_tsvector('simple', COALESCE(body, '')));" in script
+    assert "CREATE INDEX posts_sp_area ON posts USING GIST (area);" in script
+
+
+def test_sqlite_drops_mysql_only_features(table):
+    script = HssSqlDialect.get("sqlite").render_table(table)
+    assert "UNSIGNED" not in script and "ON UPDATE" not in script
+    assert "id INTEGER NOT NULL PRIMARY KEY CHECK (id >= 0)" in script
+    assert "-- FULLTEXT INDEX posts_ft_body (body) dropped: not supported by sqlite" in script
+    assert "-- SPATIAL INDEX posts_sp_area (area) dropped: not supported by sqlite" in script
+    assert not any(line.lstrip().startswith(("FULLTEXT", "SPATIAL")) for line in script.splitlines())
+
+
+def test_mysql_keeps_the_definition(table):
+    script = HssSqlDialect.get("mysql").render_table(table)
+    assert "id INT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY" in script
+    assert "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP" in script
+    assert "FULLTEXT KEY ft_body (body)" in script
+
+
+def test_unmapped_type_is_an_error():
+    table = HssSqlTable("t")
+    table.add_column(HssSqlColumn("v", "VECTOR(3)"))
+    with pytest.raises(ValueError, match="VECTOR\\(3\\) has no postgresql equivalent"):
+        HssSqlDialect.get("postgresql").render_table(table)
+
+
+def test_mysql_column_clauses_are_translated():
+    table = HssSqlLoader.parse_ddl(
+        "CREATE TABLE accounts (login VARCHAR(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL"
+        " COMMENT 'user''s login', active BOOLEAN DEFAULT 0, admin BOOL NOT NULL DEFAULT '1');"
+    )[0]
+    assert table.columns[0].constraints == ["CHARACTER SET utf8mb4", "COLLATE utf8mb4_bin", "NOT NULL",
+                                            "COMMENT 'user''s login'"]
+    postgresql = HssSqlDialect.get("postgresql").render_table(table)
+    assert "    login VARCHAR(32) NOT NULL,\n" in postgresql
+    assert "active BOOLEAN DEFAULT FALSE" in postgresql
+    assert "admin BOOLEAN NOT NULL DEFAULT TRUE" in postgresql
+    assert "COMMENT ON COLUMN accounts.login IS 'user''s login';" in postgresql
+    sqlite = HssSqlDialect.get("sqlite").render_table(table)
+    assert "    login TEXT NOT NULL,\n" in sqlite and "COMMENT" not in sqlite
+    assert "active INTEGER DEFAULT 0" in sqlite and "admin INTEGER NOT NULL DEFAULT 1" in sqlite
+    mysql = HssSqlDialect.get("mysql").render_table(table)
+    assert "login VARCHAR(32) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL COMMENT 'user''s login'" in mysql
+
+
+@pytest.mark.parametrize("name", ["postgresql", "sqlite"])
+def test_standalone_index_names_are_prefixed_with_the_table(name):
+    tables = HssSqlLoader.parse_ddl(
+        "CREATE TABLE users (id INT, name VARCHAR(50), INDEX idx_name (name));"
+        "CREATE TABLE teams (id INT, name VARCHAR(50), INDEX idx_name (name));"
+    )
+    dialect = HssSqlDialect.get(name)
+    statements = [statement for table in tables for statement in dialect.render_indexes(table)]
+    assert statements == ["CREATE INDEX users_idx_name ON users (name);", "CREATE INDEX teams_idx_name ON teams (name);"]
@@ -0,0 +1,90 @@
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDialect.HssSqlDialect import HssSqlDialect
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_table() -> HssSqlTable:
+    table = HssSqlTable("users")
+    table.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY"]))
+    table.add_column(HssSqlColumn("email", "VARCHAR(255)"))
+    table.add_column(HssSqlColumn("payload", "JSON"))
+    return table
+
+
+@pytest.mark.parametrize("expression", ["LOWER(email)", "price * (1 + tax)", "CONCAT(a, ';', b)",
+                                        "payload->>'$.name'"])
+def test_valid_expressions(expression):
+    assert HssSqlColumn.is_valid_expression(expression)
+
+
+@pytest.mark.parametrize("expression", ["", "   ", None, "LOWER(email", "LOWER(email))", "a); DROP TABLE users",
+                                        "CONCAT(a, 'b)"])
+def test_invalid_expressions(expression):
+    assert not HssSqlColumn.is_valid_expression(expression)
+    with pytest.raises(ValueError, match="Invalid generated column expression"):
+        HssSqlColumn("g", "INT", generated_expression=expression or " ")
+
+
+@pytest.mark.parametrize("storage", ["VIRTUAL", "stored"])
+def test_generated_clause_is_rendered(storage):
+    column = HssSqlColumn("email_lower", "VARCHAR(255)", ["NOT NULL"], generated_expression=" LOWER(email) ",
+                          generated_storage=storage)
+    assert column.is_generated()
+    assert column.generate_column_definition.strip() == \
+        f"email_lower VARCHAR(255) GENERATED ALWAYS AS (LOWER(email)) {storage.upper()} NOT NULL"
+    assert HssSqlColumn.from_dict(column.to_dict()).generate_column_definition == column.generate_column_definition
+    postgresql = HssSqlDialect.get("postgresql").render_column(column)
+    assert postgresql.strip() == "email_lower VARCHAR(255) GENERATED ALWAYS AS (LOWER(email)) STORED NOT NULL"
+
+
+def test_invalid_generated_definitions():
+    with pytest.raises(ValueError, match="storage"):
+        HssSqlColumn("g", "INT", generated_expression="a + 1", generated_storage="PERSISTED")
+    with pytest.raises(ValueError, match="Invalid constraint for a generated column"):
+        HssSqlColumn("g", "INT", ["DEFAULT 0"], generated_expression="a + 1")
+    with pytest.raises(ValueError, match="PRIMARY KEY"):
+        HssSqlColumn("g", "INT", ["PRIMARY KEY"], generated_expression="a + 1")
+    column = HssSqlColumn("g", "INT", ["PRIMARY KEY"], generated_expression="a + 1", generated_storage="STORED")
+    column.clear_generated()
+    assert not column.is_generated()
+    assert column.generate_column_definition.strip() == "g INT PRIMARY KEY"
+
+
+def test_functional_index():
+    table = build_table()
+    index = table.add_index("idx_lower_email", ["LOWER(email)", "id"], unique=True)
+    assert index == {"name": "idx_lower_email", "parts": ["LOWER(email)", "id"], "unique": True}
+    assert table.render_index(index) == "UNIQUE INDEX idx_lower_email ((LOWER(email)), id)"
+    assert "    UNIQUE INDEX idx_lower_email ((LOWER(email)), id)" in table.generate_create_table()
+    assert HssSqlDialect.get("postgresql").render_indexes(table) == \
+        ["CREATE UNIQUE INDEX users_idx_lower_email ON users ((LOWER(email)), id);"]
+    with pytest.raises(ValueError, match="Invalid index part"):
+        table.add_index("idx_bad", ["LOWER(email"])
+    with pytest.raises(ValueError, match="duplicate index name"):
+        table.add_index("idx_lower_email", ["id"])
+
+
+def test_suggest_generated_index():
+    table = build_table()
+    suggestion = table.suggest_generated_index("LOWER( email )", "VARCHAR(255)")
+    column, index = suggestion["column"], suggestion["index"]
+    assert (column.name, column.generated_expression, column.generated_storage) == \
+        ("gc_lower_email", "LOWER( email )", "VIRTUAL")
+    assert index == {"name": "idx_gc_lower_email", "parts": ["gc_lower_email"], "unique": False}
+    assert suggestion["statements"] == [
+        "ALTER TABLE users ADD COLUMN gc_lower_email VARCHAR(255) GENERATED ALWAYS AS (LOWER( email )) VIRTUAL;",
+        "ALTER TABLE users ADD INDEX idx_gc_lower_email (gc_lower_email);",
+    ]
+    assert [col.name for col in table.columns] == ["id", "email", "payload"]
+
+    table.suggest_generated_index("LOWER( email )", "VARCHAR(255)", apply=True)
+    assert table.columns[-1].name == "gc_lower_email" and table.indexes[-1]["name"] == "idx_gc_lower_email"
+    again = table.suggest_generated_index("LOWER(  email )", "VARCHAR(255)")
+    assert again["statements"] == [] and again["column"] is table.columns[-1]
+
+    with pytest.raises(ValueError, match="Invalid predicate expression"):
+        table.suggest_generated_index("LOWER(email", "VARCHAR(255)")
+    with pytest.raises(ValueError, match="cannot back a B-tree index"):
+        table.suggest_generated_index("payload->'$.tags'", "JSON")
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from app.HssSqlIntrospector.HssSqlIntrospector import HssSqlIntrospector
+
+
+def mysql_column(column_type, default=None, extra="", nullable="YES"):
+    return HssSqlIntrospector._mysql_column("c", column_type, nullable, default, extra, None)
+
+
+@pytest.mark.parametrize("column_type, default, expected", [
+    ("varchar(10)", "nan", "DEFAULT 'nan'"),
+    ("varchar(10)", "inf", "DEFAULT 'inf'"),
+    ("varchar(10)", "1_000", "DEFAULT '1_000'"),
+    ("char(3)", "42", "DEFAULT '42'"),
+    ("int", "42", "DEFAULT 42"),
+    ("decimal(10,2)", "1.50", "DEFAULT 1.50"),
+    ("datetime", "CURRENT_TIMESTAMP", "DEFAULT CURRENT_TIMESTAMP"),
+    ("date", "2024-01-01", "DEFAULT '2024-01-01'"),
+])
+def test_default_quoting_follows_the_type_family(column_type, default, expected):
+    assert mysql_column(column_type, default).constraints == [expected]
+
+
+def test_on_update_is_kept():
+    column = mysql_column("timestamp(3)", "CURRENT_TIMESTAMP(3)", "DEFAULT_GENERATED on update CURRENT_TIMESTAMP(3)")
+    assert column.constraints == ["DEFAULT CURRENT_TIMESTAMP(3)", "ON UPDATE CURRENT_TIMESTAMP(3)"]
+    assert all(column.is_valid_constraint(constraint) for constraint in column.constraints)
+
+
+def test_type_modifiers_stay_in_the_data_type():
+    column = mysql_column("int(10) unsigned zerofill", nullable="NO", extra="auto_increment")
+    assert column.data_type == "INT(10) UNSIGNED ZEROFILL"
+    assert column.constraints == ["NOT NULL", "AUTO_INCREMENT"]
+    assert column.is_valid_data_type(column.data_type)
+
+
+@pytest.mark.parametrize("options", [{}, {"batch_size": 1}], ids=["default", "one_table_per_batch"])
+def test_sqlite_import_end_to_end(tmp_path, options):
+    path = str(tmp_path / "shop.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR(255) NOT NULL UNIQUE, name VARCHAR(100) DEFAULT 'x');"
+        "CREATE INDEX idx_name ON users (name);"
+        "CREATE INDEX idx_lower_email ON users (lower(email));"
+        "CREATE TABLE order_items (order_id INTEGER NOT NULL, line INTEGER NOT NULL, sku VARCHAR(32),"
+        " qty INT DEFAULT 1, PRIMARY KEY (order_id, line));"
+        "CREATE UNIQUE INDEX idx_sku_line ON order_items (sku, line);"
+    )
+    connection.close()
+
+    introspector = HssSqlIntrospector.from_sqlite(path, **options)
+    try:
+        database = introspector.import_database(database_name="shop")
+    finally:
+        introspector.close()
+
+    assert introspector.workers > 1
+    assert database.database_name == "shop"
+    assert [table.name for table in database.tables] == ["order_items", "users"]
+    order_items, users = database.tables
+    assert [(column.name, column.data_type, column.constraints) for column in users.columns] == [
+        ("id", "INTEGER", ["PRIMARY KEY"]),
+        ("email", "VARCHAR(255)", ["NOT NULL"]),
+        ("name", "VARCHAR(100)", ["DEFAULT 'x'"]),
+    ]
+    assert users.constraints == ["UNIQUE (email)"]
+    assert users.indexes == [{"name": "idx_name", "parts": ["name"], "unique": False}]
+    assert order_items.constraints == ["PRIMARY KEY (order_id, line)"]
+    assert order_items.columns[3].constraints == ["DEFAULT 1"]
+    assert order_items.indexes == [{"name": "idx_sku_line", "parts": ["sku", "line"], "unique": True}]
+    assert introspector.skipped == [("users", "idx_lower_email", "expression index")]
@@ -0,0 +1,55 @@
+import pytest
+
+from app.HssSqlLoader.HssSqlLoader import HssSqlLoader
+
+
+def load_table(ddl: str):
+    models = HssSqlLoader.parse_ddl(ddl)
+    assert len(models) == 1
+    return models[0]
+
+
+def test_hash_inside_string_literal_is_not_a_comment():
+    table = load_table("CREATE TABLE c (color VARCHAR(7) DEFAULT '#fff', n INT);")
+    assert [(column.name, column.data_type) for column in table.columns] == [("color", "VARCHAR(7)"), ("n", "INT")]
+    assert table.columns[0].constraints == ["DEFAULT '#fff'"]
+
+
+def test_double_dash_inside_string_literal_is_not_a_comment():
+    table = load_table("CREATE TABLE c (code VARCHAR(10) DEFAULT 'a--b', n INT);")
+    assert table.columns[0].constraints == ["DEFAULT 'a--b'"]
+    assert [column.name for column in table.columns] == ["code", "n"]
+
+
+def test_comments_outside_literals_are_removed():
+    table = load_table(
+        "-- users table\n"
+        "CREATE TABLE u ( # primary key first\n"
+        "    id INT, /* block ; comment */\n"
+        "    note VARCHAR(20) DEFAULT 'it\\'s -- fine' -- trailing\n"
+        ");"
+    )
+    assert [column.name for column in table.columns] == ["id", "note"]
+    assert table.columns[1].constraints == ["DEFAULT 'it\\'s -- fine'"]
+
+
+def test_double_dash_without_whitespace_is_not_a_comment():
+    assert HssSqlLoader._strip_comments("SELECT 5--3") == "SELECT 5--3"
+    assert HssSqlLoader._strip_comments("SELECT 5 -- 3") == "SELECT 5  "
+
+
+def test_unterminated_literal_is_an_error():
+    with pytest.raises(ValueError):
+        HssSqlLoader.parse_ddl("CREATE TABLE c (color VARCHAR(7) DEFAULT '#fff, n INT);")
+
+
+def test_on_update_and_spatial_index_are_parsed():
+    table = load_table(
+        "CREATE TABLE p (id INT, g POINT NOT NULL, key_id INT, spatial_ref INT,"
+        " ts TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,"
+        " SPATIAL INDEX sp_g (g), FULLTEXT KEY ft (id));"
+    )
+    assert [column.name for column in table.columns] == ["id", "g", "key_id", "spatial_ref", "ts"]
+    assert table.columns[-1].constraints == ["DEFAULT CURRENT_TIMESTAMP", "ON UPDATE CURRENT_TIMESTAMP"]
+    assert all(column.is_valid_constraint(c) for column in table.columns for c in column.constraints)
+    assert table.constraints == ["SPATIAL INDEX sp_g (g)", "FULLTEXT KEY ft (id)"]
@@ -0,0 +1,92 @@
+import datetime
+import decimal
+
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlRowCodec.HssSqlRowCodec import HssSqlRowCodec, HssSqlRowStore, HssSqlRowWriter
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_codec() -> HssSqlRowCodec:
+    table = HssSqlTable("events")
+    table.add_column(HssSqlColumn("id", "INT UNSIGNED", ["PRIMARY KEY"]))
+    table.add_column(HssSqlColumn("code", "CHAR(4)"))
+    table.add_column(HssSqlColumn("name", "VARCHAR(50)"))
+    table.add_column(HssSqlColumn("price", "DECIMAL(10,2)"))
+    table.add_column(HssSqlColumn("created", "DATETIME"))
+    table.add_column(HssSqlColumn("payload", "BLOB"))
+    return HssSqlRowCodec.from_table(table)
+
+
+ROWS = [
+    (1, "ab", "first", decimal.Decimal("9.99"), datetime.datetime(2024, 1, 2, 3, 4, 5), b"\x00\x01"),
+    (4294967295, "abcd", "x" * 50, decimal.Decimal("0.10"), datetime.datetime(1999, 12, 31), b""),
+    (3, None, None, None, None, None),
+]
+
+
+def test_round_trip_with_nulls_and_variable_length_values():
+    codec = build_codec()
+    store = HssSqlRowStore(codec)
+    store.extend(ROWS)
+    store.append({"id": 5, "name": "mapped"})
+    assert list(store) == ROWS + [(5, None, "mapped", None, None, None)]
+    assert store.get(1, "name") == "x" * 50
+    assert bytes(store.field(0, "payload")) == b"\x00\x01"
+    assert store.field(2, "name") is None
+
+
+def test_overflow_leaves_the_store_unchanged():
+    store = HssSqlRowStore(build_codec())
+    store.append(ROWS[0])
+    records, heap = bytes(store.records), bytes(store.heap)
+    with pytest.raises(ValueError):
+        store.append((2, "too long", "name", decimal.Decimal("1"), None, None))
+    with pytest.raises(ValueError):
+        store.append((2, "ab"))
+    assert (bytes(store.records), bytes(store.heap), len(store)) == (records, heap, 1)
+
+
+def test_buffer_error_on_heap_rolls_back_the_row():
+    store = HssSqlRowStore(build_codec())
+    store.append(ROWS[0])
+    view = store.field(0, "name")
+    records_size, heap_size = len(store.records), len(store.heap)
+    with pytest.raises(BufferError):
+        store.append((2, "cd", "second", None, None, None))
+    assert (len(store.records), len(store.heap), len(store)) == (records_size, heap_size, 1)
+    view.release()
+    store.append((2, "cd", "second", None, None, None))
+    assert list(store) == [ROWS[0], (2, "cd", "second", None, None, None)]
+
+
+def test_writer_output_reopens_memory_mapped(tmp_path):
+    codec = build_codec()
+    path = str(tmp_path / "events.rows")
+    rows = [(index, "ab", f"name-{index}", decimal.Decimal(index), None, bytes([index % 256]) * 3)
+            for index in range(2000)]
+    with HssSqlRowWriter(path, codec, batch_bytes=256) as writer:
+        writer.extend(rows[:1000])
+        with pytest.raises(TypeError):
+            writer.append((1000, "ab", "lost" * 100, decimal.Decimal(1), "not a datetime", None))
+        writer.extend(rows[1000:])
+    with HssSqlRowWriter(str(tmp_path / "clean.rows"), codec, batch_bytes=256) as writer:
+        writer.extend(rows)
+    assert (tmp_path / "events.rows").read_bytes() == (tmp_path / "clean.rows").read_bytes()
+    with HssSqlRowStore.open(path, codec) as mapped:
+        assert len(mapped) == 2000
+        assert list(mapped) == rows
+        with pytest.raises(TypeError):
+            mapped.append(rows[0])
+
+
+def test_saved_store_reopens_memory_mapped(tmp_path):
+    codec = build_codec()
+    path = str(tmp_path / "events.rows")
+    store = HssSqlRowStore(codec)
+    store.extend(ROWS)
+    store.save(path)
+    with HssSqlRowStore.open(path, codec) as mapped:
+        assert list(mapped) == ROWS
+        assert bytes(mapped.field(0, "payload")) == b"\x00\x01"
@@ -0,0 +1,50 @@
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlSchemaChange.HssSqlSchemaChange import HssSqlSchemaChange
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_tables(key_type: str) -> tuple:
+    old = HssSqlTable("orders")
+    old.add_column(HssSqlColumn("id", key_type, ["PRIMARY KEY"]))
+    old.add_column(HssSqlColumn("total", "INT"))
+    new = old.snapshot()
+    new.add_column(HssSqlColumn("note", "VARCHAR(20)"))
+    return old, new
+
+
+def test_integer_key_is_chunked_by_range():
+    planner = HssSqlSchemaChange(*build_tables("INT"), chunk_size=100)
+    procedure = planner.backfill_procedure()
+    assert "DECLARE low_key BIGINT;" in procedure
+    assert "SET low_key = low_key + 100;" in procedure
+    assert len(list(planner.backfill_statements(1, 250))) == 3
+
+
+def test_uuid_key_is_chunked_by_keyset():
+    planner = HssSqlSchemaChange(*build_tables("CHAR(36)"), chunk_size=100)
+    procedure = planner.backfill_procedure()
+    assert "DECLARE low_key CHAR(36);" in procedure
+    assert "BIGINT" not in procedure and "low_key + 100" not in procedure
+    assert "WHERE id >= low_key ORDER BY id LIMIT 100) AS chunk;" in procedure
+    assert "WHERE id >= low_key AND id <= high_key;" in procedure
+    assert "SET low_key = (SELECT MIN(id) FROM orders WHERE id > high_key);" in procedure
+    assert "CALL orders_osc_backfill();" in planner.plan(row_count=1000)
+
+
+def test_uuid_key_rejects_key_ranges():
+    planner = HssSqlSchemaChange(*build_tables("CHAR(36)"))
+    with pytest.raises(ValueError, match="not an integer"):
+        planner.plan(min_key=1, max_key=10)
+    with pytest.raises(ValueError, match="not an integer"):
+        list(planner.backfill_statements(1, 10))
+
+
+def test_composite_key_is_rejected():
+    old = HssSqlTable("lines")
+    old.add_column(HssSqlColumn("order_id", "INT"))
+    old.add_column(HssSqlColumn("line", "INT"))
+    old.add_constraint("PRIMARY KEY (order_id, line)")
+    with pytest.raises(ValueError, match="single-column primary key"):
+        HssSqlSchemaChange(old, old.snapshot())
@@ -0,0 +1,130 @@
+import bisect
+import hashlib
+import json
+import os
+
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlGenerator.HssSqlGenerator import HssSqlGenerator
+from app.HssSqlShardPlanner.HssSqlShardPlanner import HssSqlShardPlanner
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+
+def build_planner(shard_count: int = 2) -> HssSqlShardPlanner:
+    database = HssSqlDatabase("shop")
+    orders = HssSqlTable("orders")
+    orders.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY"]))
+    orders.add_column(HssSqlColumn("tenant_id", "INT", ["NOT NULL"]))
+    database.add_table(orders)
+    return HssSqlShardPlanner(database, shard_count, {"orders": "tenant_id"})
+
+
+def build_tenant_database() -> HssSqlDatabase:
+    database = HssSqlDatabase("saas")
+    invoices = HssSqlTable("invoices")
+    invoices.add_column(HssSqlColumn("id", "BIGINT", ["AUTO_INCREMENT"]))
+    invoices.add_column(HssSqlColumn("tenant_id", "INT", ["NOT NULL"]))
+    invoices.add_column(HssSqlColumn("number", "VARCHAR(20)", ["NOT NULL"]))
+    invoices.add_constraint("PRIMARY KEY (tenant_id, id)")
+    invoices.add_index("uq_number", ["number"], unique=True)
+    countries = HssSqlTable("countries")
+    countries.add_column(HssSqlColumn("code", "CHAR(2)", ["PRIMARY KEY"]))
+    database.add_table(invoices)
+    database.add_table(countries)
+    return database
+
+
+KEYS = range(5000)
+
+
+def written_names(paths) -> list:
+    return sorted(os.path.basename(path) for path in paths)
+
+
+def test_write_uses_the_generator_session_path(tmp_path):
+    generator = HssSqlGenerator(str(tmp_path))
+    paths = build_planner().write(generator, keys=[1, 2])
+    assert all(os.path.dirname(path) == os.path.join(str(tmp_path), "shop_shards") for path in paths)
+    assert written_names(paths) == ["routing_manifest.json", "shop_shard_00.sql", "shop_shard_01.sql"]
+    with open(paths[-1], encoding="utf-8") as manifest_file:
+        assert set(json.load(manifest_file)["keys"]) == {"1", "2"}
+
+
+def test_write_accepts_a_session_path(tmp_path):
+    paths = build_planner().write(str(tmp_path))
+    assert os.path.dirname(paths[0]) == os.path.join(str(tmp_path), "shop_shards")
+
+
+def test_write_defaults_to_a_new_generator_session_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(HssSqlGenerator, "DEFAULT_PATH", str(tmp_path))
+    paths = build_planner().write()
+    assert os.path.dirname(paths[0]) == os.path.join(str(tmp_path), "shop_shards")
+
+
+def test_key_placement_is_consistent():
+    first, second = build_planner(4), build_planner(4)
+    placement = {key: first.shard_for(key) for key in KEYS}
+    assert placement == {key: second.shard_for(key) for key in KEYS}
+    assert all(first.shard_for(str(key)) == shard for key, shard in placement.items())
+    counts = {shard: list(placement.values()).count(shard) for shard in first.shard_names()}
+    assert set(counts) == {"shop_shard_00", "shop_shard_01", "shop_shard_02", "shop_shard_03"}
+    assert all(0.15 < count / len(KEYS) < 0.35 for count in counts.values())
+
+
+@pytest.mark.parametrize("shard_count", [1, 2, 3, 5])
+def test_growing_by_one_shard_moves_about_one_share_to_the_new_shard(shard_count):
+    planner = build_planner(shard_count)
+    plan = planner.rebalance(shard_count + 1, keys=KEYS)
+    new_shard = planner.shard_names(shard_count + 1)[-1]
+    assert plan["added"] == [new_shard] and plan["removed"] == []
+    assert abs(plan["moved_fraction"] - 1 / (shard_count + 1)) < 0.06
+    assert abs(len(plan["keys"]) / len(KEYS) - plan["moved_fraction"]) < 0.03
+    assert {target for _, target in plan["keys"].values()} == {new_shard}
+    assert all(target == new_shard for *_, target in plan["ranges"])
+    grown = build_planner(shard_count + 1)
+    assert all(grown.shard_for(key) == plan["keys"].get(str(key), (None, planner.shard_for(key)))[1] for key in KEYS)
+
+
+def test_reference_tables_are_replicated_to_every_shard():
+    planner = HssSqlShardPlanner(build_tenant_database(), 3, {"invoices": "tenant_id"})
+    assert planner.reference_tables == ["countries"]
+    for shard in planner.shard_names():
+        script = planner.generate_shard_script(shard)
+        assert "-- Reference table countries, replicated to every shard" in script
+        assert "CREATE TABLE countries" in script and "CREATE TABLE invoices" in script
+        assert f"CREATE DATABASE {shard} " in script
+    with pytest.raises(ValueError, match="both sharded and replicated"):
+        HssSqlShardPlanner(build_tenant_database(), 3, {"invoices": "tenant_id"}, ["invoices", "countries"])
+    with pytest.raises(ValueError, match="without a shard key or reference mark: countries"):
+        HssSqlShardPlanner(build_tenant_database(), 3, {"invoices": "tenant_id"}, [])
+
+
+def test_warnings_name_unique_keys_without_the_shard_key_and_auto_increment():
+    planner = HssSqlShardPlanner(build_tenant_database(), 3, {"invoices": "tenant_id"})
+    assert planner.warnings() == [
+        "Table 'invoices': unique key (number) does not contain shard key 'tenant_id' and is only enforced per shard",
+        "Table 'invoices': AUTO_INCREMENT column 'id' generates colliding values across shards",
+    ]
+    assert build_planner().warnings() == [
+        "Table 'orders': unique key (id) does not contain shard key 'tenant_id' and is only enforced per shard",
+    ]
+
+
+def test_manifest_ring_routes_like_the_planner():
+    planner = build_planner(3)
+    manifest = json.loads(json.dumps(planner.manifest(keys=[7, "acme"])))
+    assert manifest["shards"] == planner.shard_names()
+    assert len(manifest["ring"]) == 3 * manifest["virtual_nodes"]
+    assert manifest["tables"] == {"orders": {"shard_key": "tenant_id"}}
+    tokens = [token for token, _ in manifest["ring"]]
+    assert tokens == sorted(tokens)
+
+    def route(key) -> str:
+        position = int.from_bytes(hashlib.md5(str(key).encode("utf-8")).digest()[:8], "big")
+        index = bisect.bisect_left(tokens, position) % len(tokens)
+        return manifest["shards"][manifest["ring"][index][1]]
+
+    assert all(route(key) == planner.shard_for(key) for key in KEYS)
+    assert manifest["keys"] == {"7": planner.shard_for(7), "acme": planner.shard_for("acme")}
@@ -0,0 +1,91 @@
+import re
+import threading
+
+import pytest
+
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlSharedModel.HssSqlSharedModel import HssSqlSharedModel
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+
+TABLES = 8
+WRITERS = 4
+WRITES_PER_WRITER = 12
+READERS = 4
+
+
+def build_database() -> HssSqlDatabase:
+    database = HssSqlDatabase("stress_db")
+    for number in range(TABLES):
+        table = HssSqlTable(f"t{number}")
+        table.add_column(HssSqlColumn("id", "INT", ["PRIMARY KEY"]))
+        database.add_table(table)
+    return database
+
+
+def add_column_everywhere(database: HssSqlDatabase, column_name: str) -> None:
+    for number in range(TABLES):
+        database.edit_table(f"t{number}").add_column(HssSqlColumn(column_name, "INT"))
+
+
+def writer(shared: HssSqlSharedModel, writer_id: int) -> None:
+    for write in range(WRITES_PER_WRITER):
+        shared.apply(add_column_everywhere, f"w{writer_id}_{write}")
+        if write % 3 == 0:
+            try:
+                with shared.write() as database:
+                    add_column_everywhere(database, f"rolled_back_{writer_id}_{write}")
+                    raise RuntimeError("abort")
+            except RuntimeError:
+                pass
+
+
+def reader(shared: HssSqlSharedModel, stop: threading.Event, column_counts: list) -> None:
+    while True:
+        done = stop.is_set()
+        script = shared.render()
+        column_counts.append({len(re.findall(r"\t\t\w+ INT", body)) for body in script.split("CREATE TABLE")[1:]})
+        if done:
+            return
+
+
+def start(target, errors: list, *args) -> threading.Thread:
+    def run():
+        try:
+            target(*args)
+        except BaseException as e:
+            errors.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@pytest.mark.parametrize("loaded", [False, True], ids=["built", "from_dict"])
+def test_concurrent_writes_and_renders_are_consistent(loaded):
+    database = build_database()
+    if loaded:
+        database = HssSqlDatabase.from_dict(database.to_dict())
+    shared = HssSqlSharedModel(database)
+    first = shared.current()
+    stop = threading.Event()
+    column_counts = []
+    errors = []
+    readers = [start(reader, errors, shared, stop, column_counts) for _ in range(READERS)]
+    writers = [start(writer, errors, shared, number) for number in range(WRITERS)]
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    expected = 1 + WRITERS * WRITES_PER_WRITER
+    assert errors == []
+    assert shared.version == WRITERS * WRITES_PER_WRITER
+    assert len(column_counts) >= READERS
+    assert all(len(counts) == 1 for counts in column_counts)
+    assert column_counts[-1] == {expected}
+    with shared.read() as published:
+        assert {len(table.columns) for table in published.tables} == {expected}
+        assert not any(column.name.startswith("rolled_back") for table in published.tables for column in table.columns)
+    assert {len(table.columns) for table in first.tables} == {1}
+    assert {len(table.columns) for table in database.tables} == {expected}
@@ -0,0 +1,81 @@
+import pytest
+
+from app.HssSqlCatalog.HssSqlCatalog import HssSqlCatalog
+from app.HssSqlColumn.HssSqlColumn import HssSqlColumn
+from app.HssSqlDatabase.HssSqlDatabase import HssSqlDatabase
+from app.HssSqlRowCodec.HssSqlRowCodec import HssSqlRowCodec
+from app.HssSqlTable.HssSqlTable import HssSqlTable
+from app.HssSqlTypeRegistry.HssSqlTypeRegistry import HssSqlTypeRegistry
+
+REGISTRY = HssSqlColumn.TYPE_REGISTRY
+
+
+@pytest.mark.parametrize("data_type, base, parameter, modifiers", [
+    ("INT UNSIGNED", "INT", None, ("UNSIGNED",)),
+    ("int(10) unsigned zerofill", "INT", "10", ("UNSIGNED", "ZEROFILL")),
+    ("DECIMAL(10,2) UNSIGNED", "DECIMAL", "10,2", ("UNSIGNED",)),
+    ("ENUM('UNSIGNED')", "ENUM", "'UNSIGNED'", ()),
+])
+def test_modifiers_qualify_the_base_type(data_type, base, parameter, modifiers):
+    assert HssSqlTypeRegistry.split(data_type) == (base, parameter)
+    assert HssSqlTypeRegistry.modifiers(data_type) == modifiers
+    assert REGISTRY.is_valid(data_type)
+
+
+def test_unsigned_int_resolves_to_int():
+    assert REGISTRY.resolve("INT UNSIGNED")[0] is REGISTRY.get("INT")
+    assert REGISTRY.storage_size("BIGINT UNSIGNED") == 8
+    assert REGISTRY.is_unsigned("INT ZEROFILL")
+    assert not REGISTRY.is_unsigned("INT SIGNED")
+
+
+@pytest.mark.parametrize("data_type", ["VARCHAR(5) UNSIGNED", "INT SIGNED UNSIGNED", "INT UNSIGNED UNSIGNED"])
+def test_invalid_modifiers_are_rejected(data_type):
+    assert not REGISTRY.is_valid(data_type)
+
+
+def test_row_codec_uses_unsigned_formats():
+    table = HssSqlTable("t")
+    table.add_column(HssSqlColumn("id", "INT UNSIGNED"))
+    table.add_column(HssSqlColumn("big", "BIGINT UNSIGNED"))
+    codec = HssSqlRowCodec.from_table(table)
+    heap = bytearray()
+    record = codec.encode((4_000_000_000, 2 ** 64 - 1), heap)
+    assert codec.decode(record, heap) == (4_000_000_000, 2 ** 64 - 1)
+
+
+def test_set_data_type_places_parameter_before_modifiers():
+    column = HssSqlColumn("id", "INT")
+    column.set_data_type("INT UNSIGNED", "10")
+    assert column.data_type == "INT(10) UNSIGNED"
+
+
+def test_legacy_aliases_are_read_only_views_of_the_registry():
+    assert "VARCHAR" in HssSqlColumn.VALID_DATA_TYPES
+    assert "VARCHAR" in HssSqlColumn.DATA_TYPES_WITH_PARAMETERS
+    assert "DATE" not in HssSqlColumn.DATA_TYPES_WITH_PARAMETERS
+    assert HssSqlColumn.VALID_CONSTRAINTS == tuple(REGISTRY.constraints)
+    with pytest.raises(AttributeError):
+        HssSqlColumn("id", "INT").VALID_DATA_TYPES = ["INT"]
+
+
+@pytest.fixture
+def registry(monkeypatch) -> HssSqlTypeRegistry:
+    fresh = HssSqlTypeRegistry(HssSqlTypeRegistry._builtin_types(), REGISTRY.constraints)
+    monkeypatch.setattr(HssSqlColumn, "TYPE_REGISTRY", fresh)
+    monkeypatch.setattr(HssSqlCatalog, "_bits", {})
+    return fresh
+
+
+def test_catalog_knows_constraints_registered_after_import(registry):
+    registry.register_constraint("INVISIBLE")
+    assert "INVISIBLE" in HssSqlColumn.VALID_CONSTRAINTS
+    assert "INVISIBLE" not in REGISTRY.constraints
+    table = HssSqlTable("t")
+    table.add_column(HssSqlColumn("id", "INT UNSIGNED", ["INVISIBLE"]))
+    database = HssSqlDatabase("d")
+    database.add_table(table)
+    catalog = HssSqlCatalog.from_databases([database])
+    assert "INVISIBLE" in HssSqlCatalog.CONSTRAINT_BITS
+    assert catalog.select(constraint="invisible") == [0]
+    assert catalog.select(data_type="INT") == [0]
@@ -0,0 +1,40 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from app.HssSqlCli.HssSqlCli import main
+from app.HssSqlWatcher.HssSqlWatcher import HssSqlWatcher
+
+
+def test_unparseable_file_is_reported_not_printed(tmp_path, capsys):
+    (tmp_path / "good.sql").write_text("CREATE TABLE a (id INT);\n", encoding="utf-8")
+    (tmp_path / "bad.sql").write_text("CREATE TABLE b (note VARCHAR(5) DEFAULT 'x);\n", encoding="utf-8")
+    watcher = HssSqlWatcher(str(tmp_path), interval=0, debounce=0)
+    rebuilt, skipped = [], []
+
+    watcher.watch(rebuilt.extend, max_cycles=1, on_skip=lambda path, error: skipped.append((path, error)))
+
+    assert rebuilt == ["a"]
+    assert [os.path.basename(path) for path, _ in skipped] == ["bad.sql"]
+    assert isinstance(skipped[0][1], ValueError)
+    assert [os.path.basename(path) for path, _ in watcher.skipped] == ["bad.sql"]
+    assert capsys.readouterr().out == ""
+
+
+def test_output_dir_must_differ_from_the_watched_directory(tmp_path):
+    with pytest.raises(ValueError, match="must differ from the watched directory"):
+        HssSqlWatcher(str(tmp_path), str(tmp_path))
+    with pytest.raises(ValueError):
+        HssSqlWatcher(str(tmp_path), os.path.join(str(tmp_path), "sub", ".."))
+    result = CliRunner().invoke(main, ["--watch", str(tmp_path), "--output-dir", str(tmp_path)])
+    assert result.exit_code == 1 and "must differ from the watched directory" in result.output
+
+
+def test_generated_subdirectory_is_not_scanned(tmp_path):
+    (tmp_path / "a.sql").write_text("CREATE TABLE a (id INT);\n", encoding="utf-8")
+    watcher = HssSqlWatcher(str(tmp_path), interval=0, debounce=0)
+    rebuilt = []
+    watcher.watch(rebuilt.extend, max_cycles=2)
+    assert rebuilt == ["a"]
+    assert os.listdir(watcher.output_dir) == ["a.sql"]